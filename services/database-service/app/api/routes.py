@@ -2,15 +2,25 @@ import hashlib
 from datetime import datetime, timedelta
 
 from fastapi import APIRouter, HTTPException, Query
-from app.db import api_request_repository, extract_action_item_repository, license_repository
+from app.db import (
+    api_request_repository,
+    extract_action_item_repository,
+    interview_summary_repository,
+    license_repository,
+)
+from app.llm_client import notify_license_changed
 from app.models.schemas import (
     CreateExtractActionItemBody,
     CreateInstallationBody,
+    CreateInterviewSummaryBody,
     CreateLicenseBody,
     CreateLicenseWithDaysBody,
+    ExtractActionItemsByHashesBody,
     LogApiRequestBody,
+    LogApiRequestsBulkBody,
     ReplaceOldestInstallationBody,
     UpdateExtractActionItemBody,
+    UpdateInterviewSummaryBody,
     UpdateLicenseBody,
 )
 
@@ -76,6 +86,7 @@ async def create_license(body: CreateLicenseBody):
     )
     if not result.get("success"):
         raise HTTPException(status_code=400, detail=result.get("error", "Unknown error"))
+    notify_license_changed(body.license_key)
     return result
 
 
@@ -91,6 +102,7 @@ async def create_license_with_days(body: CreateLicenseWithDaysBody):
     )
     if not result.get("success"):
         raise HTTPException(status_code=400, detail=result.get("error", "Unknown error"))
+    notify_license_changed(license_key)
     return {"success": True, "email": body.email, "license_key": license_key, "expiry": expiry_date}
 
 
@@ -105,6 +117,7 @@ async def update_license(license_id: int, body: UpdateLicenseBody):
     )
     if not result.get("success"):
         raise HTTPException(status_code=400, detail=result.get("error", "Unknown error"))
+    notify_license_changed(result.get("previous_license_key"), body.license_key)
     return result
 
 
@@ -114,6 +127,7 @@ async def delete_license(license_id: int):
     result = await license_repository.delete_license(license_id)
     if not result.get("success"):
         raise HTTPException(status_code=404, detail=result.get("error", "License not found"))
+    notify_license_changed(result.get("license_key"))
     return result
 
 
@@ -182,10 +196,18 @@ async def log_api_request(body: LogApiRequestBody):
         response_body=body.response_body,
         status_code=body.status_code,
         duration_ms=body.duration_ms,
+        timestamp=body.timestamp,
     )
     return {"id": req_id}
 
 
+@router.post("/requests/bulk")
+async def log_api_requests_bulk(body: LogApiRequestsBulkBody):
+    """Log a batch of API requests in one insert (llm-service request log shipper)."""
+    inserted = await api_request_repository.insert_requests([r.model_dump() for r in body.requests])
+    return {"inserted": inserted}
+
+
 @router.get("/requests")
 async def list_api_requests(
     limit: int = Query(50, ge=1, le=200),
@@ -210,6 +232,22 @@ async def get_extract_action_item_by_input_hash(input_hash: str = Query(..., ali
     return record
 
 
+@router.get("/extract-action-items/by-correlation-id")
+async def get_extract_action_item_by_correlation_id(correlation_id: str = Query(...)):
+    """Get extract_action_item by correlation_id (llm-service job id). Returns 404 if not found."""
+    record = await extract_action_item_repository.get_by_correlation_id(correlation_id)
+    if not record:
+        raise HTTPException(status_code=404, detail="Not found")
+    return record
+
+
+@router.post("/extract-action-items/by-input-hashes")
+async def get_extract_action_items_by_input_hashes(body: ExtractActionItemsByHashesBody):
+    """Look up many input_hashes at once. Returns {"items": {input_hash: record}} for those found."""
+    records = await extract_action_item_repository.get_by_input_hashes(body.hashes)
+    return {"items": records}
+
+
 @router.post("/extract-action-items")
 async def create_extract_action_item(body: CreateExtractActionItemBody):
     """Create extract_action_item record (or return existing if input_hash duplicate)."""
@@ -233,6 +271,7 @@ async def update_extract_action_item(body: UpdateExtractActionItemBody):
         error_message=body.error_message,
         http_status_code=body.http_status_code,
         duration_ms=body.duration_ms,
+        timings_json=body.timings_json,
     )
     return {"ok": ok}
 
@@ -249,3 +288,52 @@ async def list_extract_action_items(
         limit=limit, offset=offset, status=status, search=search
     )
     return {"items": items, "count": len(items), "total": total}
+
+
+# --- Interview summaries (LLM summarize-interview cache) ---
+
+@router.get("/interview-summaries/by-input-hash")
+async def get_interview_summary_by_input_hash(input_hash: str = Query(..., alias="hash")):
+    """Get interview_summary by input_hash. Returns 404 if not found."""
+    record = await interview_summary_repository.get_by_input_hash(input_hash)
+    if not record:
+        raise HTTPException(status_code=404, detail="Not found")
+    return record
+
+
+@router.get("/interview-summaries/latest")
+async def get_latest_interview_summary(
+    series_id: str = Query(...), meeting_id: str = Query(...), license_key: str = Query(...)
+):
+    """Latest completed interview_summary of a meeting for license_key, with input_json. Returns 404 if none."""
+    record = await interview_summary_repository.get_latest_completed(series_id, meeting_id, license_key)
+    if not record:
+        raise HTTPException(status_code=404, detail="Not found")
+    return record
+
+
+@router.post("/interview-summaries")
+async def create_interview_summary(body: CreateInterviewSummaryBody):
+    """Claim an input_hash for a new summary (created=true), or return the usable existing record."""
+    return await interview_summary_repository.create_interview_summary(**body.model_dump())
+
+
+@router.patch("/interview-summaries")
+async def update_interview_summary(body: UpdateInterviewSummaryBody):
+    """Store the summary (or failure) for a correlation_id (called by LLM service)."""
+    ok = await interview_summary_repository.update_interview_summary(**body.model_dump())
+    return {"ok": ok}
+
+
+@router.get("/interview-summaries")
+async def list_interview_summaries(
+    limit: int = Query(20, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+    status: str | None = Query(None),
+    search: str | None = Query(None),
+):
+    """List interview_summaries (for admin/debugging). Latest first."""
+    items, total = await interview_summary_repository.list_interview_summaries(
+        limit=limit, offset=offset, status=status, search=search
+    )
+    return {"items": items, "count": len(items), "total": total}
@@ -27,6 +27,15 @@ class Settings(BaseSettings):
     # Railway provides DATABASE_URL; for local SQLite it's optional
     database_url: str | None = None
 
+    # llm-service caches license verdicts; set to notify it when a license changes
+    llm_service_url: str = ""  # e.g. http://localhost:8000
+    llm_admin_token: str = ""  # must match llm-service ADMIN_TOKEN when that is set
+
+    # Tracing: recent spans in a ring buffer (GET /traces), optionally appended to a JSONL file
+    tracing_enabled: bool = True
+    trace_buffer_size: int = 2000  # spans
+    trace_export_path: str = ""
+
     @property
     def resolved_database_url(self) -> str:
         url = self.database_url or os.environ.get("DATABASE_URL") or _default_sqlite_url()
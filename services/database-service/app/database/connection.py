@@ -1,18 +1,60 @@
 """Async database connection - SQLite or PostgreSQL via SQLAlchemy."""
+import time
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from app.config import settings
 from app.database.models import Base
 from app.utils.logger import get_logger
+from app.utils.metrics import histogram
+from app.utils.tracing import end_span, start_span
 
 logger = get_logger(__name__)
 
 _engine = None
 _async_session_factory = None
 
+db_query_duration = histogram(
+    "db_query_duration_seconds",
+    "Statement execution time by statement kind",
+    ("operation",),
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+
+def _operation(statement: str) -> str:
+    words = statement.split(None, 1)
+    return words[0].upper() if words else "OTHER"
+
+
+def _instrument(engine) -> None:
+    """Time every statement (metric by SELECT/INSERT/...; a span when inside a traced request)."""
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        # Kept on the per-execution context, so a failed statement leaves nothing behind
+        context._query_start = time.perf_counter()
+        context._query_span = start_span(f"db {_operation(statement)}", kind="client", statement=statement[:200])
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_query_start", None)
+        if started is None:
+            return
+        db_query_duration.observe(time.perf_counter() - started, _operation(statement))
+        if context._query_span is not None:
+            end_span(context._query_span)
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def _error(exception_context):
+        context = exception_context.execution_context
+        query_span = getattr(context, "_query_span", None)
+        if query_span is not None:
+            end_span(query_span, exception_context.original_exception)
+
 
 def _get_engine():
     global _engine
@@ -25,6 +67,7 @@ def _get_engine():
             echo=False,
             connect_args=connect_args,
         )
+        _instrument(_engine)
         if "postgresql" in url:
             db_info = url.split("@")[-1].split("/")[-1] if "@" in url else "postgresql"
             logger.info(f"Database: PostgreSQL ({db_info})")
@@ -34,6 +77,19 @@ def _get_engine():
     return _engine
 
 
+def pool_stats() -> dict:
+    """Connection pool occupancy (size, checkedout, checkedin, overflow); empty before first use."""
+    if _engine is None:
+        return {}
+    pool = _engine.sync_engine.pool
+    stats = {}
+    for name in ("size", "checkedout", "checkedin", "overflow"):
+        fn = getattr(pool, name, None)  # not every pool class (e.g. StaticPool) has all of them
+        if callable(fn):
+            stats[name] = fn()
+    return stats
+
+
 def _get_session_factory():
     global _async_session_factory
     if _async_session_factory is None:
@@ -72,3 +72,30 @@ class ExtractActionItem(Base):
     error_message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     http_status_code: Mapped[Optional[int]] = mapped_column(nullable=True)
     duration_ms: Mapped[Optional[int]] = mapped_column(nullable=True)
+    timings_json: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # {"stage": ms, ..., "total": ms}
+
+
+class InterviewSummary(Base):
+    """Cached LLM interview summaries, one per input_hash (canonical meeting_details)."""
+
+    __tablename__ = "interview_summaries"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    correlation_id: Mapped[str] = mapped_column(String(64), unique=True, nullable=False, index=True)
+    created_at: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    updated_at: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+
+    license_key: Mapped[Optional[str]] = mapped_column(String(255), nullable=True, index=True)
+    installation_id: Mapped[Optional[str]] = mapped_column(String(255), nullable=True, index=True)
+    series_id: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    meeting_id: Mapped[Optional[str]] = mapped_column(String(255), nullable=True, index=True)
+
+    input_json: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    output_json: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    input_hash: Mapped[str] = mapped_column(String(64), nullable=False, unique=True, index=True)
+
+    status: Mapped[str] = mapped_column(String(20), default="pending", nullable=False)
+    error_message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    http_status_code: Mapped[Optional[int]] = mapped_column(nullable=True)
+    duration_ms: Mapped[Optional[int]] = mapped_column(nullable=True)
+    timings_json: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
@@ -39,12 +39,13 @@ async def insert_request(
     response_body: str | None = None,
     status_code: int | None = None,
     duration_ms: int | None = None,
+    timestamp: str | None = None,
 ) -> int:
     """Insert API request log. Returns the new id."""
     try:
         async with get_async_session() as session:
             req = ApiRequest(
-                timestamp=datetime.utcnow().isoformat(),
+                timestamp=timestamp or datetime.utcnow().isoformat(),
                 service=service,
                 endpoint=endpoint,
                 method=method,
@@ -62,6 +63,37 @@ async def insert_request(
         return -1
 
 
+async def insert_requests(rows: List[Dict]) -> int:
+    """
+    Insert many API request logs in one transaction. Returns the number inserted; errors
+    are raised so the caller (llm-service's shipper) sees the batch as failed.
+    """
+    if not rows:
+        return 0
+    now = datetime.utcnow().isoformat()
+    try:
+        async with get_async_session() as session:
+            session.add_all([
+                ApiRequest(
+                    timestamp=row.get("timestamp") or now,
+                    service=row["service"],
+                    endpoint=row["endpoint"],
+                    method=row["method"],
+                    user_identifier=row.get("user_identifier"),
+                    request_body=_truncate(row.get("request_body")),
+                    response_body=_truncate(row.get("response_body")),
+                    status_code=row.get("status_code"),
+                    duration_ms=row.get("duration_ms"),
+                )
+                for row in rows
+            ])
+            await session.flush()
+            return len(rows)
+    except Exception as e:
+        logger.error(f"[InsertRequests] Error: {e}")
+        raise
+
+
 async def list_requests(
     limit: int = 50,
     offset: int = 0,
@@ -16,7 +16,7 @@ MAX_JSON_LEN = 100_000
 
 
 async def get_by_input_hash(input_hash: str) -> Optional[Dict]:
-    """Get extract_action_item by input_hash. Returns dict with id, correlation_id, status, output_json or None."""
+    """Get extract_action_item by input_hash. Returns dict with id, correlation_id, license_key, status, output_json or None."""
     async with get_async_session() as session:
         result = await session.execute(
             select(ExtractActionItem).where(ExtractActionItem.input_hash == input_hash)
@@ -27,11 +27,51 @@ async def get_by_input_hash(input_hash: str) -> Optional[Dict]:
         return {
             "id": row.id,
             "correlation_id": row.correlation_id,
+            "license_key": row.license_key,
             "status": row.status,
             "output_json": row.output_json,
         }
 
 
+async def get_by_correlation_id(correlation_id: str) -> Optional[Dict]:
+    """Get extract_action_item by correlation_id (job id). Returns status fields and output_json or None."""
+    async with get_async_session() as session:
+        result = await session.execute(
+            select(ExtractActionItem).where(ExtractActionItem.correlation_id == correlation_id)
+        )
+        row = result.scalar_one_or_none()
+        if not row:
+            return None
+        return {
+            "id": row.id,
+            "correlation_id": row.correlation_id,
+            "license_key": row.license_key,
+            "status": row.status,
+            "output_json": row.output_json,
+            "error_message": row.error_message,
+            "http_status_code": row.http_status_code,
+        }
+
+
+async def get_by_input_hashes(input_hashes: List[str]) -> Dict[str, Dict]:
+    """Get extract_action_items for many input_hashes in one query. Returns {input_hash: record}."""
+    if not input_hashes:
+        return {}
+    async with get_async_session() as session:
+        result = await session.execute(
+            select(ExtractActionItem).where(ExtractActionItem.input_hash.in_(input_hashes))
+        )
+        return {
+            row.input_hash: {
+                "id": row.id,
+                "correlation_id": row.correlation_id,
+                "status": row.status,
+                "output_json": row.output_json,
+            }
+            for row in result.scalars().all()
+        }
+
+
 def _truncate(s: str | None, max_len: int = MAX_JSON_LEN) -> str | None:
     if s is None:
         return None
@@ -107,6 +147,7 @@ async def update_extract_action_item(
     error_message: str | None = None,
     http_status_code: int | None = None,
     duration_ms: int | None = None,
+    timings_json: str | None = None,
 ) -> bool:
     """Update an extract_action_item by correlation_id. Returns True if updated."""
     now = datetime.utcnow().isoformat()
@@ -131,6 +172,8 @@ async def update_extract_action_item(
                 row.http_status_code = http_status_code
             if duration_ms is not None:
                 row.duration_ms = duration_ms
+            if timings_json is not None:
+                row.timings_json = timings_json
             await session.flush()
             return True
     except Exception as e:
@@ -0,0 +1,259 @@
+"""Repository for interview_summaries table."""
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import delete, func, or_, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app.database.connection import get_async_session
+from app.database.models import InterviewSummary
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+MAX_JSON_LEN = 100_000
+
+
+def _truncate(s: str | None, max_len: int = MAX_JSON_LEN) -> str | None:
+    if s is None:
+        return None
+    if len(s) <= max_len:
+        return s
+    return s[:max_len] + "... [truncated]"
+
+
+def _row_to_dict(row) -> Dict:
+    return {c.name: getattr(row, c.name) for c in row.__table__.columns}
+
+
+def _record(row: InterviewSummary) -> Dict:
+    return {
+        "id": row.id,
+        "correlation_id": row.correlation_id,
+        "meeting_id": row.meeting_id,
+        "status": row.status,
+        "output_json": row.output_json,
+        "updated_at": row.updated_at,
+    }
+
+
+def _age_seconds(row: InterviewSummary, now: datetime) -> float:
+    try:
+        return (now - datetime.fromisoformat(row.updated_at or "")).total_seconds()
+    except ValueError:
+        return float("inf")
+
+
+def _reusable(row: InterviewSummary, now: datetime, max_age_seconds: int | None, pending_timeout_seconds: int) -> bool:
+    """A fresh completed summary or a pending one whose owner may still finish it."""
+    age = _age_seconds(row, now)
+    if row.status == "completed":
+        return max_age_seconds is None or age < max_age_seconds
+    if row.status == "pending":
+        return age < pending_timeout_seconds
+    return False  # failed: retry
+
+
+async def get_by_input_hash(input_hash: str) -> Optional[Dict]:
+    """Get interview_summary by input_hash. Returns dict with id, correlation_id, status, output_json, updated_at or None."""
+    async with get_async_session() as session:
+        result = await session.execute(
+            select(InterviewSummary).where(InterviewSummary.input_hash == input_hash)
+        )
+        row = result.scalar_one_or_none()
+        return _record(row) if row else None
+
+
+async def get_latest_completed(series_id: str, meeting_id: str, license_key: str) -> Optional[Dict]:
+    """
+    The meeting's most recent completed summary for license_key with its input_json, the base
+    llm-service revises when notes are added. None if the meeting has no completed summary
+    under that key (meeting ids come from clients, so another license's row never matches).
+    """
+    async with get_async_session() as session:
+        result = await session.execute(
+            select(InterviewSummary)
+            .where(
+                InterviewSummary.series_id == series_id,
+                InterviewSummary.meeting_id == meeting_id,
+                InterviewSummary.license_key == license_key,
+                InterviewSummary.status == "completed",
+            )
+            .order_by(InterviewSummary.updated_at.desc())
+            .limit(1)
+        )
+        row = result.scalar_one_or_none()
+        if not row:
+            return None
+        return {**_record(row), "input_hash": row.input_hash, "input_json": row.input_json}
+
+
+async def create_interview_summary(
+    correlation_id: str,
+    input_hash: str,
+    license_key: str | None = None,
+    installation_id: str | None = None,
+    series_id: str | None = None,
+    meeting_id: str | None = None,
+    input_json: str | None = None,
+    max_age_seconds: int | None = None,
+    pending_timeout_seconds: int = 300,
+) -> Dict:
+    """
+    Claim input_hash for a new summary. Returns the record plus created=True when the caller
+    should run the LLM, or the existing record with created=False when it is a fresh
+    completed summary or pending elsewhere. Failed rows, completed rows older than
+    max_age_seconds and pending rows older than pending_timeout_seconds are taken over
+    (reset to pending under the new correlation_id).
+    """
+    now = datetime.utcnow()
+    try:
+        async with get_async_session() as session:
+            row = InterviewSummary(
+                correlation_id=correlation_id,
+                created_at=now.isoformat(),
+                updated_at=now.isoformat(),
+                license_key=license_key,
+                installation_id=installation_id,
+                series_id=series_id,
+                meeting_id=meeting_id,
+                input_json=_truncate(input_json),
+                input_hash=input_hash,
+                status="pending",
+            )
+            session.add(row)
+            await session.flush()
+            return {**_record(row), "created": True}
+    except IntegrityError:
+        pass
+
+    async with get_async_session() as session:
+        result = await session.execute(
+            select(InterviewSummary).where(InterviewSummary.input_hash == input_hash)
+        )
+        existing = result.scalar_one_or_none()
+        if existing is None:  # deleted since the insert failed: try again
+            return await create_interview_summary(
+                correlation_id, input_hash, license_key, installation_id, series_id, meeting_id,
+                input_json, max_age_seconds, pending_timeout_seconds,
+            )
+        if _reusable(existing, now, max_age_seconds, pending_timeout_seconds):
+            return {**_record(existing), "created": False}
+        # Take over only if nobody else did since we read it
+        taken = await session.execute(
+            update(InterviewSummary)
+            .where(
+                InterviewSummary.id == existing.id,
+                InterviewSummary.correlation_id == existing.correlation_id,
+            )
+            .values(
+                correlation_id=correlation_id,
+                updated_at=now.isoformat(),
+                license_key=license_key,
+                installation_id=installation_id,
+                series_id=series_id,
+                meeting_id=meeting_id,
+                input_json=_truncate(input_json),
+                output_json=None,
+                status="pending",
+                error_message=None,
+                http_status_code=None,
+                duration_ms=None,
+                timings_json=None,
+            )
+        )
+        if taken.rowcount == 1:
+            return {
+                "id": existing.id,
+                "correlation_id": correlation_id,
+                "meeting_id": meeting_id,
+                "status": "pending",
+                "output_json": None,
+                "updated_at": now.isoformat(),
+                "created": True,
+            }
+    current = await get_by_input_hash(input_hash)
+    return {**(current or _record(existing)), "created": False}
+
+
+async def update_interview_summary(
+    correlation_id: str,
+    output_json: str | None = None,
+    status: str = "completed",
+    error_message: str | None = None,
+    http_status_code: int | None = None,
+    duration_ms: int | None = None,
+    timings_json: str | None = None,
+) -> bool:
+    """
+    Update an interview_summary by correlation_id. Returns True if updated. A completed
+    summary replaces the meeting's older ones: finished rows of the same meeting and license
+    key under another input_hash (summaries of notes since edited) are deleted.
+    """
+    now = datetime.utcnow().isoformat()
+    try:
+        async with get_async_session() as session:
+            result = await session.execute(
+                select(InterviewSummary).where(InterviewSummary.correlation_id == correlation_id)
+            )
+            row = result.scalar_one_or_none()
+            if not row:
+                logger.warning(f"[InterviewSummary] Not found: {correlation_id}")
+                return False
+            row.updated_at = now
+            if output_json is not None:
+                row.output_json = _truncate(output_json)
+            row.status = status
+            if error_message is not None:
+                row.error_message = _truncate(error_message, 4000)
+            if http_status_code is not None:
+                row.http_status_code = http_status_code
+            if duration_ms is not None:
+                row.duration_ms = duration_ms
+            if timings_json is not None:
+                row.timings_json = timings_json
+            if status == "completed" and row.meeting_id:
+                await session.execute(
+                    delete(InterviewSummary).where(
+                        InterviewSummary.meeting_id == row.meeting_id,
+                        InterviewSummary.series_id == row.series_id,
+                        # IS NULL when the row has no license key
+                        InterviewSummary.license_key == row.license_key,
+                        InterviewSummary.id != row.id,
+                        InterviewSummary.status != "pending",
+                    )
+                )
+            await session.flush()
+            return True
+    except Exception as e:
+        logger.error(f"[InterviewSummary] Update error: {e}")
+        raise
+
+
+async def list_interview_summaries(
+    limit: int = 50,
+    offset: int = 0,
+    status: str | None = None,
+    search: str | None = None,
+) -> tuple[List[Dict], int]:
+    """List interview_summaries. Returns (items, total_count). Latest first."""
+    async with get_async_session() as session:
+        q = select(InterviewSummary)
+        count_q = select(func.count()).select_from(InterviewSummary)
+        if status:
+            q = q.where(InterviewSummary.status == status)
+            count_q = count_q.where(InterviewSummary.status == status)
+        if search and search.strip():
+            term = f"%{search.strip().lower()}%"
+            search_filter = or_(
+                func.lower(func.coalesce(InterviewSummary.license_key, "")).like(term),
+                func.lower(func.coalesce(InterviewSummary.installation_id, "")).like(term),
+                func.lower(func.coalesce(InterviewSummary.meeting_id, "")).like(term),
+            )
+            q = q.where(search_filter)
+            count_q = count_q.where(search_filter)
+        total = (await session.execute(count_q)).scalar() or 0
+        result = await session.execute(
+            q.order_by(InterviewSummary.id.desc()).limit(limit).offset(offset)
+        )
+        return ([_row_to_dict(r) for r in result.scalars().all()], total)
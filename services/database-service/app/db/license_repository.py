@@ -129,12 +129,13 @@ async def update_license(
                 if dup.scalar_one_or_none():
                     return {"success": False, "error": "License key already exists"}
 
+            previous_license_key = lic.license_key
             lic.email = email.lower()
             lic.license_key = license_key
             lic.expiry_date = expiry_date
             await session.flush()
             logger.info(f"[Update] License id={license_id} updated")
-        return {"success": True}
+        return {"success": True, "previous_license_key": previous_license_key}
     except Exception as e:
         logger.error(f"[Update] Error: {e}")
         return {"success": False, "error": str(e)}
@@ -148,10 +149,11 @@ async def delete_license(license_id: int) -> Dict:
             lic = result.scalar_one_or_none()
             if not lic:
                 return {"success": False, "error": "License not found"}
+            license_key = lic.license_key
             await session.delete(lic)
             await session.flush()
             logger.info(f"[Delete] License id={license_id} deleted")
-        return {"success": True}
+        return {"success": True, "license_key": license_key}
     except Exception as e:
         logger.error(f"[Delete] Error: {e}")
         return {"success": False, "error": str(e)}
@@ -0,0 +1,52 @@
+"""HTTP client for notifying llm-service about license changes."""
+import asyncio
+from typing import List
+
+import httpx
+
+from app.config import settings
+from app.utils.logger import get_logger
+from app.utils.tracing import TracingTransport
+
+logger = get_logger(__name__)
+
+
+async def _invalidate_license_cache(license_keys: List[str]) -> None:
+    url = settings.llm_service_url or ""
+    if not url:
+        return
+    headers = {"X-Admin-Token": settings.llm_admin_token} if settings.llm_admin_token else {}
+    try:
+        async with httpx.AsyncClient(timeout=5.0, transport=TracingTransport()) as client:
+            r = await client.post(
+                f"{url.rstrip('/')}/api/v1/admin/license-cache/invalidate",
+                json={"license_keys": license_keys},
+                headers=headers,
+            )
+            r.raise_for_status()
+    except Exception as e:
+        logger.warning(f"Failed to invalidate llm-service license cache: {e}")
+
+
+# Pending invalidation calls; the event loop only keeps weak references to tasks
+_pending: set[asyncio.Task] = set()
+
+
+def _done(task: asyncio.Task) -> None:
+    _pending.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning(f"llm-service license cache invalidation failed: {task.exception()}")
+
+
+def notify_license_changed(*license_keys: str | None) -> None:
+    """
+    Fire-and-forget: tell llm-service to drop cached verdicts for these keys. This reaches
+    the one llm-service worker that takes the request; the others expire the verdict
+    within their LICENSE_CACHE_TTL_SECONDS.
+    """
+    if not settings.llm_service_url:
+        return
+    keys = [k for k in license_keys if k]
+    task = asyncio.create_task(_invalidate_license_cache(keys))
+    _pending.add(task)
+    task.add_done_callback(_done)
@@ -1,25 +1,44 @@
 from pathlib import Path
 
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response
 from fastapi.staticfiles import StaticFiles
 
 from app.api.routes import router
 from app.config import settings
 from app.database import init_database
+from app.database.connection import pool_stats
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.tracing import TracingMiddleware
 from app.utils.logger import setup_logging
+from app.utils.metrics import CONTENT_TYPE, gauge_callback, registry
+from app.utils.tracing import recorder
 
 PUBLIC_DIR = Path(__file__).parent.parent / "public"
 
 setup_logging()
+recorder.configure(
+    "database",
+    enabled=settings.tracing_enabled,
+    buffer_size=settings.trace_buffer_size,
+    export_path=settings.trace_export_path,
+)
+
+gauge_callback(
+    "db_pool_connections",
+    "SQLAlchemy pool occupancy (overflow is negative while below pool size)",
+    lambda: {(name,): value for name, value in pool_stats().items()},
+    ("state",),
+)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await init_database()
     yield
+    recorder.close()
 
 
 app = FastAPI(
@@ -36,6 +55,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(TracingMiddleware)
 
 app.include_router(router)
 
@@ -50,6 +71,24 @@ async def health():
     return {"status": "healthy"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics of this worker (read from memory; never queries the database)."""
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
+
+
+@app.get("/traces")
+async def traces(limit: int = Query(50, ge=1, le=1000)):
+    """Most recent requests handled by this worker (server spans), newest first."""
+    return {"service": recorder.service, **recorder.stats(), "requests": recorder.recent(limit)}
+
+
+@app.get("/traces/{trace_id}")
+async def trace(trace_id: str):
+    """This worker's spans of one trace, including SQL statements."""
+    return {"service": recorder.service, "trace_id": trace_id, "spans": recorder.trace(trace_id)}
+
+
 # --- Admin hub and UIs ---
 
 @app.get("/admin")
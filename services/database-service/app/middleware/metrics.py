@@ -0,0 +1,49 @@
+"""Middleware recording per-route request count and latency for /metrics."""
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.metrics import counter, histogram
+
+_SKIP_PATHS = frozenset(("/metrics",))
+
+http_requests = counter(
+    "http_requests_total", "HTTP requests by route template and status", ("method", "route", "status")
+)
+http_request_duration = histogram(
+    "http_request_duration_seconds", "Time until the response was fully sent", ("method", "route")
+)
+
+
+def _route_template(scope: Scope) -> str:
+    # Set by the router on the matched route; the template keeps label cardinality bounded
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    """Pure ASGI: observes status and total duration without touching the body."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in _SKIP_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500  # app raised before starting a response
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = _route_template(scope)
+            http_requests.inc(scope["method"], route, str(status_code))
+            http_request_duration.observe(time.perf_counter() - start, scope["method"], route)
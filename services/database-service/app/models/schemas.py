@@ -39,6 +39,11 @@ class LogApiRequestBody(BaseModel):
     response_body: str | None = Field(None, description="Response body (truncated)")
     status_code: int | None = Field(None, description="HTTP status code")
     duration_ms: int | None = Field(None, description="Request duration in ms")
+    timestamp: str | None = Field(None, description="When the request was served (ISO 8601); defaults to insert time")
+
+
+class LogApiRequestsBulkBody(BaseModel):
+    requests: list[LogApiRequestBody] = Field(..., description="Request log rows", max_length=1000)
 
 
 class CreateExtractActionItemBody(BaseModel):
@@ -56,3 +61,30 @@ class UpdateExtractActionItemBody(BaseModel):
     error_message: str | None = Field(None, description="Error message if failed")
     http_status_code: int | None = Field(None, description="HTTP status code")
     duration_ms: int | None = Field(None, description="Request duration in ms")
+    timings_json: str | None = Field(None, description='Per-stage timings as compact JSON ({"stage": ms})')
+
+
+class ExtractActionItemsByHashesBody(BaseModel):
+    hashes: list[str] = Field(..., description="input_hash values to look up", max_length=500)
+
+
+class CreateInterviewSummaryBody(BaseModel):
+    correlation_id: str = Field(..., description="Unique request correlation ID")
+    input_hash: str = Field(..., description="Canonical hash of meeting_details (llm-service input_hash)")
+    license_key: str | None = Field(None, description="License key from client")
+    installation_id: str | None = Field(None, description="Installation ID from client")
+    series_id: str | None = Field(None, description="Meeting series ID")
+    meeting_id: str | None = Field(None, description="Meeting instance ID")
+    input_json: str | None = Field(None, description="Full request body as JSON string")
+    max_age_seconds: int | None = Field(None, ge=0, description="Completed summaries older than this are recomputed")
+    pending_timeout_seconds: int = Field(300, ge=0, description="Pending summaries older than this are taken over")
+
+
+class UpdateInterviewSummaryBody(BaseModel):
+    correlation_id: str = Field(..., description="Correlation ID to update")
+    output_json: str | None = Field(None, description="InterviewSummaryCore as JSON string")
+    status: str = Field("completed", description="Status: completed, failed")
+    error_message: str | None = Field(None, description="Error message if failed")
+    http_status_code: int | None = Field(None, description="HTTP status code")
+    duration_ms: int | None = Field(None, description="Request duration in ms")
+    timings_json: str | None = Field(None, description='Per-stage timings as compact JSON ({"stage": ms})')
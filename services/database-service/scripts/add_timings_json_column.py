@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Add timings_json column (per-stage timings from llm-service) to extract_action_items
+for both SQLite and PostgreSQL. New databases get it from create_all; run this to
+migrate existing ones (local SQLite and Railway PostgreSQL).
+
+Usage:
+    # PostgreSQL (Railway) - uses DATABASE_URL from .env:
+    cd services/database-service && python scripts/add_timings_json_column.py
+
+    # SQLite - specify DB_PATH or use default (./data/licenses.db):
+    DB_PATH=./data python scripts/add_timings_json_column.py
+
+    # Or run against a specific SQLite file:
+    python scripts/add_timings_json_column.py --sqlite ../db-data/licenses.db
+"""
+import argparse
+import asyncio
+import os
+import sqlite3
+import sys
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+DB_SERVICE_ROOT = SCRIPT_DIR.parent
+sys.path.insert(0, str(DB_SERVICE_ROOT))
+
+if not os.environ.get("DATABASE_URL"):
+    try:
+        from dotenv import load_dotenv
+        load_dotenv(DB_SERVICE_ROOT / ".env")
+    except ImportError:
+        pass
+
+
+def _run_sqlite_migration(db_path: Path) -> None:
+    """Add timings_json column to SQLite extract_action_items."""
+    conn = sqlite3.connect(str(db_path))
+    cur = conn.cursor()
+    cur.execute("PRAGMA table_info(extract_action_items)")
+    columns = [row[1] for row in cur.fetchall()]
+    if "timings_json" in columns:
+        print(f"  SQLite: timings_json column already exists in {db_path}")
+    else:
+        print(f"  SQLite: Adding timings_json column to {db_path}")
+        cur.execute("ALTER TABLE extract_action_items ADD COLUMN timings_json TEXT")
+        conn.commit()
+    conn.close()
+
+
+async def _run_postgres_migration(database_url: str) -> None:
+    """Add timings_json column to PostgreSQL extract_action_items."""
+    if database_url.startswith("postgresql://") and "+asyncpg" not in database_url:
+        database_url = database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
+
+    from sqlalchemy import text
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    engine = create_async_engine(database_url)
+    async with engine.begin() as conn:
+        print("  PostgreSQL: Adding timings_json column (if not exists)")
+        await conn.execute(text(
+            "ALTER TABLE extract_action_items ADD COLUMN IF NOT EXISTS timings_json TEXT"
+        ))
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Add timings_json column to extract_action_items")
+    parser.add_argument(
+        "--sqlite",
+        metavar="PATH",
+        help="Path to SQLite DB (e.g. ../db-data/licenses.db). If not set, uses DATABASE_URL or default.",
+    )
+    args = parser.parse_args()
+
+    database_url = os.environ.get("DATABASE_URL")
+
+    if args.sqlite:
+        path = Path(args.sqlite)
+        if not path.is_absolute():
+            path = (DB_SERVICE_ROOT / path).resolve()
+        if not path.exists():
+            print(f"Error: SQLite file not found: {path}")
+            sys.exit(1)
+        print(f"Migrating SQLite: {path}")
+        _run_sqlite_migration(path)
+        print("Done.")
+        return
+
+    if database_url and "postgresql" in database_url:
+        print("Migrating PostgreSQL (Railway)...")
+        asyncio.run(_run_postgres_migration(database_url))
+        print("Done.")
+        return
+
+    db_path = os.environ.get("DB_PATH", str(DB_SERVICE_ROOT / "data" / "licenses.db"))
+    path = Path(db_path)
+    if path.is_dir():
+        path = path / "licenses.db"
+    if not path.exists():
+        print(f"SQLite DB not found at {path}. Creating tables on first run will include timings_json.")
+        sys.exit(0)
+    print(f"Migrating SQLite: {path}")
+    _run_sqlite_migration(path)
+    print("Done.")
+
+
+if __name__ == "__main__":
+    main()
@@ -55,9 +55,35 @@ CREATE TABLE IF NOT EXISTS extract_action_items (
     status VARCHAR(20) NOT NULL DEFAULT 'pending',
     error_message TEXT,
     http_status_code INTEGER,
-    duration_ms INTEGER
+    duration_ms INTEGER,
+    timings_json TEXT
 );
 CREATE INDEX IF NOT EXISTS ix_extract_action_items_correlation_id ON extract_action_items (correlation_id);
 CREATE INDEX IF NOT EXISTS ix_extract_action_items_license_key ON extract_action_items (license_key);
 CREATE INDEX IF NOT EXISTS ix_extract_action_items_installation_id ON extract_action_items (installation_id);
 CREATE UNIQUE INDEX IF NOT EXISTS ix_extract_action_items_input_hash ON extract_action_items (input_hash) WHERE input_hash IS NOT NULL;
+
+-- Interview summaries (llm-service /summarize-interview cache, one row per input_hash)
+CREATE TABLE IF NOT EXISTS interview_summaries (
+    id SERIAL PRIMARY KEY,
+    correlation_id VARCHAR(64) NOT NULL UNIQUE,
+    created_at VARCHAR(50),
+    updated_at VARCHAR(50),
+    license_key VARCHAR(255),
+    installation_id VARCHAR(255),
+    series_id VARCHAR(255),
+    meeting_id VARCHAR(255),
+    input_json TEXT,
+    output_json TEXT,
+    input_hash VARCHAR(64) NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',
+    error_message TEXT,
+    http_status_code INTEGER,
+    duration_ms INTEGER,
+    timings_json TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_interview_summaries_correlation_id ON interview_summaries (correlation_id);
+CREATE INDEX IF NOT EXISTS ix_interview_summaries_license_key ON interview_summaries (license_key);
+CREATE INDEX IF NOT EXISTS ix_interview_summaries_installation_id ON interview_summaries (installation_id);
+CREATE INDEX IF NOT EXISTS ix_interview_summaries_meeting_id ON interview_summaries (meeting_id);
+CREATE UNIQUE INDEX IF NOT EXISTS ix_interview_summaries_input_hash ON interview_summaries (input_hash);
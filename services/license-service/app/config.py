@@ -7,6 +7,11 @@ class Settings(BaseSettings):
     host: str = "0.0.0.0"
     port: int = 8001  # Railway overrides via PORT env var
 
+    # Tracing: recent spans in a ring buffer (GET /traces), optionally appended to a JSONL file
+    tracing_enabled: bool = True
+    trace_buffer_size: int = 2000  # spans
+    trace_export_path: str = ""
+
     class Config:
         env_file = ".env"
         case_sensitive = False
@@ -1,18 +1,39 @@
-"""HTTP client for database service."""
+"""HTTP client for database service (calls carry the request's traceparent and X-Request-Id)."""
 import os
-from typing import Any, Dict, List, Optional
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 import httpx
 from app.utils.logger import get_logger
+from app.utils.metrics import histogram
+from app.utils.tracing import TracingTransport
 
 logger = get_logger(__name__)
 
+db_call_duration = histogram(
+    "license_db_call_duration_seconds",
+    "Calls to database-service by HTTP method and outcome",
+    ("method", "outcome"),
+)
+
 DATABASE_SERVICE_URL = os.environ.get("DATABASE_SERVICE_URL", "http://localhost:8002")
 BASE = f"{DATABASE_SERVICE_URL.rstrip('/')}/api/v1/db"
 
 
+@asynccontextmanager
+async def _timed(method: str) -> AsyncIterator[None]:
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        db_call_duration.observe(time.perf_counter() - start, method, outcome)
+
+
 async def _get(path: str, params: Optional[Dict[str, str]] = None) -> Any:
-    async with httpx.AsyncClient(timeout=10.0) as client:
+    async with _timed("GET"), httpx.AsyncClient(timeout=10.0, transport=TracingTransport()) as client:
         r = await client.get(f"{BASE}{path}", params=params)
         if r.status_code == 404:
             return None
@@ -21,14 +42,14 @@ async def _get(path: str, params: Optional[Dict[str, str]] = None) -> Any:
 
 
 async def _post(path: str, json: Dict) -> Any:
-    async with httpx.AsyncClient(timeout=10.0) as client:
+    async with _timed("POST"), httpx.AsyncClient(timeout=10.0, transport=TracingTransport()) as client:
         r = await client.post(f"{BASE}{path}", json=json)
         r.raise_for_status()
         return r.json()
 
 
 async def _patch(path: str, params: Optional[Dict[str, str]] = None) -> Any:
-    async with httpx.AsyncClient(timeout=10.0) as client:
+    async with _timed("PATCH"), httpx.AsyncClient(timeout=10.0, transport=TracingTransport()) as client:
         r = await client.patch(f"{BASE}{path}", params=params)
         if r.status_code == 404:
             return None
@@ -37,7 +58,7 @@ async def _patch(path: str, params: Optional[Dict[str, str]] = None) -> Any:
 
 
 async def _delete(path: str) -> Any:
-    async with httpx.AsyncClient(timeout=10.0) as client:
+    async with _timed("DELETE"), httpx.AsyncClient(timeout=10.0, transport=TracingTransport()) as client:
         r = await client.delete(f"{BASE}{path}")
         if r.status_code == 404:
             return None
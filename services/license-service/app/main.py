@@ -1,19 +1,38 @@
 import json
+from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import Response
 
 from app.api.routes import router
 from app.config import settings
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.tracing import TracingMiddleware
 from app.utils.logger import setup_logging
+from app.utils.metrics import CONTENT_TYPE, registry
+from app.utils.tracing import recorder
 
 setup_logging()
+recorder.configure(
+    "license",
+    enabled=settings.tracing_enabled,
+    buffer_size=settings.trace_buffer_size,
+    export_path=settings.trace_export_path,
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    recorder.close()
+
 
 app = FastAPI(
     title=settings.app_name,
     version=settings.version,
     description="License management service for Popouts",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -23,6 +42,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(TracingMiddleware)
 
 app.include_router(router)
 
@@ -37,6 +58,24 @@ async def health():
     return {"status": "healthy"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics of this worker (read from memory; never calls database-service)."""
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
+
+
+@app.get("/traces")
+async def traces(limit: int = Query(50, ge=1, le=1000)):
+    """Most recent requests handled by this worker (server spans), newest first."""
+    return {"service": recorder.service, **recorder.stats(), "requests": recorder.recent(limit)}
+
+
+@app.get("/traces/{trace_id}")
+async def trace(trace_id: str):
+    """This worker's spans of one trace, including its calls to database-service."""
+    return {"service": recorder.service, "trace_id": trace_id, "spans": recorder.trace(trace_id)}
+
+
 @app.get("/status")
 async def status():
     """Report which database backend is configured (for verification)."""
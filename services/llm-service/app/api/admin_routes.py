@@ -0,0 +1,76 @@
+"""Operational endpoints: in-process cache statistics and maintenance."""
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from pydantic import BaseModel, Field
+
+from app.config import settings
+from app.services import (
+    license_cache,
+    prompt_compaction,
+    provider_guard,
+    provider_router,
+    summary_cache,
+    summary_revision,
+)
+from app.services.extract_jobs import extract_jobs
+from app.services.llm_json_offload import llm_json_offloader
+from app.services.note_cache import note_cache
+from app.services.openai_client import prompt_cache_stats
+from app.services.provider_registry import provider_registry
+from app.services.request_log_shipper import request_log_shipper
+from app.services.result_cache import extract_result_cache
+from app.services.toqan_poller import toqan_poller
+
+router = APIRouter(prefix="/api/v1/admin", tags=["admin"])
+
+
+class InvalidateLicenseCacheBody(BaseModel):
+    license_keys: List[str] = Field(
+        default_factory=list,
+        description="License keys to drop; empty clears the whole cache",
+    )
+
+
+def require_admin_token(x_admin_token: Optional[str] = Header(default=None)) -> None:
+    """Enforce X-Admin-Token; mutating admin endpoints are disabled while ADMIN_TOKEN is unset."""
+    if not settings.admin_token:
+        raise HTTPException(status_code=403, detail="Admin endpoint disabled: ADMIN_TOKEN is not set")
+    if x_admin_token != settings.admin_token:
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+@router.get("/stats")
+async def get_stats():
+    """In-process cache and poller counters for this worker."""
+    return {
+        "result_cache": extract_result_cache.stats(),
+        "note_cache": note_cache.stats(),
+        "summary_cache": summary_cache.stats(),
+        "summary_revision": summary_revision.stats(),
+        "license_cache": license_cache.stats(),
+        "prompt_compaction": prompt_compaction.stats(),
+        "toqan_poller": toqan_poller.stats(),
+        "jobs": extract_jobs.stats(),
+        "provider_routing": provider_router.stats(),
+        "provider_guards": provider_guard.stats(),
+        "openai_prompt_cache": prompt_cache_stats(),
+        "llm_json": llm_json_offloader.stats(),
+        "request_log": request_log_shipper.stats(),
+    }
+
+
+@router.get("/providers")
+async def get_providers():
+    """Provider instances in the registry: warm-up result, connection pool and breaker state."""
+    return provider_registry.health()
+
+
+@router.post("/license-cache/invalidate", dependencies=[Depends(require_admin_token)])
+async def invalidate_license_cache(body: InvalidateLicenseCacheBody):
+    """
+    Drop cached license verdicts (called by database-service when a license is edited or
+    deleted). Only this worker's cache is cleared; see license_cache.py.
+    """
+    removed = license_cache.invalidate(body.license_keys)
+    return {"removed": removed}
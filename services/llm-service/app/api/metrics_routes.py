@@ -0,0 +1,114 @@
+"""
+Prometheus endpoint: GET /metrics.
+
+Counters and histograms recorded on the hot path live next to the code they measure
+(http_* in the metrics middleware, llm_provider_* in provider_guard, dedup outcomes
+in routes). The gauges and counters below are read at scrape time from the stats the
+services already keep, the same numbers /api/v1/admin/stats reports, so a scrape
+only reads memory.
+"""
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from app import db_client
+from app.services import provider_guard
+from app.services.extract_jobs import extract_jobs
+from app.services.license_cache import license_cache
+from app.services.llm_json_offload import llm_json_offloader
+from app.services.note_cache import note_cache
+from app.services.provider_registry import provider_registry
+from app.services.request_log_shipper import request_log_shipper
+from app.services.result_cache import extract_result_cache
+from app.services.summary_cache import interview_summary_cache
+from app.services.toqan_poller import toqan_poller
+from app.utils.metrics import CONTENT_TYPE, counter_callback, gauge_callback, registry
+
+router = APIRouter(tags=["metrics"])
+
+_CACHES = {
+    "result": extract_result_cache,
+    "note": note_cache,
+    "summary": interview_summary_cache,
+    "license": license_cache,
+}
+
+
+def _per_cache(field: str):
+    return lambda: {(name,): cache.stats()[field] for name, cache in _CACHES.items()}
+
+
+def _per_guard(field: str):
+    return lambda: {(name,): s[field] for name, s in provider_guard.stats().items()}
+
+
+def _by_state(pool: dict) -> dict:
+    return {"active": pool["connections"] - pool["idle"], "idle": pool["idle"]}
+
+
+counter_callback("llm_cache_hits_total", "In-process cache hits", _per_cache("hits"), ("cache",))
+counter_callback("llm_cache_misses_total", "In-process cache misses", _per_cache("misses"), ("cache",))
+counter_callback("llm_cache_evictions_total", "In-process cache LRU evictions", _per_cache("evictions"), ("cache",))
+gauge_callback("llm_cache_entries", "Entries in each in-process cache", _per_cache("size"), ("cache",))
+gauge_callback("llm_cache_bytes", "Estimated bytes held by each in-process cache", _per_cache("bytes"), ("cache",))
+
+gauge_callback("llm_provider_in_flight", "Provider calls holding a bulkhead slot", _per_guard("in_flight"), ("provider",))
+gauge_callback("llm_provider_queue_depth", "Provider calls waiting for a bulkhead slot", _per_guard("queue_depth"), ("provider",))
+counter_callback(
+    "llm_provider_rejections_total",
+    "Provider calls rejected by the bulkhead or circuit breaker",
+    lambda: {
+        (name, reason): s[f"rejected_{reason}"]
+        for name, s in provider_guard.stats().items()
+        for reason in ("queue_full", "queue_timeout", "breaker_open")
+    },
+    ("provider", "reason"),
+)
+gauge_callback(
+    "llm_provider_breaker_open",
+    "1 while the provider's circuit breaker is not closed",
+    lambda: {(name,): int(s["breaker_state"] != "closed") for name, s in provider_guard.stats().items()},
+    ("provider",),
+)
+gauge_callback(
+    "llm_provider_http_connections",
+    "Pooled HTTP connections per provider",
+    lambda: {
+        (name, state): n
+        for name, h in provider_registry.health().items()
+        for state, n in _by_state(h["pool"]).items()
+    },
+    ("provider", "state"),
+)
+gauge_callback(
+    "llm_db_client_connections",
+    "Pooled HTTP connections to database-service",
+    lambda: {(state,): n for state, n in _by_state(db_client.pool_stats()).items()},
+    ("state",),
+)
+gauge_callback("llm_job_queue_depth", "Extract jobs waiting for a worker", lambda: extract_jobs.stats()["queue_depth"])
+gauge_callback("llm_toqan_pending_answers", "Toqan answers being polled", lambda: toqan_poller.stats()["pending"])
+gauge_callback("llm_request_log_buffered", "Request-log rows waiting to be shipped", lambda: request_log_shipper.stats()["buffered"])
+counter_callback(
+    "llm_request_log_dropped_total",
+    "Request-log rows lost: buffer full or not running (buffer), or not stored by database-service (ship_failed)",
+    lambda: {
+        ("buffer",): request_log_shipper.stats()["dropped"],
+        ("ship_failed",): request_log_shipper.stats()["failed"],
+    },
+    ("reason",),
+)
+counter_callback(
+    "llm_json_parses_total",
+    "LLM answers parsed, by path",
+    lambda: {
+        (path,): llm_json_offloader.stats()[path]
+        for path in ("fast", "repaired_inline", "repaired_offloaded", "failed")
+    },
+    ("path",),
+)
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """This worker's metrics in Prometheus text format."""
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
@@ -1,29 +1,56 @@
 import asyncio
-import hashlib
 import json
 import time
 import uuid
+from typing import AsyncIterator, Callable, List
 
-import httpx
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from app import db_client
 from app.models.schemas import (
     ActionExtractionRequest,
     ActionExtractionResponse,
+    BatchActionExtractionRequest,
+    InterviewSummaryCore,
     InterviewSummaryRequest,
     InterviewSummaryResponse,
+    NoteWithActions,
 )
 from app.services.llm_provider import LLMProvider
-from app.services.toqan_client import ToqanClient
-from app.services.openai_client import OpenAIClient
+from app.services.provider_guard import ProviderOverloaded
+from app.services.provider_registry import provider_registry
+from app.services.extract_jobs import ExtractJob, JobQueueFull, extract_jobs
+from app.services.input_hash import bind_to_request, compute_input_hash
+from app.services.note_cache import extract_with_note_cache
+from app.services.license_cache import LicenseLookupError, lookup_license
+from app.services.result_cache import get_cached_result, remember_result
+from app.services.summary_cache import get_cached_summary, is_fresh_record, remember_summary
+from app.services.summary_revision import plan_revision, revise_summary
 from app.config import settings
 from app.utils.logger import get_logger
+from app.utils.metrics import counter
+from app.utils.singleflight import SingleFlight
+from app.utils.timing import current_timings, stage, start_timings
 
 logger = get_logger(__name__)
 router = APIRouter(prefix="/api/v1", tags=["llm"])
 
+# Coalesces concurrent identical extract requests in this worker (keyed by input_hash).
+# The extract_action_items record only coordinates duplicates across workers.
+_extract_flight: SingleFlight[ActionExtractionResponse] = SingleFlight()
+
+# Same for interview summaries, keyed by the same canonical input_hash
+_summary_flight: SingleFlight[InterviewSummaryCore] = SingleFlight()
+
+# local_cache / coalesced / db_completed / db_pending (waited on another worker) / miss (LLM called)
+dedup_outcomes = counter("llm_extract_dedup_total", "How extract requests were deduplicated", ("outcome",))
+summary_dedup_outcomes = counter(
+    "llm_summary_dedup_total", "How interview summary requests were deduplicated", ("outcome",)
+)
+
 
 def get_llm_provider() -> LLMProvider:
-    """Factory function to get the configured LLM provider"""
+    """Return the configured LLM provider (long-lived instance from the provider registry)"""
     provider_name = settings.llm_provider
     
     if provider_name == "toqan":
@@ -32,14 +59,22 @@ def get_llm_provider() -> LLMProvider:
                 status_code=500,
                 detail="Toqan API key not configured"
             )
-        return ToqanClient()
+        return provider_registry.get("toqan")
     elif provider_name == "openai":
         if not settings.openai_api_key:
             raise HTTPException(
                 status_code=500,
                 detail="OpenAI API key not configured"
             )
-        return OpenAIClient()
+        return provider_registry.get("openai")
+    elif provider_name == "auto":
+        provider_router = provider_registry.router()
+        if provider_router is None:
+            raise HTTPException(
+                status_code=500,
+                detail="No LLM provider API key configured"
+            )
+        return provider_router
     else:
         raise HTTPException(
             status_code=500,
@@ -47,32 +82,68 @@ def get_llm_provider() -> LLMProvider:
         )
 
 
+def _overloaded_exception(e: ProviderOverloaded) -> HTTPException:
+    """429/503 with Retry-After for a call rejected by the provider bulkhead or breaker."""
+    return HTTPException(status_code=e.status_code, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+
 def _compute_input_hash(meeting_details) -> str:
-    """Canonical hash of meeting_details for deduplication."""
-    canonical = json.dumps(meeting_details.model_dump(mode="json"), sort_keys=True)
-    return hashlib.sha256(canonical.encode()).hexdigest()
+    """Versioned canonical hash of meeting_details for deduplication (see input_hash.py)."""
+    return compute_input_hash(meeting_details)
 
 
 async def _get_by_input_hash(input_hash: str) -> dict | None:
     """Fetch extract_action_item by input_hash. Returns None if not found."""
-    url = getattr(settings, "database_service_url", None) or ""
-    if not url:
+    if not db_client.is_configured():
         return None
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            r = await client.get(
-                f"{url.rstrip('/')}/api/v1/db/extract-action-items/by-input-hash",
-                params={"hash": input_hash},
-            )
-            if r.status_code == 404:
-                return None
-            r.raise_for_status()
-            return r.json()
+        r = await db_client.get_client().get(
+            "/extract-action-items/by-input-hash",
+            params={"hash": input_hash},
+        )
+        if r.status_code == 404:
+            return None
+        r.raise_for_status()
+        return r.json()
     except Exception as e:
         logger.warning(f"Failed to get by input_hash: {e}")
         return None
 
 
+async def _get_by_input_hashes(input_hashes: List[str]) -> dict[str, dict]:
+    """Fetch extract_action_items for many input_hashes in one call. Returns {input_hash: record}."""
+    if not db_client.is_configured() or not input_hashes:
+        return {}
+    try:
+        r = await db_client.get_client().post(
+            "/extract-action-items/by-input-hashes",
+            json={"hashes": input_hashes},
+        )
+        r.raise_for_status()
+        return r.json().get("items", {})
+    except Exception as e:
+        logger.warning(f"Failed to get by input_hashes: {e}")
+        return {}
+
+
+async def _get_by_correlation_id(correlation_id: str) -> dict | None:
+    """Fetch extract_action_item by correlation_id (job id). Returns None if not found."""
+    if not db_client.is_configured():
+        return None
+    try:
+        r = await db_client.get_client().get(
+            "/extract-action-items/by-correlation-id",
+            params={"correlation_id": correlation_id},
+        )
+        if r.status_code == 404:
+            return None
+        r.raise_for_status()
+        return r.json()
+    except Exception as e:
+        logger.warning(f"Failed to get by correlation_id: {e}")
+        return None
+
+
 async def _poll_until_completed(input_hash: str, timeout_sec: float = 120, poll_interval: float = 2.0) -> dict | None:
     """Poll for completed result. Returns record with output_json or None on timeout."""
     elapsed = 0.0
@@ -97,8 +168,7 @@ async def _create_extract_record(
     input_hash: str | None = None,
 ):
     """Fire-and-forget: create extract_action_item record in database service."""
-    url = getattr(settings, "database_service_url", None) or ""
-    if not url:
+    if not db_client.is_configured():
         return
     try:
         payload = {
@@ -109,11 +179,7 @@ async def _create_extract_record(
         }
         if input_hash:
             payload["input_hash"] = input_hash
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            await client.post(
-                f"{url.rstrip('/')}/api/v1/db/extract-action-items",
-                json=payload,
-            )
+        await db_client.get_client().post("/extract-action-items", json=payload)
     except Exception as e:
         logger.warning(f"Failed to create extract record: {e}")
 
@@ -125,24 +191,24 @@ async def _update_extract_record(
     error_message: str | None,
     http_status_code: int,
     duration_ms: int,
+    timings_json: str | None = None,
 ):
     """Fire-and-forget: update extract_action_item record in database service."""
-    url = getattr(settings, "database_service_url", None) or ""
-    if not url:
+    if not db_client.is_configured():
         return
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            await client.patch(
-                f"{url.rstrip('/')}/api/v1/db/extract-action-items",
-                json={
-                    "correlation_id": correlation_id,
-                    "output_json": output_json,
-                    "status": status,
-                    "error_message": error_message,
-                    "http_status_code": http_status_code,
-                    "duration_ms": duration_ms,
-                },
-            )
+        await db_client.get_client().patch(
+            "/extract-action-items",
+            json={
+                "correlation_id": correlation_id,
+                "output_json": output_json,
+                "status": status,
+                "error_message": error_message,
+                "http_status_code": http_status_code,
+                "duration_ms": duration_ms,
+                "timings_json": timings_json,
+            },
+        )
     except Exception as e:
         logger.warning(f"Failed to update extract record: {e}")
 
@@ -158,6 +224,20 @@ def _parse_cached_response(output_json: str | None) -> ActionExtractionResponse
         return None
 
 
+def _timings_json() -> str | None:
+    timings = current_timings()
+    return timings.to_json() if timings is not None else None
+
+
+def _cached_from_record(record: dict, input_hash: str) -> ActionExtractionResponse | None:
+    """Parse a completed DB record and keep it in the local result cache."""
+    output_json = record.get("output_json")
+    cached = _parse_cached_response(output_json)
+    if cached:
+        remember_result(input_hash, cached, output_json)
+    return cached
+
+
 async def _validate_license(license_key: str | None) -> None:
     """
     Validate license_key server-side. Raises HTTPException 403 if invalid.
@@ -167,27 +247,18 @@ async def _validate_license(license_key: str | None) -> None:
     if not license_key or not license_key.strip():
         return  # Free trial - no license to validate
 
-    url = getattr(settings, "database_service_url", None) or ""
-    if not url:
+    if not db_client.is_configured():
         logger.warning("DATABASE_SERVICE_URL not set - cannot validate license")
         raise HTTPException(status_code=403, detail="License validation unavailable")
 
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            r = await client.get(
-                f"{url.rstrip('/')}/api/v1/db/license/by-key",
-                params={"license_key": license_key.strip()},
-            )
-            if r.status_code == 404:
-                logger.warning(f"License not found: {license_key[:20]}...")
-                raise HTTPException(status_code=403, detail="Invalid or inactive license")
-            r.raise_for_status()
-            license_data = r.json()
-    except HTTPException:
-        raise
-    except Exception as e:
+        license_data = await lookup_license(license_key.strip())
+    except LicenseLookupError as e:
         logger.warning(f"License validation failed: {e}")
         raise HTTPException(status_code=503, detail="License validation service unavailable")
+    if license_data is None:
+        logger.warning(f"License not found: {license_key[:20]}...")
+        raise HTTPException(status_code=403, detail="Invalid or inactive license")
 
     # Check expiry
     expiry_str = license_data.get("expiry_date")
@@ -211,48 +282,92 @@ async def _validate_license(license_key: str | None) -> None:
 
 
 @router.post("/extract-actions", response_model=ActionExtractionResponse)
-async def extract_actions(http_request: Request, request: ActionExtractionRequest):
+async def extract_actions(http_request: Request, request: ActionExtractionRequest, response: Response):
     """
     Extract action items from meeting notes using the configured LLM provider.
     Validates license server-side when X-License-Key is present.
-    Deduplicates by input_hash: returns cached result if same request seen before.
-    If another request with same input is pending, polls until it completes.
+    Deduplicates by input_hash: returns the local or DB cached result if the same
+    request (up to timestamps, whitespace and action order) was seen before, with
+    this request's notes.
+    Concurrent duplicates in this worker await the in-flight call; a duplicate
+    pending in another worker is polled until it completes.
+    Per-stage timings are returned in the Server-Timing header.
     """
+    timings = start_timings()
     license_key = http_request.headers.get("X-License-Key") or http_request.headers.get("x-license-key")
     installation_id = http_request.headers.get("X-Installation-Id") or http_request.headers.get("x-installation-id")
 
     # Server-side license validation
-    await _validate_license(license_key)
+    with stage("license"):
+        await _validate_license(license_key)
 
-    input_hash = _compute_input_hash(request.meeting_details)
+    with stage("input_hash"):
+        input_hash = _compute_input_hash(request.meeting_details)
+    cached = get_cached_result(input_hash)
+    if cached:
+        dedup_outcomes.inc("local_cache")
+        logger.info(f"Returning locally cached extract result for input_hash={input_hash[:16]}...")
+        response.headers["Server-Timing"] = timings.server_timing()
+        return bind_to_request(cached, request.meeting_details)
+
+    result, shared = await _extract_flight.do(
+        input_hash,
+        lambda: _extract_once(request, input_hash, license_key, installation_id),
+    )
+    if shared:
+        dedup_outcomes.inc("coalesced")
+        logger.info(f"Coalesced duplicate extract request onto in-flight input_hash={input_hash[:16]}...")
+    response.headers["Server-Timing"] = timings.server_timing()
+    return bind_to_request(result, request.meeting_details)
+
+
+async def _extract_once(
+    request: ActionExtractionRequest,
+    input_hash: str,
+    license_key: str | None,
+    installation_id: str | None,
+    on_note: Callable[[int, NoteWithActions], None] | None = None,
+    prefetched: tuple[dict | None] | None = None,
+    correlation_id: str | None = None,
+) -> ActionExtractionResponse:
+    """
+    Dedup against database-service, then call the LLM for notes missing from the note cache and
+    record the result (one per input_hash). With on_note, the provider is streamed and on_note is
+    called as each note's actions arrive. prefetched=(record,) skips the dedup lookup when the
+    caller already fetched the record (batch endpoint). correlation_id (job id) is used for the
+    new extract_action_items record instead of a fresh uuid.
+    """
     input_json = json.dumps(request.model_dump(mode="json"))
 
     # Check for cached or in-flight duplicate
-    existing = await _get_by_input_hash(input_hash)
+    with stage("dedup"):
+        existing = prefetched[0] if prefetched is not None else await _get_by_input_hash(input_hash)
     if existing:
         if existing.get("status") == "completed":
-            cached = _parse_cached_response(existing.get("output_json"))
+            cached = _cached_from_record(existing, input_hash)
             if cached:
+                dedup_outcomes.inc("db_completed")
                 logger.info(f"Returning cached extract result for input_hash={input_hash[:16]}...")
                 return cached
         if existing.get("status") == "pending":
+            dedup_outcomes.inc("db_pending")
             logger.info(f"Duplicate request pending, polling for input_hash={input_hash[:16]}...")
-            record = await _poll_until_completed(input_hash)
+            with stage("dedup_wait"):
+                record = await _poll_until_completed(input_hash)
             if record:
-                cached = _parse_cached_response(record.get("output_json"))
+                cached = _cached_from_record(record, input_hash)
                 if cached:
                     return cached
             raise HTTPException(status_code=504, detail="Timeout waiting for duplicate request")
 
     # New request: create record and call LLM
-    correlation_id = str(uuid.uuid4())
-    url = getattr(settings, "database_service_url", None) or ""
+    correlation_id = correlation_id or str(uuid.uuid4())
     create_result = None
-    if url:
+    if db_client.is_configured():
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                r = await client.post(
-                    f"{url.rstrip('/')}/api/v1/db/extract-action-items",
+            with stage("record_create"):
+                r = await db_client.get_client().post(
+                    "/extract-action-items",
                     json={
                         "correlation_id": correlation_id,
                         "license_key": license_key,
@@ -261,31 +376,36 @@ async def extract_actions(http_request: Request, request: ActionExtractionReques
                         "input_hash": input_hash,
                     },
                 )
-                r.raise_for_status()
-                create_result = r.json()
+            r.raise_for_status()
+            create_result = r.json()
         except Exception as e:
             logger.warning(f"Failed to create extract record: {e}")
 
     # If create returned existing (race), handle it
     if create_result and not create_result.get("created", True):
         if create_result.get("status") == "completed":
-            cached = _parse_cached_response(create_result.get("output_json"))
+            cached = _cached_from_record(create_result, input_hash)
             if cached:
+                dedup_outcomes.inc("db_completed")
                 return cached
         if create_result.get("status") == "pending":
-            record = await _poll_until_completed(input_hash)
+            dedup_outcomes.inc("db_pending")
+            with stage("dedup_wait"):
+                record = await _poll_until_completed(input_hash)
             if record:
-                cached = _parse_cached_response(record.get("output_json"))
+                cached = _cached_from_record(record, input_hash)
                 if cached:
                     return cached
             raise HTTPException(status_code=504, detail="Timeout waiting for duplicate request")
 
+    dedup_outcomes.inc("miss")
     start = time.perf_counter()
     try:
         provider = get_llm_provider()
         logger.info(f"Extracting actions using {provider.get_provider_name()} provider")
 
-        notes_with_actions = await provider.extract_actions(request.meeting_details)
+        with stage("llm"):
+            notes_with_actions = await extract_with_note_cache(provider, request.meeting_details, on_note)
 
         logger.info(f"Successfully extracted actions for {len(notes_with_actions)} notes")
 
@@ -296,7 +416,9 @@ async def extract_actions(http_request: Request, request: ActionExtractionReques
         )
 
         duration_ms = int((time.perf_counter() - start) * 1000)
-        output_json = json.dumps(response.model_dump(mode="json"))
+        with stage("serialize"):
+            output_json = json.dumps(response.model_dump(mode="json"))
+        remember_result(input_hash, response, output_json)
 
         asyncio.create_task(
             _update_extract_record(
@@ -306,12 +428,14 @@ async def extract_actions(http_request: Request, request: ActionExtractionReques
                 error_message=None,
                 http_status_code=200,
                 duration_ms=duration_ms,
+                timings_json=_timings_json(),
             )
         )
 
         return response
 
-    except HTTPException as he:
+    except (HTTPException, ProviderOverloaded) as e:
+        he = _overloaded_exception(e) if isinstance(e, ProviderOverloaded) else e
         duration_ms = int((time.perf_counter() - start) * 1000)
         asyncio.create_task(
             _update_extract_record(
@@ -321,9 +445,12 @@ async def extract_actions(http_request: Request, request: ActionExtractionReques
                 error_message=str(he.detail) if he.detail else str(he),
                 http_status_code=he.status_code,
                 duration_ms=duration_ms,
+                timings_json=_timings_json(),
             )
         )
-        raise
+        if he is e:
+            raise
+        raise he from e
     except Exception as e:
         duration_ms = int((time.perf_counter() - start) * 1000)
         logger.error(f"Error extracting actions: {str(e)}")
@@ -336,6 +463,7 @@ async def extract_actions(http_request: Request, request: ActionExtractionReques
                 error_message=str(e),
                 http_status_code=500,
                 duration_ms=duration_ms,
+                timings_json=_timings_json(),
             )
         )
 
@@ -345,35 +473,576 @@ async def extract_actions(http_request: Request, request: ActionExtractionReques
         )
 
 
+def _ndjson(frame: dict) -> bytes:
+    return (json.dumps(frame) + "\n").encode()
+
+
+def _note_frame(note_index: int, note_with_actions: NoteWithActions) -> bytes:
+    return _ndjson({
+        "type": "note",
+        "note_index": note_index,
+        "note_with_actions": note_with_actions.model_dump(mode="json"),
+    })
+
+
+def _final_frames(response: ActionExtractionResponse, emitted: set[int]) -> List[bytes]:
+    """Notes not streamed yet, then the summary frame with the full response."""
+    frames = [
+        _note_frame(i, item)
+        for i, item in enumerate(response.notes_with_actions)
+        if i not in emitted
+    ]
+    frames.append(_ndjson({"type": "summary", "response": response.model_dump(mode="json")}))
+    return frames
+
+
+@router.post("/extract-actions/stream")
+async def extract_actions_stream(http_request: Request, request: ActionExtractionRequest):
+    """
+    Streaming variant of /extract-actions (NDJSON, one JSON object per line):
+    - {"type": "note", "note_index": i, "note_with_actions": {...}} as each note is parsed
+    - {"type": "summary", "response": ActionExtractionResponse} once complete (also recorded
+      in extract_action_items and the result cache)
+    - {"type": "error", "status_code": ..., "detail": ...} if extraction fails mid-stream
+    License, dedup and coalescing behave as in /extract-actions; cached results stream at once.
+    """
+    license_key = http_request.headers.get("X-License-Key") or http_request.headers.get("x-license-key")
+    installation_id = http_request.headers.get("X-Installation-Id") or http_request.headers.get("x-installation-id")
+
+    await _validate_license(license_key)
+
+    input_hash = _compute_input_hash(request.meeting_details)
+    cached = get_cached_result(input_hash)
+
+    async def frames() -> AsyncIterator[bytes]:
+        emitted: set[int] = set()
+        if cached:
+            dedup_outcomes.inc("local_cache")
+            for frame in _final_frames(bind_to_request(cached, request.meeting_details), emitted):
+                yield frame
+            return
+
+        queue: asyncio.Queue[tuple[int, NoteWithActions]] = asyncio.Queue()
+
+        def on_note(note_index: int, note_with_actions: NoteWithActions) -> None:
+            queue.put_nowait((note_index, note_with_actions))
+
+        flight = asyncio.ensure_future(_extract_flight.do(
+            input_hash,
+            lambda: _extract_once(request, input_hash, license_key, installation_id, on_note=on_note),
+        ))
+        try:
+            while not flight.done() or not queue.empty():
+                if queue.empty():
+                    getter = asyncio.ensure_future(queue.get())
+                    await asyncio.wait({getter, flight}, return_when=asyncio.FIRST_COMPLETED)
+                    if not getter.done():
+                        getter.cancel()
+                        continue
+                    note_index, note_with_actions = getter.result()
+                else:
+                    note_index, note_with_actions = queue.get_nowait()
+                if note_index not in emitted:
+                    emitted.add(note_index)
+                    yield _note_frame(note_index, note_with_actions)
+            result, shared = flight.result()
+            if shared:
+                dedup_outcomes.inc("coalesced")
+            response = bind_to_request(result, request.meeting_details)
+        except HTTPException as he:
+            yield _ndjson({"type": "error", "status_code": he.status_code, "detail": he.detail})
+            return
+        except Exception as e:
+            logger.error(f"Error streaming extract actions: {str(e)}")
+            yield _ndjson({"type": "error", "status_code": 500, "detail": f"Failed to extract actions: {str(e)}"})
+            return
+        for frame in _final_frames(response, emitted):
+            yield frame
+
+    return StreamingResponse(frames(), media_type="application/x-ndjson")
+
+
+@router.post("/extract-actions:batch")
+async def extract_actions_batch(http_request: Request, request: BatchActionExtractionRequest):
+    """
+    Extract actions for many meetings in one call (NDJSON stream, one frame per meeting as it finishes):
+    - {"type": "result", "index": i, "response": ActionExtractionResponse}
+    - {"type": "error", "index": i, "status_code": ..., "detail": ...}
+    - {"type": "done", "count": n, "failed": k} last
+    The license is validated once and dedup uses one multi-hash lookup; provider calls run
+    under a semaphore of BATCH_MAX_CONCURRENCY.
+    """
+    if len(request.meeting_details) > settings.batch_max_items:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large: {len(request.meeting_details)} items (max {settings.batch_max_items})",
+        )
+    license_key = http_request.headers.get("X-License-Key") or http_request.headers.get("x-license-key")
+    installation_id = http_request.headers.get("X-Installation-Id") or http_request.headers.get("x-installation-id")
+
+    await _validate_license(license_key)
+
+    items = [ActionExtractionRequest(meeting_details=md) for md in request.meeting_details]
+    hashes = [_compute_input_hash(item.meeting_details) for item in items]
+    cached = {h: get_cached_result(h) for h in set(hashes)}
+    to_lookup = [h for h, response in cached.items() if response is None]
+    records = await _get_by_input_hashes(to_lookup)
+    semaphore = asyncio.Semaphore(settings.batch_max_concurrency)
+
+    async def run_one(index: int) -> tuple[int, ActionExtractionResponse | None, Exception | None]:
+        input_hash = hashes[index]
+        meeting_details = items[index].meeting_details
+        if cached[input_hash]:
+            dedup_outcomes.inc("local_cache")
+            return index, bind_to_request(cached[input_hash], meeting_details), None
+        try:
+            async with semaphore:
+                response, shared = await _extract_flight.do(
+                    input_hash,
+                    lambda: _extract_once(
+                        items[index], input_hash, license_key, installation_id,
+                        prefetched=(records.get(input_hash),),
+                    ),
+                )
+            if shared:
+                dedup_outcomes.inc("coalesced")
+            return index, bind_to_request(response, meeting_details), None
+        except Exception as e:
+            return index, None, e
+
+    async def frames() -> AsyncIterator[bytes]:
+        tasks = [asyncio.ensure_future(run_one(i)) for i in range(len(items))]
+        failed = 0
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                index, response, error = await next_done
+                if error is None:
+                    yield _ndjson({"type": "result", "index": index, "response": response.model_dump(mode="json")})
+                    continue
+                failed += 1
+                if isinstance(error, HTTPException):
+                    status_code, detail = error.status_code, error.detail
+                else:
+                    logger.error(f"Error extracting actions for batch item {index}: {str(error)}")
+                    status_code, detail = 500, f"Failed to extract actions: {str(error)}"
+                yield _ndjson({"type": "error", "index": index, "status_code": status_code, "detail": detail})
+            yield _ndjson({"type": "done", "count": len(items), "failed": failed})
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    logger.info(
+        f"Batch extract: {len(items)} meeting(s), {sum(1 for h in hashes if cached[h])} cached locally, "
+        f"{len(records)} found in database"
+    )
+    return StreamingResponse(frames(), media_type="application/x-ndjson")
+
+
+def _job_from_record(record: dict) -> dict:
+    """Job status payload for an extract_action_items row (job started elsewhere)."""
+    status = record.get("status")
+    data = {"job_id": record.get("correlation_id")}
+    if status == "completed":
+        cached = _parse_cached_response(record.get("output_json"))
+        if cached:
+            return {**data, "status": "completed", "result": cached.model_dump(mode="json")}
+        return {**data, "status": "failed", "error": "Stored result is unreadable", "http_status_code": 500}
+    if status == "failed":
+        return {
+            **data,
+            "status": "failed",
+            "error": record.get("error_message") or "Extraction failed",
+            "http_status_code": record.get("http_status_code") or 500,
+        }
+    return {**data, "status": "running"}
+
+
+def _readable_by(record: dict, license_key: str | None) -> bool:
+    """Same rule as get_extract_job: a record with a license key is only visible with that key."""
+    return not record.get("license_key") or record.get("license_key") == license_key
+
+
+async def _record_job(
+    job_id: str,
+    license_key: str | None,
+    installation_id: str | None,
+    response: ActionExtractionResponse | None = None,
+    error: Exception | None = None,
+):
+    """
+    Fire-and-forget: give a job whose result came from another correlation_id (a coalesced
+    or cached extraction) its own extract_action_items row, so GET /jobs/{job_id} finds it
+    after a restart or on another worker. The row has no input_hash and never takes part
+    in dedup. Does nothing if job_id already has a row.
+    """
+    if not db_client.is_configured() or await _get_by_correlation_id(job_id) is not None:
+        return
+    try:
+        r = await db_client.get_client().post(
+            "/extract-action-items",
+            json={"correlation_id": job_id, "license_key": license_key, "installation_id": installation_id},
+        )
+        r.raise_for_status()
+    except Exception as e:
+        logger.warning(f"Failed to create job record {job_id}: {e}")
+        return
+    if error is None:
+        await _update_extract_record(
+            correlation_id=job_id,
+            output_json=json.dumps(response.model_dump(mode="json")),
+            status="completed",
+            error_message=None,
+            http_status_code=200,
+            duration_ms=0,
+        )
+    else:
+        await _update_extract_record(
+            correlation_id=job_id,
+            output_json=None,
+            status="failed",
+            error_message=str(error.detail) if isinstance(error, HTTPException) else str(error),
+            http_status_code=error.status_code if isinstance(error, HTTPException) else 500,
+            duration_ms=0,
+        )
+
+
+@router.post("/jobs/extract-actions", status_code=202)
+async def submit_extract_job(http_request: Request, request: ActionExtractionRequest):
+    """
+    Queue an extract-actions job and return at once with {"job_id", "status", "status_url"}.
+    The job id is the extract_action_items correlation_id. Re-posting the same payload with the
+    same X-License-Key returns the same job; results already cached (locally or in the database) come back completed (200).
+    Returns 503 with Retry-After when the job queue is full.
+    """
+    license_key = http_request.headers.get("X-License-Key") or http_request.headers.get("x-license-key")
+    installation_id = http_request.headers.get("X-Installation-Id") or http_request.headers.get("x-installation-id")
+
+    await _validate_license(license_key)
+
+    input_hash = _compute_input_hash(request.meeting_details)
+    job = extract_jobs.find_by_hash(input_hash, license_key)
+    if job is None:
+        cached = get_cached_result(input_hash)
+        record = None if cached else await _get_by_input_hash(input_hash)
+        if record and record.get("status") == "completed":
+            cached = _cached_from_record(record, input_hash)
+        # A record's correlation_id is only readable as a job id by the license that owns it
+        record_id = record.get("correlation_id") if record and _readable_by(record, license_key) else None
+        if cached:
+            dedup_outcomes.inc("db_completed" if record else "local_cache")
+            job_id = record_id or str(uuid.uuid4())
+            job = extract_jobs.add_completed(
+                job_id, input_hash, license_key, bind_to_request(cached, request.meeting_details)
+            )
+            if not record_id:
+                asyncio.create_task(_record_job(job_id, license_key, installation_id, response=job.result))
+        else:
+            # A duplicate pending in another worker keeps its id; the job waits for it
+            pending_id = record_id if record and record.get("status") == "pending" else None
+            job_id = pending_id or str(uuid.uuid4())
+
+            async def run() -> ActionExtractionResponse:
+                # The extraction may run under another correlation_id (coalesced onto an
+                # in-flight call or a duplicate's record); _record_job keeps job_id findable
+                try:
+                    response, _ = await _extract_flight.do(
+                        input_hash,
+                        lambda: _extract_once(
+                            request, input_hash, license_key, installation_id,
+                            prefetched=(record,), correlation_id=job_id,
+                        ),
+                    )
+                except Exception as e:
+                    asyncio.create_task(_record_job(job_id, license_key, installation_id, error=e))
+                    raise
+                response = bind_to_request(response, request.meeting_details)
+                asyncio.create_task(_record_job(job_id, license_key, installation_id, response=response))
+                return response
+
+            try:
+                job = extract_jobs.submit(
+                    ExtractJob(job_id=job_id, input_hash=input_hash, license_key=license_key, run=run)
+                )
+            except JobQueueFull as e:
+                raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+            logger.info(f"Queued extract job {job_id} for input_hash={input_hash[:16]}...")
+
+    return JSONResponse(
+        status_code=200 if job.done.is_set() else 202,
+        content={**job.to_dict(), "status_url": f"{router.prefix}/jobs/{job.job_id}"},
+    )
+
+
+@router.get("/jobs/{job_id}")
+async def get_extract_job(
+    http_request: Request,
+    job_id: str,
+    wait: float = Query(0, ge=0, description="Seconds to long-poll for completion (capped by JOB_MAX_WAIT_SECONDS)"),
+):
+    """
+    Status of an extract job: {"job_id", "status": queued|running|completed|failed, "result"?, "error"?}.
+    With wait > 0, blocks until the job finishes or the wait elapses. Jobs unknown to this worker
+    are looked up in database-service by correlation_id. A job submitted with a license key is
+    only visible with the same X-License-Key.
+    """
+    license_key = http_request.headers.get("X-License-Key") or http_request.headers.get("x-license-key")
+    timeout = min(wait, settings.job_max_wait_seconds)
+
+    job = extract_jobs.get(job_id)
+    if job is not None:
+        if job.license_key and job.license_key != license_key:
+            raise HTTPException(status_code=404, detail="Job not found")
+        await extract_jobs.wait(job, timeout)
+        return job.to_dict()
+
+    # Started by another worker or before a restart: follow the database record
+    deadline = time.monotonic() + timeout
+    while True:
+        record = await _get_by_correlation_id(job_id)
+        if record is None or not _readable_by(record, license_key):
+            raise HTTPException(status_code=404, detail="Job not found")
+        remaining = deadline - time.monotonic()
+        if record.get("status") != "pending" or remaining <= 0:
+            return _job_from_record(record)
+        await asyncio.sleep(min(1.0, remaining))
+
+
+async def _get_summary_by_input_hash(input_hash: str) -> dict | None:
+    """Fetch interview_summary by input_hash. Returns None if not found."""
+    if not db_client.is_configured():
+        return None
+    try:
+        r = await db_client.get_client().get(
+            "/interview-summaries/by-input-hash",
+            params={"hash": input_hash},
+        )
+        if r.status_code == 404:
+            return None
+        r.raise_for_status()
+        return r.json()
+    except Exception as e:
+        logger.warning(f"Failed to get interview summary by input_hash: {e}")
+        return None
+
+
+async def _poll_summary_until_completed(
+    input_hash: str, timeout_sec: float = 120, poll_interval: float = 2.0
+) -> dict | None:
+    """Poll for a summary pending in another worker. Returns the completed record or None."""
+    elapsed = 0.0
+    while elapsed < timeout_sec:
+        record = await _get_summary_by_input_hash(input_hash)
+        if not record or record.get("status") == "failed":
+            return None
+        if record.get("status") == "completed":
+            return record
+        await asyncio.sleep(poll_interval)
+        elapsed += poll_interval
+    return None
+
+
+async def _update_summary_record(
+    correlation_id: str,
+    output_json: str | None,
+    status: str,
+    error_message: str | None,
+    http_status_code: int,
+    duration_ms: int,
+    timings_json: str | None = None,
+):
+    """Fire-and-forget: update interview_summary record in database service."""
+    if not db_client.is_configured():
+        return
+    try:
+        await db_client.get_client().patch(
+            "/interview-summaries",
+            json={
+                "correlation_id": correlation_id,
+                "output_json": output_json,
+                "status": status,
+                "error_message": error_message,
+                "http_status_code": http_status_code,
+                "duration_ms": duration_ms,
+                "timings_json": timings_json,
+            },
+        )
+    except Exception as e:
+        logger.warning(f"Failed to update interview summary record: {e}")
+
+
+def _summary_from_record(
+    record: dict, input_hash: str, meeting_details, license_key: str | None
+) -> InterviewSummaryCore | None:
+    """Parse a completed DB record and keep it in the local summary cache."""
+    output_json = record.get("output_json")
+    if not output_json:
+        return None
+    try:
+        core = InterviewSummaryCore(**json.loads(output_json))
+    except (json.JSONDecodeError, TypeError, ValueError):
+        return None
+    remember_summary(input_hash, meeting_details, license_key, core, output_json)
+    return core
+
+
 @router.post("/summarize-interview", response_model=InterviewSummaryResponse)
-async def summarize_interview_endpoint(http_request: Request, request: InterviewSummaryRequest):
+async def summarize_interview_endpoint(http_request: Request, request: InterviewSummaryRequest, response: Response):
     """
     Summarize interview notes (hiring workflow: overview, strengths, concerns, evidence_level, etc.).
     Same auth headers as extract-actions (X-License-Key, X-Installation-Id).
+    Deduplicated like /extract-actions: a summary of the same notes (by input_hash) comes
+    from the local cache or the interview_summaries table, concurrent duplicates share one
+    LLM call, and a duplicate pending in another worker is polled until it completes.
+    When notes were only added since the meeting's last summary, that summary is revised
+    from the new notes (see summary_revision.py).
+    Per-stage timings are returned in the Server-Timing header.
     """
+    timings = start_timings()
     license_key = http_request.headers.get("X-License-Key") or http_request.headers.get("x-license-key")
-    await _validate_license(license_key)
+    installation_id = http_request.headers.get("X-Installation-Id") or http_request.headers.get("x-installation-id")
+    with stage("license"):
+        await _validate_license(license_key)
 
     notes = request.meeting_details.meeting_instance.notes
     if not notes:
         raise HTTPException(status_code=400, detail="No notes to summarize")
 
+    with stage("input_hash"):
+        input_hash = _compute_input_hash(request.meeting_details)
+    core = get_cached_summary(input_hash)
+    if core:
+        summary_dedup_outcomes.inc("local_cache")
+        logger.info(f"Returning locally cached interview summary for input_hash={input_hash[:16]}...")
+    else:
+        core, shared = await _summary_flight.do(
+            input_hash,
+            lambda: _summarize_once(request, input_hash, license_key, installation_id),
+        )
+        if shared:
+            summary_dedup_outcomes.inc("coalesced")
+    response.headers["Server-Timing"] = timings.server_timing()
+    return InterviewSummaryResponse(
+        series_id=request.meeting_details.meeting_series.id,
+        meeting_id=request.meeting_details.meeting_instance.id,
+        **core.model_dump(),
+    )
+
+
+async def _summarize_once(
+    request: InterviewSummaryRequest,
+    input_hash: str,
+    license_key: str | None,
+    installation_id: str | None,
+) -> InterviewSummaryCore:
+    """Dedup against database-service, then call the LLM and record the summary (one per input_hash)."""
+    meeting_details = request.meeting_details
+
+    with stage("dedup"):
+        existing = await _get_summary_by_input_hash(input_hash)
+    if existing and existing.get("status") == "completed" and is_fresh_record(existing):
+        core = _summary_from_record(existing, input_hash, meeting_details, license_key)
+        if core:
+            summary_dedup_outcomes.inc("db_completed")
+            logger.info(f"Returning stored interview summary for input_hash={input_hash[:16]}...")
+            return core
+
+    correlation_id = str(uuid.uuid4())
+    create_result = None
+    if db_client.is_configured():
+        try:
+            with stage("record_create"):
+                r = await db_client.get_client().post(
+                    "/interview-summaries",
+                    json={
+                        "correlation_id": correlation_id,
+                        "input_hash": input_hash,
+                        "license_key": license_key,
+                        "installation_id": installation_id,
+                        "series_id": meeting_details.meeting_series.id,
+                        "meeting_id": meeting_details.meeting_instance.id,
+                        "input_json": json.dumps(request.model_dump(mode="json")),
+                        "max_age_seconds": settings.summary_record_ttl_seconds,
+                    },
+                )
+            r.raise_for_status()
+            create_result = r.json()
+        except Exception as e:
+            logger.warning(f"Failed to create interview summary record: {e}")
+
+    # Not ours to compute: a fresh summary appeared, or another worker is producing it
+    if create_result and not create_result.get("created", True):
+        if create_result.get("status") == "completed":
+            core = _summary_from_record(create_result, input_hash, meeting_details, license_key)
+            if core:
+                summary_dedup_outcomes.inc("db_completed")
+                return core
+        if create_result.get("status") == "pending":
+            summary_dedup_outcomes.inc("db_pending")
+            logger.info(f"Duplicate interview summary pending, polling for input_hash={input_hash[:16]}...")
+            with stage("dedup_wait"):
+                record = await _poll_summary_until_completed(input_hash)
+            core = _summary_from_record(record, input_hash, meeting_details, license_key) if record else None
+            if core:
+                return core
+            raise HTTPException(status_code=504, detail="Timeout waiting for duplicate request")
+
+    summary_dedup_outcomes.inc("miss")
     start = time.perf_counter()
     try:
         provider = get_llm_provider()
         logger.info(f"Interview summary using {provider.get_provider_name()} provider")
-        core = await provider.summarize_interview(request.meeting_details)
+        with stage("revision_base"):
+            plan = await plan_revision(meeting_details, license_key)
+        with stage("llm"):
+            core = await revise_summary(provider, meeting_details, plan) if plan else None
+            if core is None:
+                core = await provider.summarize_interview(meeting_details)
         duration_ms = int((time.perf_counter() - start) * 1000)
         logger.info(f"Interview summary completed in {duration_ms}ms")
-        return InterviewSummaryResponse(
-            series_id=request.meeting_details.meeting_series.id,
-            meeting_id=request.meeting_details.meeting_instance.id,
-            **core.model_dump(),
+        with stage("serialize"):
+            output_json = json.dumps(core.model_dump(mode="json"))
+        remember_summary(input_hash, meeting_details, license_key, core, output_json)
+        asyncio.create_task(
+            _update_summary_record(
+                correlation_id=correlation_id,
+                output_json=output_json,
+                status="completed",
+                error_message=None,
+                http_status_code=200,
+                duration_ms=duration_ms,
+                timings_json=_timings_json(),
+            )
+        )
+        return core
+    except (HTTPException, ProviderOverloaded) as e:
+        he = _overloaded_exception(e) if isinstance(e, ProviderOverloaded) else e
+        asyncio.create_task(
+            _update_summary_record(
+                correlation_id=correlation_id,
+                output_json=None,
+                status="failed",
+                error_message=str(he.detail) if he.detail else str(he),
+                http_status_code=he.status_code,
+                duration_ms=int((time.perf_counter() - start) * 1000),
+                timings_json=_timings_json(),
+            )
         )
-    except HTTPException:
-        raise
+        if he is e:
+            raise
+        raise he from e
     except Exception as e:
         logger.error(f"Error summarizing interview: {str(e)}")
+        asyncio.create_task(
+            _update_summary_record(
+                correlation_id=correlation_id,
+                output_json=None,
+                status="failed",
+                error_message=str(e),
+                http_status_code=500,
+                duration_ms=int((time.perf_counter() - start) * 1000),
+                timings_json=_timings_json(),
+            )
+        )
         raise HTTPException(
             status_code=500,
             detail=f"Failed to summarize interview: {str(e)}",
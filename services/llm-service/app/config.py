@@ -8,7 +8,30 @@ class Settings(BaseSettings):
     host: str = "0.0.0.0"
     port: int = 8000  # Railway overrides via PORT env var
 
-    llm_provider: Literal["toqan", "openai"] = "toqan"
+    llm_provider: Literal["toqan", "openai", "auto"] = "toqan"
+
+    # LLM_PROVIDER=auto: route across every provider with an API key (see provider_router.py)
+    llm_provider_order: str = "toqan,openai"  # preference until latencies are measured
+    llm_route_window: int = 200  # recent calls kept per provider for percentiles / error rate
+    llm_route_max_error_rate: float = 0.5  # above this a provider is ranked last
+    llm_hedge_enabled: bool = True
+    llm_hedge_delay_seconds: float = 10.0  # hedge delay before a p90 is known
+    llm_hedge_min_delay_seconds: float = 1.0
+
+    # Provider HTTP pools, created once in the lifespan (see provider_registry.py)
+    provider_http_max_connections: int = 100
+    provider_http_max_keepalive_connections: int = 20
+    provider_http_keepalive_expiry: float = 60.0
+    provider_warmup_enabled: bool = True  # open TLS connections to provider hosts at startup
+    provider_warmup_connections: int = 2
+    provider_warmup_timeout_seconds: float = 3.0
+
+    # Per-provider bulkhead and circuit breaker (see provider_guard.py)
+    provider_max_concurrency: int = 16  # provider calls in flight per provider
+    provider_max_queue: int = 64  # calls waiting for a slot before 429
+    provider_queue_timeout_seconds: float = 30.0  # max wait for a slot before 503
+    provider_breaker_failure_threshold: int = 5  # consecutive failures/timeouts to open
+    provider_breaker_open_seconds: float = 30.0
 
     toqan_api_key: str = ""
     openai_api_key: str = ""
@@ -16,10 +39,110 @@ class Settings(BaseSettings):
 
     request_timeout: int = 30
     max_retries: int = 3
-    toqan_poll_interval: int = 2
+    toqan_base_url: str = "https://api.coco.prod.toqan.ai/api"
+    toqan_poll_interval: int = 2  # max seconds between polls of one request
+    toqan_poll_min_interval: float = 0.25  # first / densest poll spacing
+    toqan_poll_backoff: float = 1.5
+    toqan_answer_deadline_seconds: float = 120.0
 
     database_service_url: str = ""  # e.g. http://localhost:8002
 
+    # Shared pooled client for database-service calls (see app/db_client.py)
+    db_http_timeout: float = 5.0
+    db_http_max_connections: int = 50
+    db_http_max_keepalive_connections: int = 20
+    db_http_keepalive_expiry: float = 30.0
+    db_http2: bool = False  # requires the optional h2 package
+
+    # input_hash used for extract dedup (see input_hash.py). Version 2 hashes a canonical
+    # form: volatile fields dropped, whitespace/Unicode normalized, unordered lists sorted.
+    input_hash_version: int = 2
+    input_hash_volatile_fields: str = "created_at,updated_at,closed_at"
+    input_hash_unordered_fields: str = "existing_actions"
+
+    # Local LRU/TTL cache of completed extract results, keyed by input_hash
+    result_cache_enabled: bool = True
+    result_cache_max_entries: int = 1000
+    result_cache_max_bytes: int = 64 * 1024 * 1024
+    result_cache_ttl_seconds: int = 6 * 3600
+    result_cache_warm_count: int = 200  # recent completed rows loaded at startup
+
+    # Interview summaries: local LRU/TTL cache by input_hash, backed by interview_summaries
+    # rows in database-service. Completed rows older than summary_record_ttl_seconds are
+    # recomputed; a summary of edited notes replaces the meeting's previous one.
+    summary_cache_enabled: bool = True
+    summary_cache_max_entries: int = 1000
+    summary_cache_max_bytes: int = 16 * 1024 * 1024
+    summary_cache_ttl_seconds: int = 6 * 3600
+    summary_record_ttl_seconds: int = 7 * 24 * 3600
+
+    # Incremental interview summaries: when notes were only added since the meeting's last
+    # summary, the provider revises that summary from the new notes instead of re-reading
+    # every note. Summarized in full when the earlier notes are under
+    # summary_revision_min_prior_chars, the new notes exceed summary_revision_max_delta_ratio
+    # of them (or summary_revision_max_new_notes notes), or evidence_level would change tier.
+    summary_revision_enabled: bool = True
+    summary_revision_min_prior_chars: int = 2000
+    summary_revision_max_delta_ratio: float = 0.25
+    summary_revision_max_new_notes: int = 10
+
+    # Per-note extraction cache (note text + series name/type -> action items)
+    note_cache_enabled: bool = True
+    note_cache_max_entries: int = 50_000
+    note_cache_ttl_seconds: int = 24 * 3600
+
+    # Token-bounded chunking of large meetings (estimated tokens of note text per window)
+    extract_chunking_enabled: bool = True
+    extract_chunk_max_tokens: int = 3000
+    extract_chunk_max_notes: int = 40
+    extract_chunk_concurrency: int = 4
+    # Each window also gets the meeting's other notes as context (nearest first, each
+    # cut to extract_chunk_context_note_chars) up to this many estimated tokens. 0 disables.
+    extract_chunk_context_tokens: int = 1000
+    extract_chunk_context_note_chars: int = 300
+
+    # Extraction prompt budget (estimated tokens); agenda, context notes and existing
+    # actions are trimmed (most recent kept) to fit beside the notes. 0 disables trimming.
+    prompt_token_budget: int = 6000
+
+    # LLM JSON parsing: answers needing repair above this size are repaired on a pool
+    # off the event loop (see llm_json_offload.py). 0 keeps all repair inline.
+    llm_json_offload_min_chars: int = 16_384
+    llm_json_repair_executor: Literal["thread", "process"] = "thread"
+    llm_json_repair_workers: int = 2
+
+    # /extract-actions:batch
+    batch_max_items: int = 50
+    batch_max_concurrency: int = 4  # concurrent provider calls per batch request
+
+    # Async job API (/api/v1/jobs): worker pool, queue bound, retention, long-poll cap
+    job_workers: int = 4
+    job_queue_max_size: int = 1000
+    job_max_entries: int = 10_000
+    job_result_ttl_seconds: int = 3600
+    job_max_wait_seconds: float = 60.0
+
+    # License verdict cache for _validate_license
+    license_cache_enabled: bool = True
+    license_cache_max_entries: int = 10_000
+    license_cache_ttl_seconds: int = 60  # capped at 60: invalidation only reaches one worker
+    license_cache_negative_ttl_seconds: int = 30  # unknown keys
+    license_cache_stale_seconds: int = 3600  # serve cached verdicts this long if database-service is down
+
+    # Request logging to database-service: rows are buffered and sent in batches
+    request_log_queue_max_size: int = 10_000  # rows beyond this are dropped (counted)
+    request_log_batch_size: int = 200
+    request_log_flush_interval_seconds: float = 2.0
+    request_log_drain_timeout_seconds: float = 5.0  # shutdown budget for shipping buffered rows
+
+    # Tracing: spans of recent requests are kept in a ring buffer (GET /traces); with a
+    # path they are also appended to a JSONL file (services may share one file)
+    tracing_enabled: bool = True
+    trace_buffer_size: int = 2000  # spans
+    trace_export_path: str = ""
+
+    admin_token: str = ""  # required as X-Admin-Token on mutating /api/v1/admin endpoints (disabled while unset)
+
     class Config:
         env_file = ".env"
         case_sensitive = False
@@ -0,0 +1,91 @@
+"""Shared, app-scoped HTTP client for database service calls.
+
+One pooled httpx.AsyncClient is created in the FastAPI lifespan and reused by
+every request, so database-service calls ride on kept-alive sockets instead of
+opening a new TCP connection each time. Calls are traced and carry the request's
+traceparent and X-Request-Id to database-service.
+"""
+import httpx
+
+from app.config import settings
+from app.utils.logger import get_logger
+from app.utils.tracing import TracingTransport
+
+logger = get_logger(__name__)
+
+_client: httpx.AsyncClient | None = None
+
+
+def is_configured() -> bool:
+    """True when DATABASE_SERVICE_URL is set."""
+    return bool(getattr(settings, "database_service_url", None))
+
+
+def base_url() -> str:
+    """Base URL of the database service API (e.g. http://host:8002/api/v1/db)."""
+    url = getattr(settings, "database_service_url", None) or ""
+    return f"{url.rstrip('/')}/api/v1/db"
+
+
+def _http2_enabled() -> bool:
+    if not settings.db_http2:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        logger.warning("DB_HTTP2 is set but the h2 package is not installed; using HTTP/1.1")
+        return False
+    return True
+
+
+def _build_client() -> httpx.AsyncClient:
+    limits = httpx.Limits(
+        max_connections=settings.db_http_max_connections,
+        max_keepalive_connections=settings.db_http_max_keepalive_connections,
+        keepalive_expiry=settings.db_http_keepalive_expiry,
+    )
+    # The transport carries the pool settings and forwards traceparent / X-Request-Id
+    return httpx.AsyncClient(
+        base_url=base_url(),
+        timeout=settings.db_http_timeout,
+        transport=TracingTransport(limits=limits, http2=_http2_enabled()),
+    )
+
+
+async def start() -> None:
+    """Create the shared client (called from the app lifespan)."""
+    global _client
+    if _client is None and is_configured():
+        _client = _build_client()
+        logger.info(
+            f"Database service client ready (max_connections={settings.db_http_max_connections}, "
+            f"keepalive={settings.db_http_max_keepalive_connections})"
+        )
+
+
+async def close() -> None:
+    """Close the shared client and release pooled connections."""
+    global _client
+    if _client is not None:
+        client, _client = _client, None
+        await client.aclose()
+        logger.info("Database service client closed")
+
+
+def pool_stats() -> dict:
+    """Connection counts of the shared client's pool (best effort; httpx internals may change)."""
+    pool = getattr(getattr(_client, "_transport", None), "_pool", None)
+    connections = list(getattr(pool, "connections", []) or [])
+    return {
+        "connections": len(connections),
+        "idle": sum(1 for c in connections if getattr(c, "is_idle", lambda: False)()),
+        "max_connections": settings.db_http_max_connections,
+    }
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the shared client, creating it lazily if the lifespan has not run."""
+    global _client
+    if _client is None:
+        _client = _build_client()
+    return _client
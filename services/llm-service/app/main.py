@@ -1,20 +1,58 @@
+from contextlib import asynccontextmanager
 from pathlib import Path
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse
 
+from app import db_client
+from app.api.admin_routes import router as admin_router
+from app.api.metrics_routes import router as metrics_router
 from app.api.routes import router
 from app.config import settings
+from app.middleware.metrics import MetricsMiddleware
 from app.middleware.request_logger import RequestLoggingMiddleware
+from app.middleware.tracing import TracingMiddleware
+from app.services.extract_jobs import extract_jobs
+from app.services.llm_json_offload import llm_json_offloader
+from app.services.provider_registry import provider_registry
+from app.services.request_log_shipper import request_log_shipper
+from app.services.result_cache import warm_result_cache
+from app.services.toqan_poller import toqan_poller
 from app.utils.logger import setup_logging
+from app.utils.tracing import recorder
 
 setup_logging()
+recorder.configure(
+    "llm",
+    enabled=settings.tracing_enabled,
+    buffer_size=settings.trace_buffer_size,
+    export_path=settings.trace_export_path,
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await db_client.start()
+    await request_log_shipper.start()
+    await provider_registry.start()
+    await warm_result_cache()
+    await extract_jobs.start()
+    yield
+    await extract_jobs.close()
+    await toqan_poller.close()
+    await provider_registry.close()
+    await request_log_shipper.close()
+    await db_client.close()
+    llm_json_offloader.close()
+    recorder.close()
+
 
 app = FastAPI(
     title=settings.app_name,
     version=settings.version,
     description="Microservice for extracting action items from meeting notes using LLM",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -23,11 +61,16 @@ app.add_middleware(
     allow_credentials=False,  # Required when using * — CORS spec forbids * with credentials
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "Retry-After", "X-Request-Id"],
 )
 if settings.database_service_url:
     app.add_middleware(RequestLoggingMiddleware)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(TracingMiddleware)
 
 app.include_router(router)
+app.include_router(admin_router)
+app.include_router(metrics_router)
 
 
 @app.get("/")
@@ -40,6 +83,18 @@ async def root():
     }
 
 
+@app.get("/traces")
+async def traces(limit: int = Query(50, ge=1, le=1000)):
+    """Most recent requests handled by this worker (server spans), newest first."""
+    return {"service": recorder.service, **recorder.stats(), "requests": recorder.recent(limit)}
+
+
+@app.get("/traces/{trace_id}")
+async def trace(trace_id: str):
+    """This worker's spans of one trace (the trace id is also the default X-Request-Id)."""
+    return {"service": recorder.service, "trace_id": trace_id, "spans": recorder.trace(trace_id)}
+
+
 @app.get("/test")
 async def test_page():
     test_file = Path(__file__).parent.parent / "test.html"
@@ -1,69 +1,52 @@
-"""Middleware to log API requests to database service."""
-import asyncio
+"""Middleware to log API requests to database service (batched by request_log_shipper)."""
 import time
-from typing import Callable
+from datetime import datetime
 
-import httpx
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from app.config import settings
-from app.utils.logger import get_logger
+from app.services.request_log_shipper import request_log_shipper
 
-logger = get_logger(__name__)
+# Health, metrics scrapes and static
+_SKIP_PATHS = frozenset(("/health", "/metrics", "/", "/docs", "/redoc", "/openapi.json"))
 
 
-async def _log_to_db(
-    service: str,
-    endpoint: str,
-    method: str,
-    status_code: int,
-    duration_ms: int,
-):
-    """Send log to database service (fire-and-forget)."""
-    url = getattr(settings, "database_service_url", None) or ""
-    if not url:
-        return
-    try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            await client.post(
-                f"{url.rstrip('/')}/api/v1/db/requests",
-                json={
-                    "service": service,
-                    "endpoint": endpoint,
-                    "method": method,
-                    "status_code": status_code,
-                    "duration_ms": duration_ms,
-                },
-            )
-    except Exception as e:
-        logger.warning(f"Failed to log request to database service: {e}")
+class RequestLoggingMiddleware:
+    """
+    Log each request to database service.
 
+    Pure ASGI: status and duration (time to http.response.start) are read from the
+    response start message as it passes through, so the response body is never
+    wrapped or buffered and streaming responses are untouched.
+    """
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    """Log each request to database service."""
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        start = time.perf_counter()
-        path = request.url.path
-        method = request.method
-
-        # Skip health and static
-        if path in ("/health", "/", "/docs", "/redoc", "/openapi.json"):
-            return await call_next(request)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in _SKIP_PATHS:
+            await self.app(scope, receive, send)
+            return
 
-        response = await call_next(request)
-        duration_ms = int((time.perf_counter() - start) * 1000)
-
-        # Fire-and-forget log (don't block response)
-        asyncio.create_task(
-            _log_to_db(
-                service="llm",
-                endpoint=path,
-                method=method,
-                status_code=response.status_code,
-                duration_ms=duration_ms,
-            )
-        )
-        return response
+        start = time.perf_counter()
+        status_code = 500  # app raised before starting a response
+        duration_ms = None
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code, duration_ms
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                duration_ms = int((time.perf_counter() - start) * 1000)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # Buffered; shipped in batches by a background task (never blocks the response)
+            request_log_shipper.enqueue({
+                "service": "llm",
+                "endpoint": scope["path"],
+                "method": scope["method"],
+                "status_code": status_code,
+                "duration_ms": duration_ms if duration_ms is not None else int((time.perf_counter() - start) * 1000),
+                "timestamp": datetime.utcnow().isoformat(),
+            })
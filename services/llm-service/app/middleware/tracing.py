@@ -0,0 +1,53 @@
+"""Middleware opening the server span of each request (see app/utils/tracing.py)."""
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.tracing import Span, parse_incoming, recorder, use_span
+
+# Probes, scrapes and trace reads would only push real requests out of the ring buffer
+_SKIP_PREFIXES = ("/health", "/metrics", "/traces")
+
+
+def _header(scope: Scope, name: bytes) -> str | None:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+class TracingMiddleware:
+    """Pure ASGI: one server span per request; X-Request-Id is added to the response."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(_SKIP_PREFIXES) or not recorder.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        trace_id, parent_id, request_id = parse_incoming(
+            _header(scope, b"traceparent"), _header(scope, b"x-request-id")
+        )
+        server = Span(trace_id, parent_id, request_id, scope["path"], kind="server", attributes={"method": scope["method"]})
+
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                server.attributes["status_code"] = message["status"]
+                if message["status"] >= 500:
+                    server.status = "error"
+                message["headers"] = [*message.get("headers", []), (b"x-request-id", request_id.encode("latin-1"))]
+            await send(message)
+
+        try:
+            with use_span(server):
+                await self.app(scope, receive, send_with_request_id)
+        except BaseException as e:
+            server.status = "error"
+            server.attributes["error"] = type(e).__name__
+            raise
+        finally:
+            # Named by route template once routing has run, like the metrics labels
+            route = getattr(scope.get("route"), "path", None)
+            server.name = f"{scope['method']} {route or scope['path']}"
+            server.finish()
+            recorder.record(server)
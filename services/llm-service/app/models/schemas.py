@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field, field_validator, model_validator
+from pydantic import BaseModel, Field, PrivateAttr, field_validator, model_validator
 from typing import Optional, List, Literal
 from datetime import datetime
 
@@ -43,6 +43,9 @@ class NoteWithActions(BaseModel):
         default_factory=list,
         description="Action items extracted from this note",
     )
+    # False when a provider filled the entry in because the model did not answer for this
+    # note (left out, empty or unparseable answer); such entries are never cached. Not serialized.
+    _answered: bool = PrivateAttr(default=True)
 
 
 class MeetingDetails(BaseModel):
@@ -56,6 +59,12 @@ class ActionExtractionRequest(BaseModel):
     meeting_details: MeetingDetails
 
 
+class BatchActionExtractionRequest(BaseModel):
+    meeting_details: List[MeetingDetails] = Field(
+        ..., min_length=1, description="Meetings to extract actions for, processed concurrently"
+    )
+
+
 class ActionExtractionResponse(BaseModel):
     series_id: str = Field(..., description="Meeting series ID")
     meeting_id: str = Field(..., description="Meeting instance ID")
@@ -0,0 +1,167 @@
+"""
+Token-bounded chunking for very large meetings.
+
+Notes are split into consecutive windows whose estimated size stays under
+extract_chunk_max_tokens. Each window is sent as its own MeetingDetails (same
+series, agenda and existing actions as shared header context) and the windows
+run concurrently. A window also gets the meeting's other notes as context notes:
+those the caller passed (e.g. cache hits) plus the notes of the other windows,
+nearest first, each truncated, within extract_chunk_context_tokens. Providers map
+actions by local note_index, so results are remapped to global positions by
+concatenating windows in order.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import AsyncIterator, List, Optional, Tuple
+
+from app.config import settings
+from app.models.schemas import MeetingDetails, MeetingNote, NoteWithActions
+from app.services.llm_provider import LLMProvider, unanswered
+from app.utils.logger import get_logger
+from app.utils.tokens import estimate_tokens
+
+logger = get_logger(__name__)
+
+_NOTE_OVERHEAD_TOKENS = 8  # "Note N: " prefix, separators
+
+
+def split_notes(notes: List[MeetingNote], max_tokens: int, max_notes: int) -> List[Tuple[int, List[MeetingNote]]]:
+    """Split notes into consecutive (offset, notes) windows within the token and note budgets."""
+    chunks: List[Tuple[int, List[MeetingNote]]] = []
+    current: List[MeetingNote] = []
+    offset = 0
+    used = 0
+    for i, note in enumerate(notes):
+        cost = estimate_tokens(note.text) + _NOTE_OVERHEAD_TOKENS
+        if current and (used + cost > max_tokens or len(current) >= max_notes):
+            chunks.append((offset, current))
+            current, offset, used = [], i, 0
+        current.append(note)
+        used += cost
+    if current:
+        chunks.append((offset, current))
+    return chunks
+
+
+def _with_notes(meeting_details: MeetingDetails, notes: List[MeetingNote]) -> MeetingDetails:
+    return meeting_details.model_copy(update={
+        "meeting_instance": meeting_details.meeting_instance.model_copy(update={"notes": notes}),
+    })
+
+
+def _truncate(text: str, max_chars: int) -> str:
+    text = text.strip()
+    return text if len(text) <= max_chars else text[:max_chars].rstrip() + "…"
+
+
+def _chunk_context(
+    notes: List[MeetingNote],
+    offset: int,
+    size: int,
+    context_notes: Optional[List[str]],
+) -> Optional[List[str]]:
+    """context_notes plus the notes outside [offset, offset + size), nearest first within budget."""
+    budget = settings.extract_chunk_context_tokens
+    if budget <= 0:
+        return context_notes
+    end = offset + size
+    outside = [i for i in range(len(notes)) if i < offset or i >= end]
+    outside.sort(key=lambda i: offset - i if i < offset else i - end)
+    picked: List[int] = []
+    used = 0
+    for i in outside:
+        cost = estimate_tokens(_truncate(notes[i].text, settings.extract_chunk_context_note_chars)) + _NOTE_OVERHEAD_TOKENS
+        if used + cost > budget:
+            break
+        picked.append(i)
+        used += cost
+    # Meeting order reads naturally in the prompt
+    neighbours = [_truncate(notes[i].text, settings.extract_chunk_context_note_chars) for i in sorted(picked)]
+    return [*(context_notes or []), *neighbours] or None
+
+
+def _chunks_for(meeting_details: MeetingDetails) -> List[Tuple[int, List[MeetingNote]]]:
+    notes = meeting_details.meeting_instance.notes
+    if not settings.extract_chunking_enabled:
+        return [(0, notes)]
+    return split_notes(notes, settings.extract_chunk_max_tokens, settings.extract_chunk_max_notes)
+
+
+async def extract_chunked(
+    provider: LLMProvider,
+    meeting_details: MeetingDetails,
+    context_notes: Optional[List[str]] = None,
+) -> List[NoteWithActions]:
+    """extract_actions over token-bounded windows run concurrently; output in global note order."""
+    chunks = _chunks_for(meeting_details)
+    if len(chunks) <= 1:
+        return await provider.extract_actions(meeting_details, context_notes=context_notes)
+
+    logger.info(f"Splitting {len(meeting_details.meeting_instance.notes)} notes into {len(chunks)} chunks")
+    semaphore = asyncio.Semaphore(settings.extract_chunk_concurrency)
+
+    notes = meeting_details.meeting_instance.notes
+
+    async def run(offset: int, chunk_notes: List[MeetingNote]) -> List[NoteWithActions]:
+        async with semaphore:
+            return await provider.extract_actions(
+                _with_notes(meeting_details, chunk_notes),
+                context_notes=_chunk_context(notes, offset, len(chunk_notes), context_notes),
+            )
+
+    results = await asyncio.gather(*(run(offset, chunk_notes) for offset, chunk_notes in chunks))
+    merged: List[NoteWithActions] = []
+    for (_, chunk_notes), extracted in zip(chunks, results):
+        by_local = extracted[: len(chunk_notes)]
+        merged.extend(by_local)
+        merged.extend(unanswered(n) for n in chunk_notes[len(by_local):])
+    return merged
+
+
+async def stream_chunked(
+    provider: LLMProvider,
+    meeting_details: MeetingDetails,
+    context_notes: Optional[List[str]] = None,
+) -> AsyncIterator[Tuple[int, NoteWithActions]]:
+    """stream_extract_actions over concurrent windows, yielding (global_note_index, NoteWithActions)."""
+    chunks = _chunks_for(meeting_details)
+    if len(chunks) <= 1:
+        async for item in provider.stream_extract_actions(meeting_details, context_notes=context_notes):
+            yield item
+        return
+
+    logger.info(f"Streaming {len(meeting_details.meeting_instance.notes)} notes in {len(chunks)} chunks")
+    semaphore = asyncio.Semaphore(settings.extract_chunk_concurrency)
+    queue: asyncio.Queue = asyncio.Queue()
+    done_marker = object()
+    notes = meeting_details.meeting_instance.notes
+
+    async def run(offset: int, chunk_notes: List[MeetingNote]) -> None:
+        try:
+            async with semaphore:
+                async for local_index, note_with_actions in provider.stream_extract_actions(
+                    _with_notes(meeting_details, chunk_notes),
+                    context_notes=_chunk_context(notes, offset, len(chunk_notes), context_notes),
+                ):
+                    if 0 <= local_index < len(chunk_notes):
+                        await queue.put((offset + local_index, note_with_actions))
+        finally:
+            await queue.put(done_marker)
+
+    tasks = [asyncio.create_task(run(offset, chunk_notes)) for offset, chunk_notes in chunks]
+    try:
+        remaining = len(tasks)
+        while remaining:
+            item = await queue.get()
+            if item is done_marker:
+                remaining -= 1
+                continue
+            yield item
+        # Surface the first chunk failure, if any
+        for task in tasks:
+            task.result()
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,217 @@
+"""
+Asynchronous extract-actions jobs.
+
+POST /api/v1/jobs/extract-actions queues a job and returns its id at once; a fixed
+pool of workers (started in the app lifespan) runs queued jobs, and clients
+long-poll GET /api/v1/jobs/{id}. The job id is the extract_action_items
+correlation_id, so a job started by another worker (or before a restart) can still
+be resolved from database-service. Jobs are kept in memory for job_result_ttl_seconds
+and indexed by input_hash, so re-posting the same payload returns the same job.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+from fastapi import HTTPException
+
+from app.config import settings
+from app.models.schemas import ActionExtractionResponse
+from app.utils.logger import get_logger
+from app.utils.ttl_cache import TTLCache
+
+logger = get_logger(__name__)
+
+
+class JobQueueFull(Exception):
+    """The job queue is at job_queue_max_size; the client should retry later."""
+
+
+@dataclass
+class ExtractJob:
+    job_id: str
+    input_hash: str
+    license_key: str | None
+    run: Callable[[], Awaitable[ActionExtractionResponse]] | None = None
+    status: str = "queued"  # queued | running | completed | failed
+    result: ActionExtractionResponse | None = None
+    error: str | None = None
+    http_status_code: int | None = None
+    created_at: float = field(default_factory=time.time)
+    finished_at: float | None = None
+    done: asyncio.Event = field(default_factory=asyncio.Event)
+
+    def to_dict(self) -> dict:
+        data = {"job_id": self.job_id, "status": self.status}
+        if self.result is not None:
+            data["result"] = self.result.model_dump(mode="json")
+        if self.error is not None:
+            data["error"] = self.error
+            data["http_status_code"] = self.http_status_code
+        return data
+
+
+def _hash_key(input_hash: str, license_key: str | None) -> str:
+    # Jobs are only readable with the submitting license key, so dedup is per key
+    return f"{input_hash}\x1f{license_key or ''}"
+
+
+class ExtractJobQueue:
+    """Bounded queue of extract jobs drained by a fixed pool of worker tasks."""
+
+    def __init__(self) -> None:
+        self._queue: asyncio.Queue[ExtractJob] | None = None
+        self._workers: list[asyncio.Task] = []
+        self._jobs: TTLCache[ExtractJob] = TTLCache(
+            max_entries=settings.job_max_entries,
+            ttl_seconds=settings.job_result_ttl_seconds,
+        )
+        # (input_hash, license_key) -> job_id
+        self._by_hash: TTLCache[str] = TTLCache(
+            max_entries=settings.job_max_entries,
+            ttl_seconds=settings.job_result_ttl_seconds,
+        )
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    async def start(self) -> None:
+        if self._workers:
+            return
+        self._queue = asyncio.Queue(maxsize=settings.job_queue_max_size)
+        self._workers = [
+            asyncio.create_task(self._worker(n)) for n in range(max(1, settings.job_workers))
+        ]
+        logger.info(f"Extract job workers started: {len(self._workers)}")
+
+    async def close(self) -> None:
+        """Stop the workers; jobs still queued or running are marked failed."""
+        workers, self._workers = self._workers, []
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        for job_id in self._jobs.keys():
+            job = self._jobs.get(job_id)
+            if job is not None and not job.done.is_set():
+                self._finish(job, error="Server shutting down", http_status_code=503)
+        self._queue = None
+
+    # --- lookup ---
+
+    def get(self, job_id: str) -> ExtractJob | None:
+        return self._jobs.get(job_id)
+
+    def find_by_hash(self, input_hash: str, license_key: str | None) -> ExtractJob | None:
+        """
+        Queued, running or completed job for the same input that license_key may read: its
+        own, or one submitted without a key. Failed jobs are not reused.
+        """
+        for key in dict.fromkeys((license_key, None)):
+            job_id = self._by_hash.get(_hash_key(input_hash, key))
+            job = self._jobs.get(job_id) if job_id else None
+            if job is not None and job.status != "failed":
+                return job
+        return None
+
+    # --- submission ---
+
+    def submit(self, job: ExtractJob) -> ExtractJob:
+        """Queue a job. Raises JobQueueFull when the queue is at capacity."""
+        if self._queue is None:
+            raise JobQueueFull("Job workers are not running")
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise JobQueueFull(f"Job queue full ({settings.job_queue_max_size})")
+        self._track(job)
+        self.submitted += 1
+        return job
+
+    def add_completed(
+        self, job_id: str, input_hash: str, license_key: str | None, result: ActionExtractionResponse
+    ) -> ExtractJob:
+        """Register a job that is already answered (cache hit) without queueing it."""
+        job = ExtractJob(job_id=job_id, input_hash=input_hash, license_key=license_key)
+        self._track(job)
+        self._finish(job, result=result)
+        return job
+
+    async def wait(self, job: ExtractJob, timeout: float) -> bool:
+        """Wait up to timeout seconds for the job to finish. Returns True if it is done."""
+        if timeout > 0 and not job.done.is_set():
+            try:
+                await asyncio.wait_for(job.done.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+        return job.done.is_set()
+
+    def stats(self) -> dict:
+        statuses: dict[str, int] = {}
+        for job_id in self._jobs.keys():
+            job = self._jobs.get(job_id)
+            if job is not None:
+                statuses[job.status] = statuses.get(job.status, 0) + 1
+        return {
+            "workers": len(self._workers),
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "queue_max_size": settings.job_queue_max_size,
+            "jobs_by_status": statuses,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+        }
+
+    # --- internals ---
+
+    def _track(self, job: ExtractJob) -> None:
+        self._jobs.set(job.job_id, job)
+        self._by_hash.set(_hash_key(job.input_hash, job.license_key), job.job_id)
+
+    def _finish(
+        self,
+        job: ExtractJob,
+        result: ActionExtractionResponse | None = None,
+        error: str | None = None,
+        http_status_code: int | None = None,
+    ) -> None:
+        job.run = None
+        job.finished_at = time.time()
+        if error is None:
+            job.status = "completed"
+            job.result = result
+            self.completed += 1
+        else:
+            job.status = "failed"
+            job.error = error
+            job.http_status_code = http_status_code
+            self.failed += 1
+        job.done.set()
+
+    async def _worker(self, n: int) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                if job.done.is_set() or job.run is None:
+                    continue
+                job.status = "running"
+                try:
+                    self._finish(job, result=await job.run())
+                except HTTPException as he:
+                    self._finish(job, error=str(he.detail), http_status_code=he.status_code)
+                except asyncio.CancelledError:
+                    self._finish(job, error="Server shutting down", http_status_code=503)
+                    raise
+                except Exception as e:
+                    logger.error(f"Extract job {job.job_id} failed: {e}")
+                    self._finish(job, error=str(e), http_status_code=500)
+            finally:
+                self._queue.task_done()
+
+
+extract_jobs = ExtractJobQueue()
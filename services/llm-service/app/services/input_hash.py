@@ -0,0 +1,95 @@
+"""
+Versioned input_hash for extract-actions deduplication.
+
+Version 1 hashes the full model dump, so a touched timestamp or re-saved note with
+different whitespace is a new input. Version 2 hashes a canonical form instead:
+- fields in INPUT_HASH_VOLATILE_FIELDS (timestamps by default) are dropped at any depth
+- strings are NFC-normalized; line endings, runs of spaces and blank lines are collapsed
+- lists in INPUT_HASH_UNORDERED_FIELDS (existing_actions by default) are sorted
+Hashes are prefixed with their version ("v2:..."), so rows keyed by older versions
+stay valid in extract_action_items and never collide with new keys. A cached response
+is re-bound to the request's own notes and ids (bind_to_request), so clients see the
+timestamps and text they sent.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import unicodedata
+from typing import Any
+
+from app.config import settings
+from app.models.schemas import ActionExtractionResponse, MeetingDetails, NoteWithActions
+
+_HASH_LENGTH = 64  # extract_action_items.input_hash is String(64)
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+
+def _fields(value: str) -> frozenset[str]:
+    return frozenset(f.strip() for f in value.split(",") if f.strip())
+
+
+def normalize_text(text: str) -> str:
+    """NFC, unix line endings, single spaces within lines, at most one blank line in a row."""
+    text = unicodedata.normalize("NFC", text).replace("\r\n", "\n").replace("\r", "\n")
+    text = "\n".join(" ".join(line.split()) for line in text.split("\n"))
+    return _BLANK_LINES.sub("\n\n", text).strip()
+
+
+def _canonical(value: Any, volatile: frozenset[str], unordered: frozenset[str], key: str | None = None) -> Any:
+    if isinstance(value, dict):
+        return {
+            k: _canonical(v, volatile, unordered, k)
+            for k, v in value.items()
+            if k not in volatile
+        }
+    if isinstance(value, list):
+        items = [_canonical(v, volatile, unordered) for v in value]
+        if key in unordered:
+            items.sort(key=lambda v: json.dumps(v, sort_keys=True, ensure_ascii=False))
+        return items
+    if isinstance(value, str):
+        return normalize_text(value)
+    return value
+
+
+def canonicalize(meeting_details: MeetingDetails) -> dict:
+    """Canonical form of meeting_details hashed by version 2."""
+    return _canonical(
+        meeting_details.model_dump(mode="json"),
+        _fields(settings.input_hash_volatile_fields),
+        _fields(settings.input_hash_unordered_fields),
+    )
+
+
+def compute_input_hash(meeting_details: MeetingDetails, version: int | None = None) -> str:
+    """input_hash of meeting_details under INPUT_HASH_VERSION (or the given version)."""
+    version = version or settings.input_hash_version
+    if version == 1:
+        canonical = json.dumps(meeting_details.model_dump(mode="json"), sort_keys=True)
+        return hashlib.sha256(canonical.encode()).hexdigest()
+    if version != 2:
+        raise ValueError(f"Unknown input hash version: {version}")
+    canonical = json.dumps(canonicalize(meeting_details), sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    prefix = f"v{version}:"
+    return prefix + hashlib.sha256(canonical.encode()).hexdigest()[: _HASH_LENGTH - len(prefix)]
+
+
+def bind_to_request(response: ActionExtractionResponse, meeting_details: MeetingDetails) -> ActionExtractionResponse:
+    """
+    The response for meeting_details given a result computed for an input with the same
+    hash: action items are kept, notes and ids are taken from meeting_details.
+    """
+    notes = meeting_details.meeting_instance.notes
+    if len(notes) != len(response.notes_with_actions):
+        return response
+    return ActionExtractionResponse(
+        series_id=meeting_details.meeting_series.id,
+        meeting_id=meeting_details.meeting_instance.id,
+        notes_with_actions=[
+            NoteWithActions(note=note, action_items=item.action_items)
+            for note, item in zip(notes, response.notes_with_actions)
+        ],
+    )
@@ -0,0 +1,115 @@
+"""
+TTL cache of license lookups from database-service, keyed by license key.
+
+- Found licenses are cached for license_cache_ttl_seconds (at most MAX_FRESH_TTL_SECONDS).
+- Unknown keys (404) are cached briefly as negative entries.
+- If database-service is unavailable, an entry up to license_cache_stale_seconds
+  old is served instead of failing the request.
+Expiry and status are still checked by the caller on every request, so a cached
+verdict never outlives the license's expiry_date.
+
+The cache is per worker, and POST /admin/license-cache/invalidate only clears the
+worker that receives it. Other workers refresh within the fresh TTL, which is capped
+at MAX_FRESH_TTL_SECONDS so a revoked license is not honoured for long.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+
+from app import db_client
+from app.config import settings
+from app.utils.logger import get_logger
+from app.utils.ttl_cache import TTLCache
+
+logger = get_logger(__name__)
+
+
+class LicenseLookupError(Exception):
+    """database-service could not be reached and no usable cached verdict exists."""
+
+
+@dataclass
+class LicenseVerdict:
+    license: dict | None  # None = key not found (negative entry)
+    fresh_until: float  # monotonic time after which the entry should be refreshed
+
+
+MAX_FRESH_TTL_SECONDS = 60
+
+
+def _fresh_ttl() -> int:
+    return min(settings.license_cache_ttl_seconds, MAX_FRESH_TTL_SECONDS)
+
+
+# Entries live for the stale window; freshness is tracked per verdict.
+license_cache: TTLCache[LicenseVerdict] = TTLCache(
+    max_entries=settings.license_cache_max_entries,
+    ttl_seconds=max(_fresh_ttl(), settings.license_cache_stale_seconds),
+)
+stale_served = 0
+
+
+def _verdict_fields(data: dict) -> dict:
+    """Keep only what license validation needs (active, expiry, status)."""
+    return {
+        "license_key": data.get("license_key"),
+        "expiry_date": data.get("expiry_date"),
+        "status": data.get("status"),
+    }
+
+
+async def _fetch_license(license_key: str) -> dict | None:
+    r = await db_client.get_client().get("/license/by-key", params={"license_key": license_key})
+    if r.status_code == 404:
+        return None
+    r.raise_for_status()
+    return _verdict_fields(r.json())
+
+
+async def lookup_license(license_key: str) -> dict | None:
+    """
+    Return license fields (license_key, expiry_date, status) or None if the key is unknown.
+    Raises LicenseLookupError when database-service is unavailable and nothing cached can be used.
+    """
+    global stale_served
+    if not settings.license_cache_enabled:
+        try:
+            return await _fetch_license(license_key)
+        except Exception as e:
+            raise LicenseLookupError(str(e)) from e
+
+    now = time.monotonic()
+    cached = license_cache.get(license_key)
+    if cached is not None and now < cached.fresh_until:
+        return cached.license
+
+    try:
+        data = await _fetch_license(license_key)
+    except Exception as e:
+        if cached is not None:
+            stale_served += 1
+            logger.warning(f"License lookup failed, serving stale verdict for {license_key[:20]}...: {e}")
+            return cached.license
+        raise LicenseLookupError(str(e)) from e
+
+    ttl = _fresh_ttl() if data else settings.license_cache_negative_ttl_seconds
+    license_cache.set(license_key, LicenseVerdict(license=data, fresh_until=now + ttl))
+    return data
+
+
+def invalidate(license_keys: list[str] | None = None) -> int:
+    """Drop cached verdicts for the given keys, or all of them when none are given."""
+    if not license_keys:
+        return license_cache.clear()
+    return sum(1 for key in license_keys if license_cache.delete(key.strip()))
+
+
+def stats() -> dict:
+    return {
+        **license_cache.stats(),
+        "fresh_ttl_seconds": _fresh_ttl(),
+        "negative_ttl_seconds": settings.license_cache_negative_ttl_seconds,
+        "stale_served": stale_served,
+    }
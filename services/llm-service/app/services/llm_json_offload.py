@@ -0,0 +1,103 @@
+"""
+Parse LLM JSON answers without stalling the event loop.
+
+Well-formed answers are decoded inline with fast_loads (orjson when installed),
+which is C code and quick even for large answers. Answers that need repair
+(incremental completion, json-repair) are pure Python; below
+llm_json_offload_min_chars they are repaired inline, above it they run on a small
+dedicated pool so other requests keep being served meanwhile. A thread pool still
+shares the GIL with the loop, so long repairs slow it down without stopping it;
+LLM_JSON_REPAIR_EXECUTOR=process removes that at the cost of pickling the text
+and result. See benchmarks/llm_json for the measured trade-off.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any
+
+from app.config import settings
+from app.utils.llm_json import repair_llm_json_object, try_fast_parse
+from app.utils.logger import get_logger
+from app.utils.timing import stage
+
+logger = get_logger(__name__)
+
+
+class LLMJSONOffloader:
+    """parse_llm_json_object for async callers, with large repairs run off the loop."""
+
+    def __init__(
+        self,
+        offload_min_chars: int,
+        workers: int,
+        use_processes: bool = False,
+    ) -> None:
+        self.offload_min_chars = offload_min_chars
+        self.workers = max(1, workers)
+        self.use_processes = use_processes
+        self._executor: Executor | None = None
+        self.fast = 0
+        self.repaired_inline = 0
+        self.repaired_offloaded = 0
+        self.failed = 0
+
+    async def parse_object(self, answer_text: str) -> dict[str, Any]:
+        """Same contract as parse_llm_json_object (raises ValueError)."""
+        if answer_text is None or not str(answer_text).strip():
+            raise ValueError("Empty LLM answer for JSON parsing")
+        raw = str(answer_text).strip().lstrip("\ufeff")
+        with stage("json_parse"):
+            out = try_fast_parse(raw)
+        if out is not None:
+            self.fast += 1
+            return out
+        try:
+            with stage("json_repair"):
+                if self.offload_min_chars <= 0 or len(raw) < self.offload_min_chars:
+                    self.repaired_inline += 1
+                    return repair_llm_json_object(raw)
+                self.repaired_offloaded += 1
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self._get_executor(), repair_llm_json_object, raw)
+        except ValueError:
+            self.failed += 1
+            raise
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.use_processes:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="llm-json-repair"
+                )
+            logger.info(
+                "Started LLM JSON repair pool (%s, %d workers)",
+                "processes" if self.use_processes else "threads",
+                self.workers,
+            )
+        return self._executor
+
+    def close(self) -> None:
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        return {
+            "fast": self.fast,
+            "repaired_inline": self.repaired_inline,
+            "repaired_offloaded": self.repaired_offloaded,
+            "failed": self.failed,
+            "offload_min_chars": self.offload_min_chars,
+            "executor": "process" if self.use_processes else "thread",
+        }
+
+
+llm_json_offloader = LLMJSONOffloader(
+    offload_min_chars=settings.llm_json_offload_min_chars,
+    workers=settings.llm_json_repair_workers,
+    use_processes=settings.llm_json_repair_executor == "process",
+)
@@ -1,18 +1,36 @@
 from abc import ABC, abstractmethod
-from typing import List
-from app.models.schemas import MeetingDetails, NoteWithActions, InterviewSummaryCore
+from typing import AsyncIterator, List, Optional, Tuple
+from app.models.schemas import MeetingDetails, MeetingNote, NoteWithActions, InterviewSummaryCore
+
+
+def unanswered(note: MeetingNote) -> NoteWithActions:
+    """Empty entry for a note the model gave no answer for; see is_answered."""
+    filler = NoteWithActions(note=note, action_items=[])
+    filler._answered = False
+    return filler
+
+
+def is_answered(note_with_actions: NoteWithActions) -> bool:
+    """False for entries made by unanswered(): no actions known, not "no actions"."""
+    return note_with_actions._answered
 
 
 class LLMProvider(ABC):
     """Abstract base class for LLM providers"""
     
     @abstractmethod
-    async def extract_actions(self, meeting_details: MeetingDetails) -> List[NoteWithActions]:
+    async def extract_actions(
+        self,
+        meeting_details: MeetingDetails,
+        context_notes: Optional[List[str]] = None,
+    ) -> List[NoteWithActions]:
         """
         Extract action items from meeting details, mapping them to specific notes.
         
         Args:
             meeting_details: Complete meeting information
+            context_notes: Other notes of the meeting that were already processed;
+                context only, no actions are extracted from them
             
         Returns:
             List of notes with their associated action items.
@@ -20,12 +38,40 @@ class LLMProvider(ABC):
         """
         pass
 
+    async def stream_extract_actions(
+        self,
+        meeting_details: MeetingDetails,
+        context_notes: Optional[List[str]] = None,
+    ) -> AsyncIterator[Tuple[int, NoteWithActions]]:
+        """
+        Yield (note_index, NoteWithActions) as soon as each note's actions are known.
+        Notes may arrive out of order or not at all; callers fill gaps with empty actions.
+        Providers without token streaming yield everything once extract_actions returns.
+        """
+        extracted = await self.extract_actions(meeting_details, context_notes=context_notes)
+        for i, note_with_actions in enumerate(extracted):
+            if is_answered(note_with_actions):
+                yield i, note_with_actions
+
     @abstractmethod
     async def summarize_interview(
         self, meeting_details: MeetingDetails
     ) -> InterviewSummaryCore:
         """Summarize interview notes per hiring workflow schema (see prompts file)."""
         pass
+
+    async def revise_interview_summary(
+        self,
+        meeting_details: MeetingDetails,
+        previous: InterviewSummaryCore,
+        new_notes: List[MeetingNote],
+    ) -> InterviewSummaryCore:
+        """
+        Revise previous (a summary of the notes before new_notes) with the notes added since.
+        meeting_details holds all notes; new_notes are its last ones. Providers without an
+        incremental prompt summarize everything again.
+        """
+        return await self.summarize_interview(meeting_details)
     
     @abstractmethod
     def get_provider_name(self) -> str:
@@ -0,0 +1,101 @@
+"""
+Per-note extraction cache.
+
+Each note's action items are cached under a hash of its text plus a small context
+fingerprint (series name and type). On a request only notes that miss the cache
+(deduplicated by key) are sent to the provider; cached notes go along as compact
+context so the model can still resolve references. Results are merged back in
+note_index order.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from typing import Callable, List
+
+from app.config import settings
+from app.models.schemas import ActionItem, MeetingDetails, NoteWithActions
+from app.services.chunking import extract_chunked, stream_chunked
+from app.services.llm_provider import LLMProvider, is_answered
+from app.utils.logger import get_logger
+from app.utils.ttl_cache import TTLCache
+
+logger = get_logger(__name__)
+
+note_cache: TTLCache[List[ActionItem]] = TTLCache(
+    max_entries=settings.note_cache_max_entries,
+    ttl_seconds=settings.note_cache_ttl_seconds,
+)
+
+
+def note_cache_key(note_text: str, meeting_details: MeetingDetails) -> str:
+    series = meeting_details.meeting_series
+    fingerprint = f"{series.name}\x1f{series.type}\x1f{note_text}"
+    return hashlib.sha256(fingerprint.encode()).hexdigest()
+
+
+async def extract_with_note_cache(
+    provider: LLMProvider,
+    meeting_details: MeetingDetails,
+    on_note: Callable[[int, NoteWithActions], None] | None = None,
+) -> List[NoteWithActions]:
+    """
+    Extract actions for every note, calling the provider only for uncached notes.
+    With on_note, the provider is streamed and on_note is called as each note is known
+    (cached notes first).
+    """
+    notes = meeting_details.meeting_instance.notes
+    results: dict[int, List[ActionItem]] = {}
+    # cache key -> original indices of notes with that key (duplicates are sent once)
+    pending: dict[str, List[int]] = {}
+    context_notes: List[str] = []
+
+    for i, note in enumerate(notes):
+        key = note_cache_key(note.text, meeting_details)
+        cached = note_cache.get(key) if settings.note_cache_enabled else None
+        if cached is not None:
+            results[i] = cached
+            context_notes.append(note.text)
+            if on_note:
+                on_note(i, NoteWithActions(note=note, action_items=cached))
+        else:
+            pending.setdefault(key, []).append(i)
+
+    if pending:
+        keys = list(pending.keys())
+        sub_notes = [notes[pending[key][0]] for key in keys]
+        sub_details = meeting_details.model_copy(update={
+            "meeting_instance": meeting_details.meeting_instance.model_copy(update={"notes": sub_notes}),
+        })
+        logger.info(
+            f"Note cache: {len(results)}/{len(notes)} notes cached, "
+            f"sending {len(sub_notes)} to {provider.get_provider_name()}"
+        )
+
+        def record(sub_index: int, note_with_actions: NoteWithActions) -> None:
+            key = keys[sub_index]
+            action_items = note_with_actions.action_items
+            # Only answers the model gave are cached; filled-in empties are served once, not reused
+            if settings.note_cache_enabled and is_answered(note_with_actions):
+                note_cache.set(key, action_items)
+            for i in pending[key]:
+                results[i] = action_items
+                if on_note:
+                    on_note(i, NoteWithActions(note=notes[i], action_items=action_items))
+
+        if on_note is None:
+            extracted = await extract_chunked(provider, sub_details, context_notes=context_notes or None)
+            for sub_index, note_with_actions in enumerate(extracted[: len(keys)]):
+                record(sub_index, note_with_actions)
+        else:
+            seen: set[int] = set()
+            async for sub_index, note_with_actions in stream_chunked(
+                provider, sub_details, context_notes=context_notes or None
+            ):
+                if 0 <= sub_index < len(keys) and sub_index not in seen:
+                    seen.add(sub_index)
+                    record(sub_index, note_with_actions)
+    else:
+        logger.info(f"Note cache: all {len(notes)} notes cached, skipping provider call")
+
+    return [NoteWithActions(note=note, action_items=results.get(i, [])) for i, note in enumerate(notes)]
@@ -0,0 +1,155 @@
+"""
+Prompt compaction and token budgeting for action-extraction prompts.
+
+Both providers build their extraction prompt from a CompactMeeting instead of the
+full model dump: ids and created_at/updated_at timestamps are dropped, duplicate
+agenda items, existing actions and context notes are collapsed, and the optional
+parts are trimmed to PROMPT_TOKEN_BUDGET (estimated locally). Notes themselves are
+never dropped here; chunking keeps them bounded and the note cache sends duplicate
+notes once. Before/after token estimates are logged and counted per request.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from app.config import settings
+from app.models.schemas import MeetingDetails
+from app.utils.logger import get_logger
+from app.utils.tokens import estimate_tokens
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class CompactMeeting:
+    title: str
+    meeting_type: str
+    date: Optional[str]
+    notes: List[str]
+    agenda: List[str] = field(default_factory=list)
+    existing_actions: List[str] = field(default_factory=list)
+    context_notes: List[str] = field(default_factory=list)
+    tokens_before: int = 0
+    tokens_after: int = 0
+
+    def to_json(self) -> str:
+        """Compact JSON for prompts; notes are indexed by position (note_index)."""
+        data: dict = {"meeting": {"title": self.title, "type": self.meeting_type}}
+        if self.date:
+            data["meeting"]["date"] = self.date
+        if self.agenda:
+            data["agenda"] = self.agenda
+        if self.existing_actions:
+            data["existing_actions"] = self.existing_actions
+        if self.context_notes:
+            data["context_notes"] = self.context_notes
+        data["notes"] = self.notes
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+compacted_requests = 0
+total_tokens_before = 0
+total_tokens_after = 0
+
+
+def _dedupe(texts: List[str]) -> List[str]:
+    seen: set[str] = set()
+    out: List[str] = []
+    for text in texts:
+        key = " ".join(text.split()).casefold()
+        if key and key not in seen:
+            seen.add(key)
+            out.append(text.strip())
+    return out
+
+
+def _keep_tail_within(texts: List[str], budget: int) -> List[str]:
+    """Keep the most recent items (end of the list) that fit in budget tokens."""
+    kept: List[str] = []
+    used = 0
+    for text in reversed(texts):
+        cost = estimate_tokens(text) + 2
+        if used + cost > budget:
+            break
+        kept.append(text)
+        used += cost
+    kept.reverse()
+    return kept
+
+
+def _tokens(texts: List[str]) -> int:
+    return sum(estimate_tokens(t) + 2 for t in texts)
+
+
+def _verbose_tokens(meeting_details: MeetingDetails, context_notes: Optional[List[str]]) -> int:
+    """Size of the uncompacted prompt data (full dump, indented), for reporting."""
+    dump = meeting_details.model_dump(mode="json", exclude_none=True)
+    if context_notes:
+        dump["context_notes"] = context_notes
+    return estimate_tokens(json.dumps(dump, indent=2, default=str))
+
+
+def compact_meeting(
+    meeting_details: MeetingDetails,
+    context_notes: Optional[List[str]] = None,
+) -> CompactMeeting:
+    """Build the compact prompt view of a meeting within the configured token budget."""
+    global compacted_requests, total_tokens_before, total_tokens_after
+    notes = [note.text for note in meeting_details.meeting_instance.notes]
+    note_set = {" ".join(n.split()).casefold() for n in notes}
+    agenda = _dedupe([
+        item.text.strip() if item.status == "open" else f"{item.text.strip()} [closed]"
+        for item in meeting_details.agenda_items
+    ])
+    existing_actions = _dedupe([action.text for action in meeting_details.existing_actions])
+    context = [
+        c for c in _dedupe(context_notes or [])
+        if " ".join(c.split()).casefold() not in note_set
+    ]
+    date = meeting_details.meeting_instance.date
+    compact = CompactMeeting(
+        title=meeting_details.meeting_series.name,
+        meeting_type=meeting_details.meeting_series.type,
+        date=date.date().isoformat() if date else None,
+        notes=notes,
+        agenda=agenda,
+        existing_actions=existing_actions,
+        context_notes=context,
+    )
+
+    # Fit optional parts into the budget left after the notes, in priority order:
+    # agenda, then context notes, then existing actions (they grow without bound over
+    # a series, so they are the first to be cut). Each keeps its most recent items.
+    budget = settings.prompt_token_budget
+    if budget > 0:
+        remaining = max(0, budget - _tokens(notes) - estimate_tokens(compact.title) - 16)
+        compact.agenda = _keep_tail_within(compact.agenda, remaining)
+        remaining -= _tokens(compact.agenda)
+        compact.context_notes = _keep_tail_within(compact.context_notes, remaining)
+        remaining -= _tokens(compact.context_notes)
+        compact.existing_actions = _keep_tail_within(compact.existing_actions, remaining)
+
+    compact.tokens_before = _verbose_tokens(meeting_details, context_notes)
+    compact.tokens_after = estimate_tokens(compact.to_json())
+    compacted_requests += 1
+    total_tokens_before += compact.tokens_before
+    total_tokens_after += compact.tokens_after
+    logger.info(
+        f"Prompt compaction: ~{compact.tokens_before} -> ~{compact.tokens_after} tokens "
+        f"({len(notes)} notes, {len(compact.existing_actions)}/{len(meeting_details.existing_actions)} existing actions)"
+    )
+    return compact
+
+
+def stats() -> dict:
+    saved = total_tokens_before - total_tokens_after
+    return {
+        "requests": compacted_requests,
+        "tokens_before": total_tokens_before,
+        "tokens_after": total_tokens_after,
+        "saved_ratio": round(saved / total_tokens_before, 4) if total_tokens_before else 0.0,
+        "token_budget": settings.prompt_token_budget,
+    }
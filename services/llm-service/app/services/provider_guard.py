@@ -0,0 +1,252 @@
+"""
+Per-provider bulkhead and circuit breaker.
+
+Every provider call takes a slot from its provider's bulkhead: at most
+PROVIDER_MAX_CONCURRENCY calls run at once and at most PROVIDER_MAX_QUEUE wait
+(for up to PROVIDER_QUEUE_TIMEOUT_SECONDS). Beyond that the call is rejected at
+once with ProviderOverloaded (429) and a Retry-After estimated from queue depth
+and observed service time. After PROVIDER_BREAKER_FAILURE_THRESHOLD consecutive
+failures (errors or timeouts) the breaker opens and calls fail fast (503) for
+PROVIDER_BREAKER_OPEN_SECONDS; then a single trial call decides whether it closes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional, Tuple
+
+from app.config import settings
+from app.models.schemas import InterviewSummaryCore, MeetingDetails, MeetingNote, NoteWithActions
+from app.services.llm_provider import LLMProvider
+from app.utils.logger import get_logger
+from app.utils.metrics import histogram
+from app.utils.timing import stage
+
+logger = get_logger(__name__)
+
+_DEFAULT_SERVICE_TIME = 10.0  # seconds, until a call has been timed
+_MAX_RETRY_AFTER = 120
+
+provider_call_duration = histogram(
+    "llm_provider_call_duration_seconds",
+    "Provider call time while holding a bulkhead slot",
+    ("provider", "outcome"),
+)
+provider_queue_wait = histogram(
+    "llm_provider_queue_wait_seconds", "Time waiting for a bulkhead slot (admitted calls)", ("provider",)
+)
+
+
+class ProviderOverloaded(Exception):
+    """A provider call was rejected by its bulkhead or circuit breaker."""
+
+    def __init__(self, message: str, status_code: int, retry_after: int):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """closed -> open after consecutive failures -> half_open (one trial call) -> closed/open."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.opens = 0
+        self._trial_in_flight = False
+
+    def allow(self) -> bool:
+        if self.state == "open":
+            if time.monotonic() - self.opened_at < settings.provider_breaker_open_seconds:
+                return False
+            self.state = "half_open"
+        if self.state == "half_open":
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+        return True
+
+    def retry_after(self) -> float:
+        return max(0.0, settings.provider_breaker_open_seconds - (time.monotonic() - self.opened_at))
+
+    def record_success(self) -> None:
+        self.consecutive_failures = 0
+        self._trial_in_flight = False
+        if self.state != "closed":
+            logger.info(f"Circuit breaker for {self.name} closed")
+            self.state = "closed"
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        self._trial_in_flight = False
+        if self.state == "half_open" or (
+            self.state == "closed"
+            and self.consecutive_failures >= settings.provider_breaker_failure_threshold
+        ):
+            self.state = "open"
+            self.opened_at = time.monotonic()
+            self.opens += 1
+            logger.warning(
+                f"Circuit breaker for {self.name} opened after {self.consecutive_failures} "
+                f"consecutive failure(s)"
+            )
+
+    def release(self) -> None:
+        """A call admitted by allow() ended without an outcome (rejected or cancelled)."""
+        self._trial_in_flight = False
+
+
+class ProviderGuard:
+    """Bulkhead (bounded concurrency + bounded wait queue) and breaker for one provider."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.breaker = CircuitBreaker(name)
+        self._semaphore = asyncio.Semaphore(settings.provider_max_concurrency)
+        self.in_flight = 0
+        self.waiting = 0
+        self.service_time: float | None = None  # EWMA of successful call durations
+        self.rejected_queue_full = 0
+        self.rejected_queue_timeout = 0
+        self.rejected_breaker_open = 0
+
+    def _retry_after(self) -> int:
+        service_time = self.service_time or _DEFAULT_SERVICE_TIME
+        backlog = (self.waiting + self.in_flight) / max(1, settings.provider_max_concurrency)
+        return max(1, min(_MAX_RETRY_AFTER, math.ceil(backlog * service_time)))
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        if not self.breaker.allow():
+            self.rejected_breaker_open += 1
+            raise ProviderOverloaded(
+                f"{self.name} is unavailable (circuit open)",
+                status_code=503,
+                retry_after=max(1, math.ceil(self.breaker.retry_after())),
+            )
+        try:
+            admitted = self.in_flight + self.waiting
+            if admitted >= settings.provider_max_concurrency + settings.provider_max_queue:
+                self.rejected_queue_full += 1
+                raise ProviderOverloaded(
+                    f"{self.name} is overloaded ({self.waiting} calls waiting)",
+                    status_code=429,
+                    retry_after=self._retry_after(),
+                )
+            self.waiting += 1
+            try:
+                queued_at = time.perf_counter()
+                with stage("provider_queue"):
+                    await asyncio.wait_for(
+                        self._semaphore.acquire(), timeout=settings.provider_queue_timeout_seconds
+                    )
+                provider_queue_wait.observe(time.perf_counter() - queued_at, self.name)
+            except asyncio.TimeoutError:
+                self.rejected_queue_timeout += 1
+                raise ProviderOverloaded(
+                    f"{self.name} is overloaded (no slot within {settings.provider_queue_timeout_seconds:.0f}s)",
+                    status_code=503,
+                    retry_after=self._retry_after(),
+                )
+            finally:
+                self.waiting -= 1
+        except BaseException:
+            self.breaker.release()
+            raise
+
+        self.in_flight += 1
+        start = time.monotonic()
+        outcome = "cancelled"
+        try:
+            yield
+        except Exception:
+            outcome = "error"
+            self.breaker.record_failure()
+            raise
+        except BaseException:
+            # Cancelled (hedge loser, client gone) or generator closed: no verdict
+            self.breaker.release()
+            raise
+        else:
+            outcome = "success"
+            self.breaker.record_success()
+            elapsed = time.monotonic() - start
+            self.service_time = elapsed if self.service_time is None else 0.8 * self.service_time + 0.2 * elapsed
+        finally:
+            provider_call_duration.observe(time.monotonic() - start, self.name, outcome)
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "queue_depth": self.waiting,
+            "max_concurrency": settings.provider_max_concurrency,
+            "max_queue": settings.provider_max_queue,
+            "service_time_s": round(self.service_time, 3) if self.service_time is not None else None,
+            "rejected_queue_full": self.rejected_queue_full,
+            "rejected_queue_timeout": self.rejected_queue_timeout,
+            "rejected_breaker_open": self.rejected_breaker_open,
+            "breaker_state": self.breaker.state,
+            "breaker_consecutive_failures": self.breaker.consecutive_failures,
+            "breaker_opens": self.breaker.opens,
+        }
+
+
+_guards: dict[str, ProviderGuard] = {}
+
+
+def guard_for(provider_name: str) -> ProviderGuard:
+    if provider_name not in _guards:
+        _guards[provider_name] = ProviderGuard(provider_name)
+    return _guards[provider_name]
+
+
+def stats() -> dict:
+    return {name: guard.stats() for name, guard in sorted(_guards.items())}
+
+
+class GuardedProvider(LLMProvider):
+    """Runs every call of the wrapped provider inside its ProviderGuard slot."""
+
+    def __init__(self, provider: LLMProvider) -> None:
+        self.provider = provider
+        self.guard = guard_for(provider.get_provider_name())
+
+    def get_provider_name(self) -> str:
+        return self.provider.get_provider_name()
+
+    async def extract_actions(
+        self,
+        meeting_details: MeetingDetails,
+        context_notes: Optional[List[str]] = None,
+    ) -> List[NoteWithActions]:
+        async with self.guard.slot():
+            return await self.provider.extract_actions(meeting_details, context_notes=context_notes)
+
+    async def stream_extract_actions(
+        self,
+        meeting_details: MeetingDetails,
+        context_notes: Optional[List[str]] = None,
+    ) -> AsyncIterator[Tuple[int, NoteWithActions]]:
+        async with self.guard.slot():
+            async for item in self.provider.stream_extract_actions(meeting_details, context_notes=context_notes):
+                yield item
+
+    async def summarize_interview(self, meeting_details: MeetingDetails) -> InterviewSummaryCore:
+        async with self.guard.slot():
+            return await self.provider.summarize_interview(meeting_details)
+
+    async def revise_interview_summary(
+        self,
+        meeting_details: MeetingDetails,
+        previous: InterviewSummaryCore,
+        new_notes: List[MeetingNote],
+    ) -> InterviewSummaryCore:
+        async with self.guard.slot():
+            return await self.provider.revise_interview_summary(meeting_details, previous, new_notes)
@@ -0,0 +1,162 @@
+"""
+App-scoped LLM provider instances.
+
+The registry is started in the FastAPI lifespan and holds one instance per
+provider that has an API key, each on a persistent, pooled HTTP client (the Toqan
+client is shared with the answer poller). At startup a few TLS connections are
+opened to each provider host so the first requests skip the handshake.
+get_llm_provider() hands out these instances (wrapped in their ProviderGuard)
+instead of building new clients per request.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+
+import httpx
+from openai import AsyncOpenAI
+
+from app.config import settings
+from app.services import toqan_client
+from app.services.llm_provider import LLMProvider
+from app.services.openai_client import OpenAIClient
+from app.services.provider_guard import GuardedProvider, guard_for
+from app.services.provider_router import RoutingProvider
+from app.services.toqan_client import ToqanClient
+from app.services.toqan_poller import toqan_poller
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class _ProviderEntry:
+    name: str
+    provider: LLMProvider
+    http_client: httpx.AsyncClient
+    warm_url: str
+    openai_client: AsyncOpenAI | None = None
+    warmed_connections: int = 0
+    warm_ms: int | None = None
+    warm_error: str | None = None
+
+
+def _pool_stats(client: httpx.AsyncClient) -> dict:
+    """Connection counts of an httpx client's pool (best effort; internals may change)."""
+    pool = getattr(getattr(client, "_transport", None), "_pool", None)
+    connections = list(getattr(pool, "connections", []) or [])
+    return {
+        "connections": len(connections),
+        "idle": sum(1 for c in connections if getattr(c, "is_idle", lambda: False)()),
+        "max_connections": settings.provider_http_max_connections,
+        "max_keepalive_connections": settings.provider_http_max_keepalive_connections,
+    }
+
+
+class ProviderRegistry:
+    def __init__(self) -> None:
+        self._entries: dict[str, _ProviderEntry] = {}
+        self._router: RoutingProvider | None = None
+        self._built = False
+
+    def _build(self) -> None:
+        if self._built:
+            return
+        if settings.toqan_api_key:
+            http_client = toqan_client.build_http_client()
+            toqan_poller.use_client(http_client)
+            self._entries["toqan"] = _ProviderEntry(
+                name="toqan",
+                provider=GuardedProvider(ToqanClient(http_client=http_client)),
+                http_client=http_client,
+                warm_url=settings.toqan_base_url,
+            )
+        if settings.openai_api_key:
+            http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=settings.provider_http_max_connections,
+                    max_keepalive_connections=settings.provider_http_max_keepalive_connections,
+                    keepalive_expiry=settings.provider_http_keepalive_expiry,
+                ),
+            )
+            openai_client = AsyncOpenAI(api_key=settings.openai_api_key, http_client=http_client)
+            self._entries["openai"] = _ProviderEntry(
+                name="openai",
+                provider=GuardedProvider(OpenAIClient(client=openai_client)),
+                http_client=http_client,
+                warm_url=str(openai_client.base_url),
+                openai_client=openai_client,
+            )
+        order = [name.strip() for name in settings.llm_provider_order.split(",") if name.strip() in self._entries]
+        order += [name for name in self._entries if name not in order]
+        if order:
+            self._router = RoutingProvider([self._entries[name].provider for name in order])
+        self._built = True
+
+    async def start(self) -> None:
+        """Create provider instances and warm their connections (called from the app lifespan)."""
+        self._build()
+        logger.info(f"Provider registry ready: {', '.join(self._entries) or 'no providers configured'}")
+        if settings.provider_warmup_enabled and self._entries:
+            await asyncio.gather(*(self._warm(entry) for entry in self._entries.values()))
+
+    async def _warm(self, entry: _ProviderEntry) -> None:
+        # Any response will do: the point is to leave handshaken connections in the pool
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(
+                entry.http_client.head(entry.warm_url, timeout=settings.provider_warmup_timeout_seconds)
+                for _ in range(max(1, settings.provider_warmup_connections))
+            ),
+            return_exceptions=True,
+        )
+        errors = [r for r in results if isinstance(r, Exception)]
+        entry.warmed_connections = len(results) - len(errors)
+        entry.warm_ms = int((time.perf_counter() - start) * 1000)
+        entry.warm_error = (str(errors[0]) or type(errors[0]).__name__) if errors else None
+        if errors:
+            logger.warning(f"Warm-up of {entry.name} connections failed: {entry.warm_error}")
+        else:
+            logger.info(f"Warmed {entry.warmed_connections} {entry.name} connection(s) in {entry.warm_ms}ms")
+
+    async def close(self) -> None:
+        """Close every provider's HTTP pool."""
+        entries, self._entries = self._entries, {}
+        self._router = None
+        self._built = False
+        for entry in entries.values():
+            try:
+                if entry.openai_client is not None:
+                    await entry.openai_client.close()
+                await entry.http_client.aclose()
+            except Exception as e:
+                logger.warning(f"Error closing {entry.name} client: {e}")
+
+    def get(self, name: str) -> LLMProvider | None:
+        """The shared instance for a provider, or None if it has no API key."""
+        self._build()
+        entry = self._entries.get(name)
+        return entry.provider if entry else None
+
+    def router(self) -> RoutingProvider | None:
+        """Routing provider over every configured provider (LLM_PROVIDER=auto)."""
+        self._build()
+        return self._router
+
+    def health(self) -> dict:
+        return {
+            name: {
+                "base_url": entry.warm_url,
+                "warmed_connections": entry.warmed_connections,
+                "warm_ms": entry.warm_ms,
+                "warm_error": entry.warm_error,
+                "pool": _pool_stats(entry.http_client),
+                "breaker_state": guard_for(name).breaker.state,
+            }
+            for name, entry in self._entries.items()
+        }
+
+
+provider_registry = ProviderRegistry()
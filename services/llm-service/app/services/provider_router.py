@@ -0,0 +1,247 @@
+"""
+Latency-aware routing and hedging across LLM providers (LLM_PROVIDER=auto).
+
+Per-provider, per-operation latency samples and error outcomes are kept in memory.
+Each call goes to the fastest healthy provider (lowest p50; unmeasured providers
+follow the LLM_PROVIDER_ORDER preference). If that call is still running after the
+provider's p90 (or LLM_HEDGE_DELAY_SECONDS before enough samples), a hedged call
+is started on the next provider; the first successful answer wins and the other
+call is cancelled. A failed call fails over to the next provider. Streaming calls
+are routed and failed over (before the first item) but not hedged.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Tuple, TypeVar
+
+from app.config import settings
+from app.models.schemas import InterviewSummaryCore, MeetingDetails, MeetingNote, NoteWithActions
+from app.services.llm_provider import LLMProvider
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+_MIN_SAMPLES = 10  # latency samples before p50/p90 are trusted
+_MIN_OUTCOMES_FOR_HEALTH = 5
+
+
+class ProviderStats:
+    """Recent latencies (successful calls) and outcomes for one provider operation."""
+
+    def __init__(self, window: int) -> None:
+        self.latencies: deque[float] = deque(maxlen=window)
+        self.outcomes: deque[bool] = deque(maxlen=window)  # True = success
+        self.calls = 0
+        self.errors = 0
+        self.cancelled = 0
+
+    def record(self, ok: bool, latency: float | None = None) -> None:
+        self.calls += 1
+        self.outcomes.append(ok)
+        if ok and latency is not None:
+            self.latencies.append(latency)
+        if not ok:
+            self.errors += 1
+
+    def quantile(self, q: float) -> float | None:
+        if len(self.latencies) < _MIN_SAMPLES:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return 1 - sum(self.outcomes) / len(self.outcomes)
+
+    def healthy(self) -> bool:
+        if len(self.outcomes) < _MIN_OUTCOMES_FOR_HEALTH:
+            return True
+        return self.error_rate() < settings.llm_route_max_error_rate
+
+    def to_dict(self) -> dict:
+        p50, p90 = self.quantile(0.5), self.quantile(0.9)
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "cancelled": self.cancelled,
+            "error_rate": round(self.error_rate(), 4),
+            "healthy": self.healthy(),
+            "p50_s": round(p50, 3) if p50 is not None else None,
+            "p90_s": round(p90, 3) if p90 is not None else None,
+        }
+
+
+_stats: dict[tuple[str, str], ProviderStats] = {}
+hedges_started = 0
+hedges_won = 0
+failovers = 0
+
+
+def provider_stats(provider_name: str, operation: str) -> ProviderStats:
+    key = (provider_name, operation)
+    if key not in _stats:
+        _stats[key] = ProviderStats(settings.llm_route_window)
+    return _stats[key]
+
+
+def stats() -> dict:
+    providers: dict[str, dict] = {}
+    for (name, operation), s in sorted(_stats.items()):
+        providers.setdefault(name, {})[operation] = s.to_dict()
+    return {
+        "providers": providers,
+        "hedging_enabled": settings.llm_hedge_enabled,
+        "hedges_started": hedges_started,
+        "hedges_won": hedges_won,
+        "failovers": failovers,
+    }
+
+
+class RoutingProvider(LLMProvider):
+    """LLMProvider that routes each call across several providers (see module docstring)."""
+
+    def __init__(self, providers: List[LLMProvider]) -> None:
+        if not providers:
+            raise ValueError("RoutingProvider needs at least one provider")
+        self.providers = providers
+
+    def get_provider_name(self) -> str:
+        return "auto(" + ",".join(p.get_provider_name() for p in self.providers) + ")"
+
+    async def extract_actions(
+        self,
+        meeting_details: MeetingDetails,
+        context_notes: Optional[List[str]] = None,
+    ) -> List[NoteWithActions]:
+        return await self._call(
+            "extract_actions",
+            lambda p: p.extract_actions(meeting_details, context_notes=context_notes),
+        )
+
+    async def summarize_interview(self, meeting_details: MeetingDetails) -> InterviewSummaryCore:
+        return await self._call("summarize_interview", lambda p: p.summarize_interview(meeting_details))
+
+    async def revise_interview_summary(
+        self,
+        meeting_details: MeetingDetails,
+        previous: InterviewSummaryCore,
+        new_notes: List[MeetingNote],
+    ) -> InterviewSummaryCore:
+        return await self._call(
+            "revise_interview_summary",
+            lambda p: p.revise_interview_summary(meeting_details, previous, new_notes),
+        )
+
+    async def stream_extract_actions(
+        self,
+        meeting_details: MeetingDetails,
+        context_notes: Optional[List[str]] = None,
+    ) -> AsyncIterator[Tuple[int, NoteWithActions]]:
+        global failovers
+        ranked = self._ranked("extract_actions")
+        for i, provider in enumerate(ranked):
+            s = provider_stats(provider.get_provider_name(), "extract_actions")
+            start = time.monotonic()
+            yielded = False
+            try:
+                async for item in provider.stream_extract_actions(meeting_details, context_notes=context_notes):
+                    yielded = True
+                    yield item
+            except Exception as e:
+                s.record(False)
+                if yielded or i == len(ranked) - 1:
+                    raise
+                failovers += 1
+                logger.warning(f"{provider.get_provider_name()} stream failed, failing over: {e}")
+                continue
+            s.record(True, time.monotonic() - start)
+            return
+
+    # --- routing ---
+
+    def _ranked(self, operation: str) -> List[LLMProvider]:
+        """Healthy providers first, then by p50 (unmeasured last), then configured preference."""
+        def key(indexed: tuple[int, LLMProvider]):
+            index, provider = indexed
+            s = provider_stats(provider.get_provider_name(), operation)
+            p50 = s.quantile(0.5)
+            return (not s.healthy(), p50 if p50 is not None else float("inf"), index)
+
+        return [p for _, p in sorted(enumerate(self.providers), key=key)]
+
+    def _hedge_delay(self, provider: LLMProvider, operation: str) -> float:
+        p90 = provider_stats(provider.get_provider_name(), operation).quantile(0.9)
+        delay = p90 if p90 is not None else settings.llm_hedge_delay_seconds
+        return max(settings.llm_hedge_min_delay_seconds, delay)
+
+    async def _timed(self, provider: LLMProvider, operation: str, fn: Callable[[LLMProvider], Awaitable[T]]) -> T:
+        s = provider_stats(provider.get_provider_name(), operation)
+        start = time.monotonic()
+        try:
+            result = await fn(provider)
+        except asyncio.CancelledError:
+            s.cancelled += 1
+            raise
+        except Exception:
+            s.record(False)
+            raise
+        s.record(True, time.monotonic() - start)
+        return result
+
+    async def _call(self, operation: str, fn: Callable[[LLMProvider], Awaitable[T]]) -> T:
+        global hedges_started, hedges_won, failovers
+        ranked = self._ranked(operation)
+        primary, backups = ranked[0], ranked[1:]
+        running: dict[asyncio.Task, LLMProvider] = {}
+
+        def launch(provider: LLMProvider) -> None:
+            running[asyncio.create_task(self._timed(provider, operation, fn))] = provider
+
+        launch(primary)
+        loop = asyncio.get_running_loop()
+        hedge_at = (
+            loop.time() + self._hedge_delay(primary, operation)
+            if settings.llm_hedge_enabled and backups
+            else None
+        )
+        hedged = False
+        last_error: BaseException | None = None
+        try:
+            while running:
+                timeout = max(0.0, hedge_at - loop.time()) if hedge_at is not None else None
+                done, _ = await asyncio.wait(running.keys(), timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    # Primary is slower than its p90: race the next provider
+                    hedge_at = None
+                    hedged = True
+                    hedges_started += 1
+                    backup = backups.pop(0)
+                    logger.info(
+                        f"Hedging {operation}: {primary.get_provider_name()} slow, "
+                        f"also trying {backup.get_provider_name()}"
+                    )
+                    launch(backup)
+                    continue
+                for task in done:
+                    provider = running.pop(task)
+                    if task.exception() is None:
+                        if hedged and provider is not primary:
+                            hedges_won += 1
+                        return task.result()
+                    last_error = task.exception()
+                    logger.warning(f"{provider.get_provider_name()} {operation} failed: {last_error}")
+                if not running and backups:
+                    # Everything in flight failed: fail over to the next provider
+                    failovers += 1
+                    hedge_at = None
+                    launch(backups.pop(0))
+            raise last_error
+        finally:
+            for task in running:
+                task.cancel()
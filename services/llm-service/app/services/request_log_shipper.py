@@ -0,0 +1,118 @@
+"""
+Batched shipping of request-log rows to database-service.
+
+The request logging middleware only appends a row to a bounded in-memory buffer;
+one background task sends rows to POST /requests/bulk when request_log_batch_size
+rows are waiting or request_log_flush_interval_seconds has passed, whichever comes
+first. When the buffer is full new rows are dropped and counted, so logging can never
+hold memory or sockets under load. On shutdown the buffer is drained (bounded by
+request_log_drain_timeout_seconds) before the database client is closed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+
+from app import db_client
+from app.config import settings
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class RequestLogShipper:
+    """Bounded buffer of request-log rows flushed in batches by one background task."""
+
+    def __init__(self) -> None:
+        self._rows: deque[dict] = deque()
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self._closing = False
+        self.enqueued = 0
+        self.dropped = 0
+        self.shipped = 0
+        self.failed = 0  # rows lost because a bulk POST failed or stored fewer rows
+        self.batches = 0
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        self._closing = False
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    def enqueue(self, row: dict) -> None:
+        """Buffer one row; never blocks. Rows are dropped when the buffer is full or not started."""
+        if self._task is None or self._closing or len(self._rows) >= settings.request_log_queue_max_size:
+            self.dropped += 1
+            return
+        self._rows.append(row)
+        self.enqueued += 1
+        if len(self._rows) >= settings.request_log_batch_size:
+            self._wakeup.set()
+
+    async def close(self) -> None:
+        """Ship what is still buffered, then stop the flusher."""
+        task = self._task
+        if task is None:
+            return
+        self._closing = True
+        self._wakeup.set()
+        try:
+            await asyncio.wait_for(task, timeout=settings.request_log_drain_timeout_seconds)
+        except asyncio.TimeoutError:
+            logger.warning(f"Request log drain timed out; {len(self._rows)} rows dropped")
+        self.dropped += len(self._rows)
+        self._rows.clear()
+        self._task = None
+        self._wakeup = None
+
+    def stats(self) -> dict:
+        return {
+            "buffered": len(self._rows),
+            "enqueued": self.enqueued,
+            "shipped": self.shipped,
+            "batches": self.batches,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+    # --- internals ---
+
+    async def _run(self) -> None:
+        while not self._closing:
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(), timeout=settings.request_log_flush_interval_seconds
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self._drain()
+
+    async def _drain(self) -> None:
+        while self._rows:
+            batch_size = min(len(self._rows), settings.request_log_batch_size)
+            await self._ship([self._rows.popleft() for _ in range(batch_size)])
+
+    async def _ship(self, rows: list[dict]) -> None:
+        if not db_client.is_configured():
+            self.dropped += len(rows)
+            return
+        try:
+            r = await db_client.get_client().post("/requests/bulk", json={"requests": rows})
+            r.raise_for_status()
+            inserted = min(int(r.json().get("inserted", 0)), len(rows))
+        except Exception as e:
+            self.failed += len(rows)
+            logger.warning(f"Failed to ship {len(rows)} request log rows to database service: {e}")
+            return
+        self.shipped += inserted
+        self.batches += 1
+        if inserted < len(rows):
+            self.failed += len(rows) - inserted
+            logger.warning(f"Database service stored {inserted} of {len(rows)} request log rows")
+
+
+request_log_shipper = RequestLogShipper()
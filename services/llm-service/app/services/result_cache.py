@@ -0,0 +1,83 @@
+"""
+Local cache of completed extract-actions responses, keyed by input_hash.
+
+Sits in front of the database-service dedup lookup so hot repeated inputs are
+answered from memory. Filled when an extraction completes and when the DB
+returns a completed record; warmed at startup from the most recent rows.
+"""
+
+from __future__ import annotations
+
+import json
+
+from app import db_client
+from app.config import settings
+from app.models.schemas import ActionExtractionResponse
+from app.utils.logger import get_logger
+from app.utils.ttl_cache import TTLCache
+
+logger = get_logger(__name__)
+
+_DB_PAGE_SIZE = 200  # max page size of GET /extract-action-items
+
+extract_result_cache: TTLCache[ActionExtractionResponse] = TTLCache(
+    max_entries=settings.result_cache_max_entries,
+    ttl_seconds=settings.result_cache_ttl_seconds,
+    max_bytes=settings.result_cache_max_bytes,
+)
+
+
+def get_cached_result(input_hash: str) -> ActionExtractionResponse | None:
+    if not settings.result_cache_enabled:
+        return None
+    return extract_result_cache.get(input_hash)
+
+
+def remember_result(input_hash: str, response: ActionExtractionResponse, output_json: str | None = None) -> None:
+    """Store a completed response; output_json (if already serialized) sizes the entry."""
+    if not settings.result_cache_enabled or not input_hash:
+        return
+    if output_json is None:
+        output_json = json.dumps(response.model_dump(mode="json"))
+    extract_result_cache.set(input_hash, response, size=len(output_json))
+
+
+async def warm_result_cache() -> int:
+    """Load the most recent completed extract_action_items into the cache. Returns rows loaded."""
+    if not settings.result_cache_enabled or settings.result_cache_warm_count <= 0:
+        return 0
+    if not db_client.is_configured():
+        return 0
+    rows: list[dict] = []
+    offset = 0
+    try:
+        while offset < settings.result_cache_warm_count:
+            limit = min(_DB_PAGE_SIZE, settings.result_cache_warm_count - offset)
+            r = await db_client.get_client().get(
+                "/extract-action-items",
+                params={"status": "completed", "limit": limit, "offset": offset},
+            )
+            r.raise_for_status()
+            items = r.json().get("items", [])
+            rows.extend(items)
+            if len(items) < limit:
+                break
+            offset += limit
+    except Exception as e:
+        logger.warning(f"Failed to warm result cache: {e}")
+
+    # Rows arrive latest first; insert oldest first so the newest end up most-recently-used
+    loaded = 0
+    for item in reversed(rows):
+        input_hash = item.get("input_hash")
+        output_json = item.get("output_json")
+        if not input_hash or not output_json or input_hash in extract_result_cache:
+            continue
+        try:
+            response = ActionExtractionResponse(**json.loads(output_json))
+        except (json.JSONDecodeError, TypeError, ValueError):
+            continue
+        extract_result_cache.set(input_hash, response, size=len(output_json))
+        loaded += 1
+    logger.info(f"Result cache warmed with {loaded} completed extraction(s)")
+    return loaded
@@ -0,0 +1,121 @@
+"""
+Local cache of interview summaries, keyed by input_hash.
+
+Same canonical hash as extract-actions (input_hash.py), so a summary is reused until
+the notes actually change. An edited note is a new key; when its summary is stored,
+the meeting's previous summary is dropped here (and in database-service, which keeps
+one finished interview_summaries row per meeting and license key). Entries hold
+InterviewSummaryCore; series and meeting ids are taken from each request. Per meeting
+and license key, the digests of the notes behind its latest summary are kept too, so
+summary_revision can tell which notes were added since. Meeting ids come from the
+client, so one license never gets another's summary as a revision base.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime
+from dataclasses import dataclass
+from typing import Iterable, Tuple
+
+from app.config import settings
+from app.models.schemas import InterviewSummaryCore, MeetingDetails, MeetingNote
+from app.services.input_hash import normalize_text
+from app.utils.ttl_cache import TTLCache
+
+
+@dataclass
+class PriorSummary:
+    """A meeting's latest summary and the notes it was written from."""
+
+    summary: InterviewSummaryCore
+    note_digests: Tuple[str, ...]
+    char_count: int
+
+
+@dataclass
+class _Latest:
+    input_hash: str
+    note_digests: Tuple[str, ...]
+    char_count: int
+
+
+interview_summary_cache: TTLCache[InterviewSummaryCore] = TTLCache(
+    max_entries=settings.summary_cache_max_entries,
+    ttl_seconds=settings.summary_cache_ttl_seconds,
+    max_bytes=settings.summary_cache_max_bytes,
+)
+
+# (license_key, series_id, meeting_id) -> the meeting's latest cached summary
+_latest_by_meeting: TTLCache[_Latest] = TTLCache(
+    max_entries=settings.summary_cache_max_entries,
+    ttl_seconds=settings.summary_cache_ttl_seconds,
+)
+superseded = 0
+
+
+def _meeting_key(meeting_details: MeetingDetails, license_key: str | None) -> str:
+    return f"{license_key or ''}\x1f{meeting_details.meeting_series.id}\x1f{meeting_details.meeting_instance.id}"
+
+
+def note_digests(notes: Iterable[MeetingNote]) -> Tuple[str, ...]:
+    """Per-note fingerprints, insensitive to the whitespace/Unicode differences input_hash ignores."""
+    return tuple(hashlib.sha256(normalize_text(n.text or "").encode()).hexdigest()[:16] for n in notes)
+
+
+def is_fresh_record(record: dict) -> bool:
+    """An interview_summaries record updated less than SUMMARY_RECORD_TTL_SECONDS ago."""
+    try:
+        updated_at = datetime.fromisoformat(record.get("updated_at") or "")
+    except ValueError:
+        return False
+    return (datetime.utcnow() - updated_at).total_seconds() < settings.summary_record_ttl_seconds
+
+
+def get_cached_summary(input_hash: str) -> InterviewSummaryCore | None:
+    if not settings.summary_cache_enabled:
+        return None
+    return interview_summary_cache.get(input_hash)
+
+
+def remember_summary(
+    input_hash: str,
+    meeting_details: MeetingDetails,
+    license_key: str | None,
+    core: InterviewSummaryCore,
+    output_json: str,
+) -> None:
+    """Store a completed summary and drop the meeting's summary of its previous notes."""
+    global superseded
+    if not settings.summary_cache_enabled or not input_hash:
+        return
+    meeting_key = _meeting_key(meeting_details, license_key)
+    previous = _latest_by_meeting.get(meeting_key)
+    if previous and previous.input_hash != input_hash and interview_summary_cache.delete(previous.input_hash):
+        superseded += 1
+    interview_summary_cache.set(input_hash, core, size=len(output_json))
+    notes = meeting_details.meeting_instance.notes
+    _latest_by_meeting.set(
+        meeting_key,
+        _Latest(input_hash, note_digests(notes), sum(len(n.text or "") for n in notes)),
+    )
+
+
+def latest_summary(meeting_details: MeetingDetails, license_key: str | None) -> PriorSummary | None:
+    """The meeting's latest summary for license_key in this worker, if it is still cached."""
+    if not settings.summary_cache_enabled:
+        return None
+    latest = _latest_by_meeting.get(_meeting_key(meeting_details, license_key))
+    if latest is None:
+        return None
+    summary = interview_summary_cache.get(latest.input_hash)
+    if summary is None:
+        return None
+    return PriorSummary(summary, latest.note_digests, latest.char_count)
+
+
+def stats() -> dict:
+    return {
+        **interview_summary_cache.stats(),
+        "superseded": superseded,
+    }
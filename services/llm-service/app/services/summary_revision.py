@@ -0,0 +1,163 @@
+"""
+Incremental interview summaries.
+
+When notes are added after a meeting was summarized, the provider gets that summary
+plus only the new notes (revise_interview_summary) instead of every note, so the
+prompt grows with the change rather than with the interview. The base is the
+meeting's latest summary under the same license key: from this worker's summary
+cache, else the meeting's latest completed interview_summaries row in
+database-service for that key, whose input_json gives the notes it was written from.
+Requests without a license key only use the local cache.
+
+A revision applies only when the base's notes are, unchanged and in order, the first
+notes of the request. Otherwise the meeting is summarized in full, counted by reason:
+- no_base: no fresh summary of this meeting, or its stored input is unreadable
+- not_appended: an earlier note was edited, removed or reordered, or no note was added
+- short: earlier notes under SUMMARY_REVISION_MIN_PRIOR_CHARS; a full prompt is about
+  as small as the previous summary plus the new notes
+- large_delta: new notes over SUMMARY_REVISION_MAX_DELTA_RATIO of the earlier notes'
+  characters, or more than SUMMARY_REVISION_MAX_NEW_NOTES of them
+- tier_change: evidence_level would move to another tier at the new length
+- tier_changed_by_model: the revision came back with another evidence_level; it is
+  discarded and the summary regenerated
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import List
+
+from app import db_client
+from app.config import settings
+from app.models.schemas import InterviewSummaryCore, InterviewSummaryRequest, MeetingDetails, MeetingNote
+from app.services.interview_summary_prompts import evidence_tier
+from app.services.llm_provider import LLMProvider
+from app.services.summary_cache import PriorSummary, is_fresh_record, latest_summary, note_digests
+from app.utils.logger import get_logger
+from app.utils.metrics import counter
+
+logger = get_logger(__name__)
+
+OUTCOMES = ("revised", "no_base", "not_appended", "short", "large_delta", "tier_change", "tier_changed_by_model")
+
+revision_outcomes = counter(
+    "llm_summary_revisions_total",
+    "Interview summaries revised from the previous one, or summarized in full (by reason)",
+    ("outcome",),
+)
+note_chars_skipped = 0  # characters of earlier notes not re-sent thanks to revisions
+
+
+@dataclass
+class RevisionPlan:
+    previous: InterviewSummaryCore
+    new_notes: List[MeetingNote]
+    previous_char_count: int
+
+
+def _chars(notes: List[MeetingNote]) -> int:
+    return sum(len(n.text or "") for n in notes)
+
+
+async def _latest_from_db(meeting_details: MeetingDetails, license_key: str | None) -> PriorSummary | None:
+    """The meeting's latest completed summary for license_key in database-service, with the notes it covered."""
+    if not db_client.is_configured() or not license_key:
+        return None
+    try:
+        r = await db_client.get_client().get(
+            "/interview-summaries/latest",
+            params={
+                "series_id": meeting_details.meeting_series.id,
+                "meeting_id": meeting_details.meeting_instance.id,
+                "license_key": license_key,
+            },
+        )
+        if r.status_code == 404:
+            return None
+        r.raise_for_status()
+        record = r.json()
+    except Exception as e:
+        logger.warning(f"Failed to get latest interview summary: {e}")
+        return None
+    if not is_fresh_record(record):
+        return None
+    try:
+        summary = InterviewSummaryCore(**json.loads(record.get("output_json") or ""))
+        # input_json is truncated for very large requests; those are summarized in full
+        request = InterviewSummaryRequest.model_validate_json(record.get("input_json") or "")
+    except (TypeError, ValueError):
+        return None
+    notes = request.meeting_details.meeting_instance.notes
+    return PriorSummary(summary, note_digests(notes), _chars(notes))
+
+
+def _full_reason(prior: PriorSummary | None, notes: List[MeetingNote]) -> str | None:
+    """Why this request cannot be a revision of prior, or None if it can."""
+    if prior is None:
+        return "no_base"
+    n = len(prior.note_digests)
+    if n >= len(notes) or note_digests(notes[:n]) != prior.note_digests:
+        return "not_appended"
+    if prior.char_count < settings.summary_revision_min_prior_chars:
+        return "short"
+    new_notes = notes[n:]
+    new_chars = _chars(new_notes)
+    if (
+        len(new_notes) > settings.summary_revision_max_new_notes
+        or new_chars > settings.summary_revision_max_delta_ratio * prior.char_count
+    ):
+        return "large_delta"
+    if evidence_tier(prior.char_count + new_chars) != prior.summary.evidence_level:
+        return "tier_change"
+    return None
+
+
+async def plan_revision(meeting_details: MeetingDetails, license_key: str | None) -> RevisionPlan | None:
+    """A revision of the meeting's previous summary, or None to summarize in full."""
+    if not settings.summary_revision_enabled:
+        return None
+    notes = meeting_details.meeting_instance.notes
+    if _chars(notes) < settings.summary_revision_min_prior_chars:
+        revision_outcomes.inc("short")  # too short to need a lookup
+        return None
+    prior = latest_summary(meeting_details, license_key) or await _latest_from_db(meeting_details, license_key)
+    reason = _full_reason(prior, notes)
+    if reason:
+        revision_outcomes.inc(reason)
+        logger.info(f"Interview summary: full regeneration ({reason})")
+        return None
+    n = len(prior.note_digests)
+    return RevisionPlan(prior.summary, notes[n:], prior.char_count)
+
+
+async def revise_summary(
+    provider: LLMProvider, meeting_details: MeetingDetails, plan: RevisionPlan
+) -> InterviewSummaryCore | None:
+    """Run the revision; None if the result changed evidence_level and must be regenerated."""
+    global note_chars_skipped
+    revised = await provider.revise_interview_summary(meeting_details, plan.previous, plan.new_notes)
+    if revised.evidence_level != plan.previous.evidence_level:
+        revision_outcomes.inc("tier_changed_by_model")
+        logger.info(
+            f"Interview summary revision moved evidence_level {plan.previous.evidence_level} -> "
+            f"{revised.evidence_level}; regenerating in full"
+        )
+        return None
+    if plan.previous.security_flag and not revised.security_flag:
+        revised.security_flag = plan.previous.security_flag
+    revision_outcomes.inc("revised")
+    note_chars_skipped += plan.previous_char_count
+    logger.info(
+        f"Interview summary revised with {len(plan.new_notes)} new notes "
+        f"({plan.previous_char_count} chars of earlier notes not re-sent)"
+    )
+    return revised
+
+
+def stats() -> dict:
+    return {
+        "enabled": settings.summary_revision_enabled,
+        **{outcome: int(revision_outcomes.value(outcome)) for outcome in OUTCOMES},
+        "note_chars_skipped": note_chars_skipped,
+    }
@@ -1,7 +1,6 @@
 import httpx
 import json
-import asyncio
-from typing import List
+from typing import List, Optional
 from app.models.schemas import (
     MeetingDetails,
     NoteWithActions,
@@ -9,49 +8,96 @@ from app.models.schemas import (
     MeetingNote,
     InterviewSummaryCore,
 )
-from app.services.llm_provider import LLMProvider
+from app.services.llm_json_offload import llm_json_offloader
+from app.services.llm_provider import LLMProvider, unanswered
+from app.services.prompt_compaction import compact_meeting
+from app.services.toqan_poller import toqan_poller
 from app.services.interview_summary_prompts import (
     INTERVIEW_SUMMARY_SYSTEM,
+    interview_revision_user_prompt,
     interview_summary_user_appendix,
     normalize_interview_llm_payload,
 )
 from app.config import settings
 from app.utils.logger import get_logger
-from app.utils.llm_json import parse_llm_json_object
+from app.utils.timing import stage
 
 logger = get_logger(__name__)
 
 
+# Static part of the extraction message, kept ahead of the per-meeting JSON so the
+# prompt prefix is byte-identical across requests.
+EXTRACT_ACTIONS_INSTRUCTIONS = """Extract action items from the meeting notes in the JSON at the end of this message.
+
+For each entry in "notes", identify whether it contains action items; a note may have zero, one, or multiple actions. Action items can match the original text or be structured/improved versions, and should be grammatically correct with no spelling errors; add concise context wherever available. Write each action so it stands alone by appending the nearest, most relevant contextual noun phrase or purpose from the same sentence, earlier sentences in the same note, or the meeting title when clearly implied. Resolve pronouns such as “it,” “this,” and “that,” and any implied subjects, to the closest valid antecedent within the note; if none exists, keep the wording as-is. Prefer concrete nouns (e.g., “review meeting,” “Q1 budget”) over vague terms, and merge purpose/target phrases introduced by “for,” “to,” “in preparation for,” or “regarding.” Do not invent information beyond the note or meeting metadata, and if no clear antecedent exists, keep the action concise without added context. Use imperative voice, ensure correct grammar and spelling, and keep wording brief and non-redundant.
+If "context_notes" is present, those are earlier notes of this meeting given for context only; do not extract actions from them.
+Return a JSON object with "notes_with_actions" array. Each item should have:
+- "note_index": the position of the note in "notes" (0-based)
+- "action_items": array of action items extracted from this note, each with only "text" field
+
+Example response format:
+{
+  "notes_with_actions": [
+    {
+      "note_index": 0,
+      "action_items": [{"text": "Action 1"}, {"text": "Action 2"}]
+    }
+  ]
+}
+"""
+
+
+def build_http_client() -> httpx.AsyncClient:
+    """Pooled client for the Toqan API (shared by ToqanClient and the answer poller)."""
+    return httpx.AsyncClient(
+        base_url=settings.toqan_base_url,
+        timeout=settings.request_timeout,
+        headers={"accept": "*/*", "X-Api-Key": settings.toqan_api_key},
+        limits=httpx.Limits(
+            max_connections=settings.provider_http_max_connections,
+            max_keepalive_connections=settings.provider_http_max_keepalive_connections,
+            keepalive_expiry=settings.provider_http_keepalive_expiry,
+        ),
+    )
+
+
 class ToqanClient(LLMProvider):
     """Toqan LLM provider implementation"""
     
-    def __init__(self):
+    def __init__(self, http_client: httpx.AsyncClient | None = None):
         self.api_key = settings.toqan_api_key
         self.timeout = settings.request_timeout
-        self.base_url = "https://api.coco.prod.toqan.ai/api"
-        self.poll_interval = settings.toqan_poll_interval
+        self.base_url = settings.toqan_base_url
+        # Pooled client from the provider registry; without one a client is made per call
+        self.http_client = http_client
         
-    async def extract_actions(self, meeting_details: MeetingDetails) -> List[NoteWithActions]:
+    async def extract_actions(
+        self,
+        meeting_details: MeetingDetails,
+        context_notes: Optional[List[str]] = None,
+    ) -> List[NoteWithActions]:
         """
         Extract actions using Toqan API.
         Flow:
         1. Create conversation with meeting details as JSON
-        2. Poll get_answer until status is "finished"
+        2. Wait for the shared poller to see status "finished"
         3. Parse response and map actions to notes
         """
         try:
             # Prepare the user message with meeting details as JSON
-            user_message = self._prepare_toqan_message(meeting_details)
+            user_message = self._prepare_toqan_message(meeting_details, context_notes)
             
             # Step 1: Create conversation
-            conversation_id, request_id = await self._create_conversation(user_message)
+            with stage("toqan_create"):
+                conversation_id, request_id = await self._create_conversation(user_message)
             logger.info(f"Created Toqan conversation: {conversation_id}, request: {request_id}")
             
             # Step 2: Poll for answer
-            answer_data = await self._get_answer(conversation_id, request_id)
+            with stage("toqan_poll"):
+                answer_data = await self._get_answer(conversation_id, request_id)
             
             # Step 3: Parse response and map actions to notes
-            notes_with_actions = self._parse_toqan_response(meeting_details, answer_data)
+            notes_with_actions = await self._parse_toqan_response(meeting_details, answer_data)
             
             return notes_with_actions
                 
@@ -68,15 +114,7 @@ class ToqanClient(LLMProvider):
         """Summarize interview notes via Toqan; expects JSON in the answer."""
         try:
             user_message = self._prepare_toqan_interview_message(meeting_details)
-            conversation_id, request_id = await self._create_conversation(user_message)
-            logger.info(f"Toqan interview summary conversation: {conversation_id}")
-            answer_data = await self._get_answer(conversation_id, request_id)
-            answer_text = answer_data.get("answer", "")
-            if not answer_text:
-                raise ValueError("Toqan returned empty answer for interview summary")
-            result = parse_llm_json_object(answer_text)
-            normalized = normalize_interview_llm_payload(result)
-            return InterviewSummaryCore.model_validate(normalized)
+            return await self._interview_answer(user_message)
         except httpx.HTTPError as e:
             logger.error(f"Toqan API error (interview summary): {str(e)}")
             raise Exception(f"Failed to communicate with Toqan API: {str(e)}")
@@ -84,6 +122,44 @@ class ToqanClient(LLMProvider):
             logger.error(f"Error summarizing interview with Toqan: {str(e)}")
             raise
 
+    async def revise_interview_summary(
+        self,
+        meeting_details: MeetingDetails,
+        previous: InterviewSummaryCore,
+        new_notes: List[MeetingNote],
+    ) -> InterviewSummaryCore:
+        """Revise previous with the new notes via Toqan (instructions first, as for a full summary)."""
+        try:
+            notes = meeting_details.meeting_instance.notes
+            previous_notes = notes[: len(notes) - len(new_notes)]
+            revision = interview_revision_user_prompt(
+                previous,
+                new_notes,
+                previous_note_count=len(previous_notes),
+                previous_char_count=sum(len(n.text or "") for n in previous_notes),
+            )
+            return await self._interview_answer(f"{INTERVIEW_SUMMARY_SYSTEM}\n{revision}")
+        except httpx.HTTPError as e:
+            logger.error(f"Toqan API error (interview summary revision): {str(e)}")
+            raise Exception(f"Failed to communicate with Toqan API: {str(e)}")
+        except Exception as e:
+            logger.error(f"Error revising interview summary with Toqan: {str(e)}")
+            raise
+
+    async def _interview_answer(self, user_message: str) -> InterviewSummaryCore:
+        with stage("toqan_create"):
+            conversation_id, request_id = await self._create_conversation(user_message)
+        logger.info(f"Toqan interview summary conversation: {conversation_id}")
+        with stage("toqan_poll"):
+            answer_data = await self._get_answer(conversation_id, request_id)
+        answer_text = answer_data.get("answer", "")
+        if not answer_text:
+            raise ValueError("Toqan returned empty answer for interview summary")
+        result = await llm_json_offloader.parse_object(answer_text)
+        with stage("validate"):
+            normalized = normalize_interview_llm_payload(result)
+            return InterviewSummaryCore.model_validate(normalized)
+
     def _prepare_toqan_interview_message(self, meeting_details: MeetingDetails) -> str:
         meeting_json = {
             "meeting_series": meeting_details.meeting_series.model_dump(exclude_none=True),
@@ -103,43 +179,16 @@ class ToqanClient(LLMProvider):
 Respond with a single JSON object as specified in the instructions above.
 """
 
-    def _prepare_toqan_message(self, meeting_details: MeetingDetails) -> str:
+    def _prepare_toqan_message(
+        self, meeting_details: MeetingDetails, context_notes: Optional[List[str]] = None
+    ) -> str:
         """
         Prepare the user message for Toqan.
-        Convert meeting details to JSON string and create a prompt.
+        Static instructions come first (identical on every call), followed by the
+        compacted meeting JSON (see prompt_compaction).
         """
-        # Convert meeting details to JSON
-        meeting_json = {
-            "meeting_series": meeting_details.meeting_series.model_dump(exclude_none=True),
-            "meeting_instance": meeting_details.meeting_instance.model_dump(exclude_none=True),
-            "agenda_items": [item.model_dump(exclude_none=True) for item in meeting_details.agenda_items],
-            "existing_actions": [action.model_dump(exclude_none=True) for action in meeting_details.existing_actions]
-        }
-        
-        # Create prompt for Toqan
-        prompt = f"""Extract action items from the following meeting notes in JSON format.
-
-Meeting Details (JSON):
-{json.dumps(meeting_json, indent=2, default=str)}
-
-For each note in meeting_instance.notes, identify whether it contains action items; a note may have zero, one, or multiple actions. Action items can match the original text or be structured/improved versions, and should be grammatically correct with no spelling errors; add concise context wherever available. Write each action so it stands alone by appending the nearest, most relevant contextual noun phrase or purpose from the same sentence, earlier sentences in the same note, or the meeting title when clearly implied. Resolve pronouns such as “it,” “this,” and “that,” and any implied subjects, to the closest valid antecedent within the note; if none exists, keep the wording as-is. Prefer concrete nouns (e.g., “review meeting,” “Q1 budget”) over vague terms, and merge purpose/target phrases introduced by “for,” “to,” “in preparation for,” or “regarding.” Do not invent information beyond the note or meeting metadata, and if no clear antecedent exists, keep the action concise without added context. Use imperative voice, ensure correct grammar and spelling, and keep wording brief and non-redundant.
-Return a JSON object with "notes_with_actions" array. Each item should have:
-- "note_index": the index of the note (0-based)
-- "note": the original note object
-- "action_items": array of action items extracted from this note, each with only "text" field
-
-Example response format:
-{{
-  "notes_with_actions": [
-    {{
-      "note_index": 0,
-      "note": {{"text": "...", "created_at": null, "updated_at": null}},
-      "action_items": [{{"text": "Action 1"}}, {{"text": "Action 2"}}]
-    }}
-  ]
-}}
-"""
-        return prompt
+        compact = compact_meeting(meeting_details, context_notes)
+        return f"{EXTRACT_ACTIONS_INSTRUCTIONS}\nMeeting Details (JSON):\n{compact.to_json()}\n"
     
     async def _create_conversation(self, user_message: str) -> tuple[str, str]:
         """Create a new conversation in Toqan"""
@@ -151,94 +200,31 @@ Example response format:
         }
         payload = {"user_message": user_message}
         
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.post(url, json=payload, headers=headers)
-            response.raise_for_status()
-            data = response.json()
-            return data["conversation_id"], data["request_id"]
-    
-    async def _get_answer(self, conversation_id: str, request_id: str) -> dict:
-        """
-        Poll get_answer endpoint until status is finished.
-        Falls back to find_conversation if get_answer doesn't work.
-        """
-        # Try get_answer endpoint first (official API)
-        try:
-            url = f"{self.base_url}/get_answer"
-            headers = {
-                "accept": "*/*",
-                "X-Api-Key": self.api_key
-            }
-            params = {
-                "conversation_id": conversation_id,
-                "request_id": request_id
-            }
-            
+        if self.http_client is not None:
+            response = await self.http_client.post(url, json=payload, headers=headers)
+        else:
             async with httpx.AsyncClient(timeout=self.timeout) as client:
-                while True:
-                    response = await client.get(url, params=params, headers=headers)
-                    response.raise_for_status()
-                    data = response.json()
-                    
-                    status = data.get("status", "unknown")
-                    
-                    if status == "finished":
-                        return data
-                    elif status == "error":
-                        error_msg = data.get("error", "Unknown error")
-                        raise Exception(f"Toqan API error: {error_msg}")
-                    elif status == "in_progress":
-                        logger.info(f"Toqan request in progress, polling again in {self.poll_interval}s...")
-                        await asyncio.sleep(self.poll_interval)
-                    else:
-                        logger.warning(f"Unknown status: {status}, polling again...")
-                        await asyncio.sleep(self.poll_interval)
-        except Exception as e:
-            # Fallback to find_conversation method
-            logger.warning(f"get_answer failed, using find_conversation fallback: {str(e)}")
-            return await self._find_conversation_response(conversation_id)
+                response = await client.post(url, json=payload, headers=headers)
+        response.raise_for_status()
+        data = response.json()
+        return data["conversation_id"], data["request_id"]
     
-    async def _find_conversation_response(self, conversation_id: str) -> dict:
+    async def _get_answer(self, conversation_id: str, request_id: str) -> dict:
         """
-        Alternative method: Poll find_conversation until response appears.
-        Returns when conversation has more than one entry (response received).
+        Wait for the answer via the shared poller (adaptive backoff, hard deadline,
+        find_conversation fallback if get_answer keeps failing).
         """
-        url = f"{self.base_url}/find_conversation"
-        headers = {
-            "accept": "*/*",
-            "content-type": "application/json",
-            "X-Api-Key": self.api_key
-        }
-        payload = {"conversation_id": conversation_id}
-        
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            while True:
-                response = await client.post(url, json=payload, headers=headers)
-                response.raise_for_status()
-                conversations = response.json()
-                
-                # Check if the response contains more than one conversation
-                # (meaning the AI response has arrived)
-                if len(conversations) > 1:
-                    # Return the last conversation entry as the answer
-                    last_entry = conversations[-1]
-                    return {
-                        "status": "finished",
-                        "answer": last_entry.get("message", ""),
-                        "conversation": conversations
-                    }
-                
-                # Wait before checking again
-                await asyncio.sleep(self.poll_interval)
+        return await toqan_poller.wait_for_answer(conversation_id, request_id)
     
-    def _parse_toqan_response(
+    async def _parse_toqan_response(
         self, 
         meeting_details: MeetingDetails, 
         answer_data: dict
     ) -> List[NoteWithActions]:
         """
         Parse Toqan response and map action items to their source notes.
-        Toqan returns the answer in the 'answer' field, which should be JSON.
+        Toqan returns the answer in the 'answer' field, which should be JSON; fenced,
+        truncated or otherwise malformed answers are repaired (off the event loop if large).
         """
         notes_with_actions = []
         
@@ -249,39 +235,24 @@ Example response format:
             # If no answer, return all notes with empty action items
             logger.warning("Toqan returned empty answer")
             for note in meeting_details.meeting_instance.notes:
-                notes_with_actions.append(
-                    NoteWithActions(note=note, action_items=[])
-                )
+                notes_with_actions.append(unanswered(note))
             return notes_with_actions
         
         try:
-            # Try to parse answer as JSON
-            result = json.loads(answer_text)
-        except json.JSONDecodeError:
-            # If answer is not JSON, try to extract JSON from markdown code blocks
-            logger.warning("Toqan answer is not valid JSON, attempting to extract...")
-            # Look for JSON in code blocks
-            if "```json" in answer_text:
-                json_start = answer_text.find("```json") + 7
-                json_end = answer_text.find("```", json_start)
-                if json_end > json_start:
-                    answer_text = answer_text[json_start:json_end].strip()
-                    result = json.loads(answer_text)
-            elif "```" in answer_text:
-                json_start = answer_text.find("```") + 3
-                json_end = answer_text.find("```", json_start)
-                if json_end > json_start:
-                    answer_text = answer_text[json_start:json_end].strip()
-                    result = json.loads(answer_text)
-            else:
-                # Fallback: return all notes with empty actions
-                logger.error(f"Could not parse Toqan response: {answer_text[:200]}")
-                for note in meeting_details.meeting_instance.notes:
-                    notes_with_actions.append(
-                        NoteWithActions(note=note, action_items=[])
-                    )
-                return notes_with_actions
+            result = await llm_json_offloader.parse_object(answer_text)
+        except ValueError:
+            # Fallback: return all notes with empty actions
+            logger.error(f"Could not parse Toqan response: {answer_text[:200]}")
+            for note in meeting_details.meeting_instance.notes:
+                notes_with_actions.append(unanswered(note))
+            return notes_with_actions
         
+        with stage("validate"):
+            return self._map_actions_to_notes(meeting_details, result)
+
+    def _map_actions_to_notes(self, meeting_details: MeetingDetails, result: dict) -> List[NoteWithActions]:
+        """Build NoteWithActions for every note from the parsed {"notes_with_actions": [...]} answer."""
+        notes_with_actions = []
         # Create mapping from note_index to action items
         notes_mapping = {}
         if "notes_with_actions" in result:
@@ -297,10 +268,10 @@ Example response format:
         
         # Build response with all notes, mapping actions where available
         for i, note in enumerate(meeting_details.meeting_instance.notes):
-            action_items = notes_mapping.get(i, [])
-            notes_with_actions.append(
-                NoteWithActions(note=note, action_items=action_items)
-            )
+            if i in notes_mapping:
+                notes_with_actions.append(NoteWithActions(note=note, action_items=notes_mapping[i]))
+            else:
+                notes_with_actions.append(unanswered(note))
         
         return notes_with_actions
     
@@ -0,0 +1,287 @@
+"""
+Multiplexed Toqan answer poller.
+
+One background task polls get_answer for every outstanding (conversation_id,
+request_id) pair and resolves a future per request, instead of each request
+running its own sleep loop. Per-request poll delays adapt to observed completion
+times: no polls before completions usually happen, dense polls while they are
+likely, then exponential backoff up to toqan_poll_interval. Every request has a
+hard deadline; if get_answer keeps failing, that request falls back to
+find_conversation under the same deadline.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+
+import httpx
+
+from app.config import settings
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_MIN_SAMPLES_FOR_QUANTILES = 10
+_MAX_GET_ANSWER_ERRORS = 3  # then switch this request to find_conversation
+
+
+class ToqanAnswerTimeout(TimeoutError):
+    """No answer from Toqan before the request's deadline."""
+
+
+class _ToqanAnswerError(Exception):
+    """Toqan reported status=error for the request (not retried)."""
+
+
+@dataclass
+class _PendingAnswer:
+    conversation_id: str
+    request_id: str
+    future: asyncio.Future
+    started_at: float
+    deadline: float
+    next_poll_at: float
+    attempts: int = 0
+    errors: int = 0
+    use_find_conversation: bool = False
+    polling: bool = False
+
+
+class ToqanAnswerPoller:
+    """Single background poller shared by all Toqan requests in this worker."""
+
+    def __init__(self) -> None:
+        self._pending: dict[str, _PendingAnswer] = {}
+        self._durations: deque[float] = deque(maxlen=200)
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self._client: httpx.AsyncClient | None = None
+        self._owns_client = True
+        self._poll_tasks: set[asyncio.Task] = set()
+        self.polls = 0
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.fallbacks = 0
+
+    # --- public API ---
+
+    async def wait_for_answer(
+        self,
+        conversation_id: str,
+        request_id: str,
+        deadline_seconds: float | None = None,
+    ) -> dict:
+        """Register a request and wait until Toqan reports it finished (or the deadline passes)."""
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        deadline = now + (deadline_seconds or settings.toqan_answer_deadline_seconds)
+        entry = _PendingAnswer(
+            conversation_id=conversation_id,
+            request_id=request_id,
+            future=loop.create_future(),
+            started_at=now,
+            deadline=deadline,
+            next_poll_at=now,
+        )
+        entry.next_poll_at = now + self._next_delay(entry, now)
+        self._pending[request_id] = entry
+        self._ensure_running()
+        try:
+            return await entry.future
+        finally:
+            self._pending.pop(request_id, None)
+            if self._wakeup is not None:
+                self._wakeup.set()
+
+    def use_client(self, client: httpx.AsyncClient) -> None:
+        """Poll through a pooled client owned by someone else (the provider registry)."""
+        self._client = client
+        self._owns_client = False
+
+    async def close(self) -> None:
+        """Stop the poller, failing anything still outstanding."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        for entry in list(self._pending.values()):
+            if not entry.future.done():
+                entry.future.set_exception(RuntimeError("Toqan poller shut down"))
+        self._pending.clear()
+        self._wakeup = None
+        if self._client is not None:
+            client, self._client = self._client, None
+            if self._owns_client:
+                await client.aclose()
+            self._owns_client = True
+
+    def stats(self) -> dict:
+        q = self._quantiles()
+        return {
+            "pending": len(self._pending),
+            "polls": self.polls,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timeouts": self.timeouts,
+            "find_conversation_fallbacks": self.fallbacks,
+            "completion_p10_s": round(q[0], 3) if q else None,
+            "completion_p50_s": round(q[1], 3) if q else None,
+            "completion_p90_s": round(q[2], 3) if q else None,
+        }
+
+    # --- scheduling ---
+
+    def _quantiles(self) -> tuple[float, float, float] | None:
+        if len(self._durations) < _MIN_SAMPLES_FOR_QUANTILES:
+            return None
+        ordered = sorted(self._durations)
+        n = len(ordered)
+        return ordered[int(n * 0.1)], ordered[int(n * 0.5)], ordered[min(n - 1, int(n * 0.9))]
+
+    def _next_delay(self, entry: _PendingAnswer, now: float) -> float:
+        min_interval = settings.toqan_poll_min_interval
+        max_interval = float(settings.toqan_poll_interval)
+        elapsed = now - entry.started_at
+        q = self._quantiles()
+        if q is not None and not entry.use_find_conversation:
+            p10, _, p90 = q
+            if elapsed < p10:
+                # Answers rarely arrive this early: sleep until the fast tail begins
+                return max(min_interval, min(p10 - elapsed, max_interval))
+            if elapsed < p90:
+                return min_interval
+        backoff = settings.toqan_poll_backoff ** max(0, entry.attempts - 1)
+        return min(max_interval, min_interval * backoff)
+
+    def _ensure_running(self) -> None:
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        self._wakeup.set()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=settings.toqan_base_url,
+                timeout=settings.request_timeout,
+                headers={"accept": "*/*", "X-Api-Key": settings.toqan_api_key},
+            )
+        return self._client
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._pending:
+            self._wakeup.clear()
+            now = loop.time()
+            due = []
+            for entry in list(self._pending.values()):
+                if entry.future.done() or entry.polling:
+                    continue
+                if now >= entry.deadline:
+                    self.timeouts += 1
+                    entry.future.set_exception(
+                        ToqanAnswerTimeout(
+                            f"Toqan answer not ready after {entry.deadline - entry.started_at:.0f}s "
+                            f"(conversation {entry.conversation_id})"
+                        )
+                    )
+                elif now >= entry.next_poll_at:
+                    due.append(entry)
+            for entry in due:
+                entry.polling = True
+                poll_task = asyncio.create_task(self._poll(entry))
+                self._poll_tasks.add(poll_task)
+                poll_task.add_done_callback(self._poll_tasks.discard)
+
+            waiting = [
+                e for e in self._pending.values() if not e.future.done() and not e.polling
+            ]
+            if not waiting and not any(e.polling for e in self._pending.values()):
+                # Only finished entries left: sleep until their waiters pop them or a request arrives
+                await self._wakeup.wait()
+                continue
+            next_at = min(
+                [min(e.next_poll_at, e.deadline) for e in waiting] or [now + settings.toqan_poll_interval]
+            )
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=max(0.0, next_at - loop.time()))
+            except asyncio.TimeoutError:
+                pass
+
+    async def _poll(self, entry: _PendingAnswer) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            self.polls += 1
+            entry.attempts += 1
+            if entry.use_find_conversation:
+                data = await self._poll_find_conversation(entry)
+            else:
+                data = await self._poll_get_answer(entry)
+            if data is not None and not entry.future.done():
+                elapsed = loop.time() - entry.started_at
+                self._durations.append(elapsed)
+                self.completed += 1
+                entry.future.set_result(data)
+        except Exception as e:
+            if entry.future.done():
+                return
+            if isinstance(e, _ToqanAnswerError):
+                self.failed += 1
+                entry.future.set_exception(Exception(str(e)))
+                return
+            entry.errors += 1
+            if not entry.use_find_conversation and entry.errors >= _MAX_GET_ANSWER_ERRORS:
+                self.fallbacks += 1
+                entry.use_find_conversation = True
+                entry.attempts = 0
+                logger.warning(f"get_answer failed, using find_conversation fallback: {e}")
+            else:
+                logger.warning(f"Toqan poll failed (attempt {entry.attempts}): {e}")
+        finally:
+            entry.polling = False
+            now = loop.time()
+            entry.next_poll_at = now + self._next_delay(entry, now)
+            if self._wakeup is not None:
+                self._wakeup.set()
+
+    async def _poll_get_answer(self, entry: _PendingAnswer) -> dict | None:
+        response = await self._get_client().get(
+            "/get_answer",
+            params={"conversation_id": entry.conversation_id, "request_id": entry.request_id},
+        )
+        response.raise_for_status()
+        data = response.json()
+        status = data.get("status", "unknown")
+        if status == "finished":
+            return data
+        if status == "error":
+            raise _ToqanAnswerError(f"Toqan API error: {data.get('error', 'Unknown error')}")
+        if status != "in_progress":
+            logger.warning(f"Unknown Toqan status: {status}, polling again...")
+        return None
+
+    async def _poll_find_conversation(self, entry: _PendingAnswer) -> dict | None:
+        response = await self._get_client().post(
+            "/find_conversation",
+            json={"conversation_id": entry.conversation_id},
+        )
+        response.raise_for_status()
+        conversations = response.json()
+        # More than one entry means the AI response has arrived
+        if len(conversations) > 1:
+            return {
+                "status": "finished",
+                "answer": conversations[-1].get("message", ""),
+                "conversation": conversations,
+            }
+        return None
+
+
+toqan_poller = ToqanAnswerPoller()
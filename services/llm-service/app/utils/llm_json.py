@@ -1,38 +1,31 @@
 """
 Parse JSON returned by LLMs (Toqan/OpenAI). Models often emit invalid JSON:
 unescaped newlines/control characters inside strings, markdown fences, truncation.
+
+Well-formed answers are decoded with orjson when it is installed (stdlib json
+otherwise); only malformed ones reach the pure-Python completion and json-repair.
 """
 
 from __future__ import annotations
 
 import json
 import logging
+import re
 from typing import Any
 
+try:
+    import orjson
+except ImportError:  # optional fast decoder
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
-def _strip_fences(text: str) -> str:
-    t = text.strip()
-    if "```json" in t:
-        start = t.find("```json") + 7
-        end = t.find("```", start)
-        if end > start:
-            return t[start:end].strip()
-    if "```" in t:
-        start = t.find("```") + 3
-        end = t.find("```", start)
-        if end > start:
-            return t[start:end].strip()
-    return t
-
-
-def _brace_slice(text: str) -> str | None:
-    a = text.find("{")
-    b = text.rfind("}")
-    if a >= 0 and b > a:
-        return text[a : b + 1]
-    return None
+def fast_loads(text: str) -> Any:
+    """json.loads, via orjson when installed. Raises json.JSONDecodeError (orjson's subclasses it)."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
 
 
 def _coerce_root(data: Any) -> dict[str, Any] | None:
@@ -46,51 +39,323 @@ def _coerce_root(data: Any) -> dict[str, Any] | None:
 def parse_llm_json_object(answer_text: str) -> dict[str, Any]:
     """
     Best-effort parse of a single JSON object from LLM text.
-    Uses stdlib json.loads first, then json-repair for malformed output.
+    Tries fast_loads on the whole answer, then one IncrementalJSONParser pass
+    (fences, control characters, truncation), then json-repair on the raw text.
     """
     if answer_text is None or not str(answer_text).strip():
         raise ValueError("Empty LLM answer for JSON parsing")
 
     raw = str(answer_text).strip().lstrip("\ufeff")
-    candidates: list[str] = []
-    for c in (raw, _strip_fences(raw)):
-        if c and c not in candidates:
-            candidates.append(c)
-    br = _brace_slice(_strip_fences(raw)) or _brace_slice(raw)
-    if br and br not in candidates:
-        candidates.append(br)
-
-    for c in candidates:
-        if not c:
-            continue
+    out = try_fast_parse(raw)
+    if out is not None:
+        return out
+    return repair_llm_json_object(raw)
+
+
+def try_fast_parse(raw: str) -> dict[str, Any] | None:
+    """Decode a well-formed answer; None if it needs repair."""
+    try:
+        return _coerce_root(fast_loads(raw))
+    except json.JSONDecodeError as e:
+        logger.debug("Fast JSON decode failed: %s", e)
+        return None
+
+
+def repair_llm_json_object(raw: str) -> dict[str, Any]:
+    """
+    Slow path of parse_llm_json_object for stripped text that did not decode as-is.
+    Pure Python and CPU-bound on large answers; async callers go through
+    app.services.llm_json_offload so it runs off the event loop.
+    """
+    parser = IncrementalJSONParser()
+    parser.feed(raw)
+    try:
+        out = _coerce_root(parser.close())
+        if out is not None:
+            return out
+    except ValueError as e:
+        logger.debug("Incremental parse failed: %s", e)
+
+    out = _coerce_root(_repair(raw))
+    if out is not None:
+        return out
+
+    snippet = raw[:1200] + ("…" if len(raw) > 1200 else "")
+    raise ValueError(
+        "Could not parse JSON object from LLM output (invalid control characters, "
+        f"truncation, or bad structure). Snippet: {snippet}"
+    )
+
+
+_IN_STRING = re.compile(r'["\\\x00-\x1f]')
+_STRUCTURAL = re.compile(r'["{}\[\]]')
+_ROOT_START = re.compile(r"[{\[]")
+_CONTROL_ESCAPES = {"\n": "\\n", "\r": "\\r", "\t": "\\t", "\b": "\\b", "\f": "\\f"}
+_CLOSERS = {"{": "}", "[": "]"}
+_PARTIAL_LITERAL = re.compile(r"[A-Za-z0-9.+\-]+$")
+
+
+def _is_literal(token: str) -> bool:
+    try:
+        json.loads(token)
+        return True
+    except json.JSONDecodeError:
+        return False
+
+
+class IncrementalJSONParser:
+    """
+    Single-pass parser for JSON streamed by an LLM.
+
+    feed() takes text chunks as they arrive. Text before the root value (prose,
+    markdown fences) and after it is skipped; raw control characters inside strings
+    are escaped as they are copied, so the collected text is valid JSON if the model
+    closed everything. With array_key, completed elements of that array (a
+    top-level {"<array_key>": [...]} or a bare root array) are returned from feed()
+    as soon as they close. close() returns the root value; a truncated answer is
+    completed (open string closed, dangling key or separator dropped, containers
+    closed) and parsed once, with json-repair as the only fallback.
+    """
+
+    def __init__(self, array_key: str | None = None) -> None:
+        self.array_key = array_key
+        self._parts: list[str] = []  # normalized text of the root value
+        self._stack: list[str] = []  # open containers
+        self._started = False
+        self._pending_bracket = False  # saw "[" before the root; decided by the next char
+        self._in_string = False
+        self._escape = False
+        self._key_parts: list[str] | None = None  # string being read at depth 1
+        self._last_key: str | None = None
+        self._array_depth: int | None = None  # depth of elements of the target array
+        self._array_closed = False
+        self._item_parts: list[str] | None = None
+        self._items: list[Any] = []
+        self.items_emitted = 0
+        self.done = False  # root value closed
+        self.truncated = False
+
+    # --- streaming ---
+
+    def feed(self, chunk: str) -> list[Any]:
+        """Consume a chunk; return target-array elements that closed in it."""
+        if self.done or not chunk:
+            return []
+        i = 0 if self._started else self._skip_to_root(chunk)
+        if i is None:
+            return []
+        n = len(chunk)
+        while i < n and not self.done:
+            if self._escape:
+                self._emit(chunk[i])
+                self._escape = False
+                i += 1
+                continue
+            if self._in_string:
+                m = _IN_STRING.search(chunk, i)
+                if m is None:
+                    self._emit(chunk[i:])
+                    break
+                j = m.start()
+                self._emit(chunk[i:j])
+                ch = chunk[j]
+                if ch == "\\":
+                    self._emit(ch)
+                    self._escape = True
+                elif ch == '"':
+                    self._end_string()
+                else:
+                    self._emit(_CONTROL_ESCAPES.get(ch) or f"\\u{ord(ch):04x}")
+                i = j + 1
+                continue
+            m = _STRUCTURAL.search(chunk, i)
+            if m is None:
+                self._emit(chunk[i:])
+                break
+            j = m.start()
+            self._emit(chunk[i:j])
+            ch = chunk[j]
+            i = j + 1
+            if ch == '"':
+                self._begin_string()
+            elif ch in "{[":
+                self._open(ch)
+            else:
+                self._close(ch)
+        items, self._items = self._items, []
+        self.items_emitted += len(items)
+        return items
+
+    def close(self) -> Any:
+        """Return the root value, completing a truncated answer. Raises ValueError if nothing parses."""
+        text = "".join(self._parts)
+        if not text:
+            raise ValueError("No JSON value found in LLM output")
+        if not self.done:
+            self.truncated = True
+            text = self._complete(text)
         try:
-            data = json.loads(c)
-            out = _coerce_root(data)
-            if out is not None:
-                return out
+            return fast_loads(text)
         except json.JSONDecodeError as e:
-            logger.debug("json.loads failed: %s", e)
+            logger.debug("Completed JSON still invalid (%s); trying json_repair", e)
+        repaired = _repair(text)
+        if repaired is None:
+            raise ValueError("Could not parse JSON from LLM output")
+        return repaired
+
+    def finish(self) -> list[Any]:
+        """Close the stream and return target-array elements not yet emitted (from a truncated tail)."""
+        try:
+            root = self.close()
+        except ValueError:
+            return []
+        if isinstance(root, dict):
+            root = root.get(self.array_key)
+        if not isinstance(root, list):
+            return []
+        rest = root[self.items_emitted :]
+        self.items_emitted += len(rest)
+        return rest
+
+    # --- scanning ---
+
+    def _skip_to_root(self, chunk: str) -> int | None:
+        """Find where the root value starts in chunk (None if it does not start here)."""
+        i, n = 0, len(chunk)
+        while i < n:
+            if self._pending_bracket:
+                k = i
+                while k < n and chunk[k].isspace():
+                    k += 1
+                if k == n:
+                    return None
+                self._pending_bracket = False
+                if chunk[k] in '{["]':
+                    self._started = True
+                    self._open("[")
+                    return i
+                i = k
+                continue
+            m = _ROOT_START.search(chunk, i)
+            if m is None:
+                return None
+            if m.group() == "{":
+                self._started = True
+                return m.start()
+            self._pending_bracket = True
+            i = m.end()
+        return None
+
+    def _emit(self, text: str) -> None:
+        if not text:
+            return
+        self._parts.append(text)
+        if self._item_parts is not None:
+            self._item_parts.append(text)
+        if self._key_parts is not None:
+            self._key_parts.append(text)
+
+    def _begin_string(self) -> None:
+        self._emit('"')
+        self._in_string = True
+        if len(self._stack) == 1 and self._stack[0] == "{" and self._array_depth is None:
+            self._key_parts = []
+
+    def _end_string(self) -> None:
+        if self._key_parts is not None:
+            self._last_key = "".join(self._key_parts)
+            self._key_parts = None
+        self._in_string = False
+        self._emit('"')
+
+    def _open(self, ch: str) -> None:
+        depth = len(self._stack)
+        if self.array_key is not None and self._array_depth is None and ch == "[" and (
+            depth == 0 or (depth == 1 and self._last_key == self.array_key)
+        ):
+            self._array_depth = depth + 1
+        elif self._array_depth is not None and not self._array_closed and depth == self._array_depth:
+            self._item_parts = []
+        self._emit(ch)
+        self._stack.append(ch)
 
+    def _close(self, ch: str) -> None:
+        self._emit(ch)
+        if self._stack:
+            self._stack.pop()
+        depth = len(self._stack)
+        if self._array_depth is not None and not self._array_closed:
+            if depth == self._array_depth and self._item_parts is not None:
+                item = _loads_fragment("".join(self._item_parts))
+                self._item_parts = None
+                if item is not None:
+                    self._items.append(item)
+            elif depth < self._array_depth:
+                self._array_closed = True
+        if depth == 0:
+            self.done = True
+
+    # --- truncation ---
+
+    def _complete(self, text: str) -> str:
+        """Close a truncated value: open string, dangling key/separator, open containers."""
+        if self._in_string:
+            if self._escape:
+                text = text[:-1]
+            text += '"'
+        while True:
+            t = text.rstrip()
+            if t.endswith(","):
+                text = t[:-1]
+            elif t.endswith(":"):
+                text = _drop_trailing_string(t[:-1].rstrip())[0]
+            elif (m := _PARTIAL_LITERAL.search(t)) and not _is_literal(m.group()):
+                text = t[: m.start()]  # cut-off number / true / false / null
+            elif t.endswith('"') and self._stack and self._stack[-1] == "{":
+                head, before = _drop_trailing_string(t)
+                if before not in ("{", ","):
+                    return t + "".join(_CLOSERS[c] for c in reversed(self._stack))
+                text = head  # a key without a value
+            else:
+                return t + "".join(_CLOSERS[c] for c in reversed(self._stack))
+
+
+def _drop_trailing_string(text: str) -> tuple[str, str]:
+    """Remove a trailing "..." literal; return (rest, last significant char before it)."""
+    i = len(text) - 2
+    while i >= 0:
+        if text[i] == '"':
+            backslashes = 0
+            k = i - 1
+            while k >= 0 and text[k] == "\\":
+                backslashes += 1
+                k -= 1
+            if backslashes % 2 == 0:
+                break
+        i -= 1
+    rest = text[: max(i, 0)].rstrip()
+    return rest, rest[-1:]
+
+
+def _repair(text: str) -> Any:
     try:
         from json_repair import loads as json_repair_loads
     except ImportError:
         logger.warning("json_repair package not installed; cannot recover malformed LLM JSON")
-        json_repair_loads = None
+        return None
+    try:
+        return json_repair_loads(text)
+    except Exception as e:
+        logger.debug("json_repair.loads failed: %s", e)
+        return None
 
-    if json_repair_loads is not None:
-        for c in candidates:
-            if not c:
-                continue
-            try:
-                data = json_repair_loads(c)
-                out = _coerce_root(data)
-                if out is not None:
-                    return out
-            except Exception as e:
-                logger.debug("json_repair.loads failed: %s", e)
 
-    snippet = raw[:1200] + ("…" if len(raw) > 1200 else "")
-    raise ValueError(
-        "Could not parse interview summary JSON from LLM (invalid control characters, "
-        f"truncation, or bad structure). Snippet: {snippet}"
-    )
+def _loads_fragment(fragment: str) -> Any:
+    try:
+        return fast_loads(fragment)
+    except json.JSONDecodeError:
+        pass
+    repaired = _repair(fragment)
+    if repaired is None:
+        logger.debug("Could not parse streamed JSON element")
+    return repaired
@@ -0,0 +1,52 @@
+"""
+In-process request coalescing ("singleflight").
+
+Concurrent callers asking for the same key share one execution: the first caller
+(leader) starts the work as a task, later callers await that same task. The work
+runs detached from the leader, so a leader disconnect does not cancel it for
+everyone else. The work's stage timings go to the leader's request; a follower's
+wait is timed as its coalesce_wait stage.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Awaitable, Callable, Generic, TypeVar
+
+from app.utils.timing import stage
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """Run at most one coroutine per key at a time; duplicates await its result."""
+
+    def __init__(self) -> None:
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    def in_flight(self, key: str) -> bool:
+        return key in self._inflight
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        """
+        Return (result, shared). shared=True when this caller joined a flight
+        started by another caller. Exceptions from fn are raised to every caller.
+        """
+        task = self._inflight.get(key)
+        if task is not None:
+            with stage("coalesce_wait"):
+                return await asyncio.shield(task), True
+        task = asyncio.ensure_future(fn())
+        self._inflight[key] = task
+        task.add_done_callback(lambda t, k=key: self._forget(k, t))
+        return await asyncio.shield(task), False
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception as retrieved when every waiter has gone away
+        if not task.cancelled():
+            task.exception()
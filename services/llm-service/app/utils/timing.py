@@ -0,0 +1,74 @@
+"""
+Per-request stage timings.
+
+An endpoint calls start_timings(); code anywhere below it (routes, providers, JSON
+parsing) wraps a stage in `with stage("name"):`. The collector lives in a context
+variable, so tasks started during the request (singleflight, chunk fan-out, hedged
+calls) report into the same collector; a stage run concurrently is summed. Without a
+collector stage() only reads the clock. Timings are exposed as a Server-Timing header
+and as compact JSON ({"stage": ms}) stored with the extract_action_items row. Each
+stage is also a trace span (app/utils/tracing.py), so traces show the same breakdown.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from app.utils.tracing import span
+
+
+class StageTimings:
+    """Milliseconds per stage, in first-seen order."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.stages: dict[str, float] = {}
+
+    def add(self, name: str, ms: float) -> None:
+        self.stages[name] = self.stages.get(name, 0.0) + ms
+
+    def total_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def to_dict(self) -> dict[str, float]:
+        data = {name: round(ms, 1) for name, ms in self.stages.items()}
+        data["total"] = round(self.total_ms(), 1)
+        return data
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), separators=(",", ":"))
+
+    def server_timing(self) -> str:
+        """Server-Timing header value, e.g. 'license;dur=1.2, llm;dur=830.4, total;dur=845.0'."""
+        return ", ".join(f"{name};dur={ms}" for name, ms in self.to_dict().items())
+
+
+_current: ContextVar[StageTimings | None] = ContextVar("stage_timings", default=None)
+
+
+def start_timings() -> StageTimings:
+    """Start collecting stage timings for the current request."""
+    timings = StageTimings()
+    _current.set(timings)
+    return timings
+
+
+def current_timings() -> StageTimings | None:
+    return _current.get()
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time the enclosed block as stage name (added to the current request's timings, if any)."""
+    start = time.perf_counter()
+    try:
+        with span(name):
+            yield
+    finally:
+        timings = _current.get()
+        if timings is not None:
+            timings.add(name, (time.perf_counter() - start) * 1000)
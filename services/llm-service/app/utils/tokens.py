@@ -0,0 +1,14 @@
+"""
+Cheap local token estimates for prompt budgeting.
+
+Roughly 4 characters per token for English text. Good enough to size prompt
+windows; not a substitute for the provider's tokenizer.
+"""
+
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str | None) -> int:
+    if not text:
+        return 0
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
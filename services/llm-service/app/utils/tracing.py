@@ -0,0 +1,239 @@
+"""
+Request ids and trace spans across services.
+
+The tracing middleware opens a server span for each request. It continues the caller's
+trace when a W3C traceparent header is present and otherwise starts a new one;
+X-Request-Id is kept when given (else it is the trace id) and echoed on the
+response. span(name) records a child of the current span; the span lives in a
+context variable, so tasks started during the request nest under it.
+TracingTransport, used by the internal httpx clients, wraps each call in a client
+span and sends traceparent and X-Request-Id on, so the next service's middleware
+continues the same trace.
+
+Finished spans go to an in-memory ring buffer (GET /traces) and, when an export
+path is configured, to a JSONL file, one span per line. Several services may append
+to the same file. Outside a request span() does nothing.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import secrets
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import IO, Any, Iterator
+
+import httpx
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+_REQUEST_ID = re.compile(r"^[A-Za-z0-9._:-]{1,128}$")
+
+
+def parse_incoming(traceparent: str | None, request_id: str | None) -> tuple[str, str | None, str]:
+    """(trace_id, parent span id, request id) of an incoming request; invalid headers are ignored."""
+    match = _TRACEPARENT.match((traceparent or "").strip().lower())
+    trace_id, parent_id = (match.group(1), match.group(2)) if match else (secrets.token_hex(16), None)
+    request_id = (request_id or "").strip()
+    if not _REQUEST_ID.match(request_id):
+        request_id = trace_id
+    return trace_id, parent_id, request_id
+
+
+class Span:
+    """One timed operation of a trace; start is wall-clock so services can be merged."""
+
+    __slots__ = (
+        "trace_id", "span_id", "parent_id", "request_id", "name", "kind",
+        "start", "duration_ms", "status", "attributes", "_t0",
+    )
+
+    def __init__(
+        self,
+        trace_id: str,
+        parent_id: str | None,
+        request_id: str,
+        name: str,
+        kind: str = "internal",
+        attributes: dict[str, Any] | None = None,
+    ) -> None:
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.request_id = request_id
+        self.name = name
+        self.kind = kind
+        self.start = time.time()
+        self.duration_ms: float | None = None
+        self.status = "ok"
+        self.attributes = attributes or {}
+        self._t0 = time.perf_counter()
+
+    def finish(self) -> None:
+        self.duration_ms = round((time.perf_counter() - self._t0) * 1000, 2)
+
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def to_dict(self) -> dict:
+        return {
+            "service": recorder.service,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "request_id": self.request_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start": self.start,
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class SpanRecorder:
+    """Ring buffer of finished spans, optionally mirrored to a JSONL file."""
+
+    def __init__(self) -> None:
+        self.service = "unknown"
+        self.enabled = True
+        self._spans: deque[Span] = deque(maxlen=2000)
+        self._file: IO[str] | None = None
+        self.recorded = 0
+        self.export_errors = 0
+
+    def configure(self, service: str, enabled: bool = True, buffer_size: int = 2000, export_path: str = "") -> None:
+        self.service = service
+        self.enabled = enabled
+        self._spans = deque(self._spans, maxlen=max(1, buffer_size))
+        self.close()
+        if enabled and export_path:
+            os.makedirs(os.path.dirname(os.path.abspath(export_path)), exist_ok=True)
+            # Line buffered: each span is one write(), appended whole even with several writers
+            self._file = open(export_path, "a", buffering=1, encoding="utf-8")
+
+    def record(self, span: Span) -> None:
+        self._spans.append(span)
+        self.recorded += 1
+        if self._file is not None:
+            try:
+                self._file.write(json.dumps(span.to_dict(), separators=(",", ":"), default=str) + "\n")
+            except (OSError, ValueError):
+                self.export_errors += 1
+
+    def trace(self, trace_id: str) -> list[dict]:
+        """This service's spans of one trace, in start order."""
+        return sorted((s.to_dict() for s in list(self._spans) if s.trace_id == trace_id), key=lambda s: s["start"])
+
+    def recent(self, limit: int = 50) -> list[dict]:
+        """Most recent server spans (one per request handled here), newest first."""
+        out = []
+        for s in reversed(list(self._spans)):
+            if s.kind == "server":
+                out.append(s.to_dict())
+                if len(out) >= limit:
+                    break
+        return out
+
+    def close(self) -> None:
+        file, self._file = self._file, None
+        if file is not None:
+            file.close()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "buffered": len(self._spans),
+            "buffer_size": self._spans.maxlen,
+            "recorded": self.recorded,
+            "exporting": self._file is not None,
+            "export_errors": self.export_errors,
+        }
+
+
+recorder = SpanRecorder()
+_current: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+def current_span() -> Span | None:
+    return _current.get()
+
+
+def _restore(token, previous: Span | None) -> None:
+    try:
+        _current.reset(token)
+    except ValueError:  # finished in another context (e.g. an async generator closed elsewhere)
+        _current.set(previous)
+
+
+@contextmanager
+def use_span(active: Span) -> Iterator[Span]:
+    """Make active the current span for the enclosed block (the middleware's server span)."""
+    previous = _current.get()
+    token = _current.set(active)
+    try:
+        yield active
+    finally:
+        _restore(token, previous)
+
+
+def start_span(name: str, kind: str = "internal", **attributes: Any) -> Span | None:
+    """
+    A child of the current span, ended by end_span(); for callback-style hooks that
+    cannot wrap the operation in span(). It does not become the current span.
+    """
+    parent = _current.get()
+    if parent is None or not recorder.enabled:
+        return None
+    return Span(parent.trace_id, parent.span_id, parent.request_id, name, kind, attributes)
+
+
+def end_span(child: Span, error: BaseException | None = None) -> None:
+    if error is not None:
+        child.status = "error"
+        child.attributes["error"] = type(error).__name__
+    child.finish()
+    recorder.record(child)
+
+
+@contextmanager
+def span(name: str, kind: str = "internal", **attributes: Any) -> Iterator[Span | None]:
+    """Record the enclosed block as a child of the current span (no-op outside a trace)."""
+    child = start_span(name, kind, **attributes)
+    if child is None:
+        yield None
+        return
+    parent = _current.get()
+    token = _current.set(child)
+    error = None
+    try:
+        yield child
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        _restore(token, parent)
+        end_span(child, error)
+
+
+class TracingTransport(httpx.AsyncHTTPTransport):
+    """
+    httpx transport that records a client span per request and propagates the trace.
+    A subclass rather than a wrapper, so pool introspection (_pool) keeps working.
+    The span ends when response headers arrive.
+    """
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        with span(f"{request.method} {request.url.path}", kind="client", peer=request.url.host) as s:
+            if s is not None:
+                request.headers["traceparent"] = s.traceparent()
+                request.headers["X-Request-Id"] = s.request_id
+            response = await super().handle_async_request(request)
+            if s is not None:
+                s.attributes["status_code"] = response.status_code
+                if response.status_code >= 500:
+                    s.status = "error"
+            return response
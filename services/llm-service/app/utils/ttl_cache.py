@@ -0,0 +1,115 @@
+"""
+Bounded in-memory LRU cache with per-entry TTL and an optional byte budget.
+
+Not thread-safe by design: it is only touched from the event loop.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Generic, Iterator, TypeVar
+
+V = TypeVar("V")
+
+
+@dataclass
+class _Entry(Generic[V]):
+    value: V
+    size: int
+    expires_at: float
+
+
+class TTLCache(Generic[V]):
+    """
+    LRU cache bounded by entry count and (optionally) total size in bytes.
+    Entries older than ttl_seconds are treated as misses and dropped on access.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float, max_bytes: int = 0) -> None:
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes  # 0 = no byte budget
+        self._data: OrderedDict[str, _Entry[V]] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: str) -> bool:
+        entry = self._data.get(key)
+        return entry is not None and entry.expires_at > time.monotonic()
+
+    def keys(self) -> Iterator[str]:
+        return iter(list(self._data.keys()))
+
+    def get(self, key: str) -> V | None:
+        """Return the cached value (refreshing its LRU position) or None."""
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry.value
+
+    def set(self, key: str, value: V, size: int = 0, ttl_seconds: float | None = None) -> None:
+        """Insert or replace an entry. size is the caller's estimate in bytes."""
+        if self.max_bytes and size > self.max_bytes:
+            return  # larger than the whole budget; never cache
+        if key in self._data:
+            self._remove(key)
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._data[key] = _Entry(value=value, size=size, expires_at=time.monotonic() + ttl)
+        self._bytes += size
+        self._evict()
+
+    def delete(self, key: str) -> bool:
+        if key in self._data:
+            self._remove(key)
+            return True
+        return False
+
+    def clear(self) -> int:
+        n = len(self._data)
+        self._data.clear()
+        self._bytes = 0
+        return n
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def _remove(self, key: str) -> None:
+        entry = self._data.pop(key)
+        self._bytes -= entry.size
+
+    def _evict(self) -> None:
+        while self._data and (
+            len(self._data) > self.max_entries
+            or (self.max_bytes and self._bytes > self.max_bytes)
+        ):
+            key = next(iter(self._data))
+            self._remove(key)
+            self.evictions += 1
@@ -0,0 +1,167 @@
+"""
+Parse throughput and event-loop blocking per LLM JSON parsing strategy.
+
+Runs every answer in corpus/ (real malformed outputs: fences, prose, truncation,
+control characters, root arrays) plus large generated answers through:
+
+- stdlib_inline    parse_llm_json_object on the loop with stdlib json only
+- orjson_inline    parse_llm_json_object on the loop with orjson (if installed)
+- offload_thread   LLMJSONOffloader, repairs above --offload-min-chars on a thread pool
+- offload_process  LLMJSONOffloader, repairs above --offload-min-chars on a process pool
+
+While a strategy runs, a heartbeat task sleeps --tick-ms at a time; how late it wakes
+up is how long the loop was blocked. Reported per strategy and input group:
+answers/s, MB/s, max stall and total stall (ms).
+
+Run from services/llm-service:
+    python -m benchmarks.llm_json.bench [--repeat 20] [--large-notes 2000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from pathlib import Path
+
+from app.services.llm_json_offload import LLMJSONOffloader
+from app.utils import llm_json
+
+CORPUS_DIR = Path(__file__).parent / "corpus"
+
+
+def load_corpus() -> dict[str, str]:
+    return {p.stem: p.read_text(encoding="utf-8") for p in sorted(CORPUS_DIR.glob("*.txt"))}
+
+
+def large_cases(notes: int) -> dict[str, str]:
+    """Large answers with the corpus's malformations applied to a realistic payload."""
+    body = json.dumps(
+        {
+            "notes_with_actions": [
+                {
+                    "note_index": i,
+                    "action_items": [
+                        {"text": f"Follow up with the owner of item {i} on the launch checklist and budget"},
+                        {"text": f"Update the tracker for workstream {i} before the next review meeting"},
+                    ],
+                }
+                for i in range(notes)
+            ]
+        },
+        indent=2,
+    )
+    return {
+        "large_valid": body,
+        "large_fenced": f"Here are the action items:\n```json\n{body}\n```\n",
+        "large_control_chars": body.replace("Update the tracker", "Update the\ntracker\t"),
+        "large_truncated": body[: int(len(body) * 0.9)],
+    }
+
+
+class Heartbeat:
+    """Measure how late a periodic sleep wakes up while other work shares the loop."""
+
+    def __init__(self, tick: float) -> None:
+        self.tick = tick
+        self.lags: list[float] = []
+        self._task: asyncio.Task | None = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.tick)
+            self.lags.append(max(0.0, loop.time() - start - self.tick))
+
+    def __enter__(self) -> "Heartbeat":
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self._task is not None:
+            self._task.cancel()
+
+
+async def run_strategy(name: str, parse, answers: dict[str, str], repeat: int, tick: float) -> dict:
+    failures = 0
+    size = sum(len(a.encode("utf-8")) for a in answers.values()) * repeat
+    await asyncio.sleep(0)
+    with Heartbeat(tick) as hb:
+        await asyncio.sleep(tick * 2)  # let the heartbeat settle
+        hb.lags.clear()
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for text in answers.values():
+                try:
+                    await parse(text)
+                except ValueError:
+                    failures += 1
+                await asyncio.sleep(0)  # a request handler would yield between answers
+        elapsed = time.perf_counter() - start
+        await asyncio.sleep(tick * 2)  # catch the stall of the last answer
+    count = len(answers) * repeat
+    lags = hb.lags or [0.0]
+    p99 = statistics.quantiles(lags, n=100, method="inclusive")[98] if len(lags) >= 2 else lags[0]
+    return {
+        "strategy": name,
+        "answers_per_s": count / elapsed,
+        "mb_per_s": size / elapsed / 1e6,
+        "max_stall_ms": max(lags) * 1000,
+        "p99_stall_ms": p99 * 1000,
+        "total_stall_ms": sum(lags) * 1000,
+        "failures": failures,
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    groups = {"corpus": load_corpus(), "large": large_cases(args.large_notes)}
+    tick = args.tick_ms / 1000
+    has_orjson = llm_json.orjson is not None
+    thread = LLMJSONOffloader(args.offload_min_chars, args.workers)
+    process = LLMJSONOffloader(args.offload_min_chars, args.workers, use_processes=True)
+
+    async def inline(text: str):
+        return llm_json.parse_llm_json_object(text)
+
+    print(f"orjson installed: {has_orjson}; offload above {args.offload_min_chars} chars")
+    header = f"{'group':<8} {'strategy':<16} {'answers/s':>10} {'MB/s':>8} {'max ms':>8} {'p99 ms':>8} {'total ms':>9} {'fail':>5}"
+    try:
+        for group, answers in groups.items():
+            print()
+            print(header)
+            print("-" * len(header))
+            sizes = ", ".join(f"{k}={len(v)}" for k, v in answers.items()) if group == "large" else f"{len(answers)} files"
+            results = []
+            saved, llm_json.orjson = llm_json.orjson, None
+            try:
+                results.append(await run_strategy("stdlib_inline", inline, answers, args.repeat, tick))
+            finally:
+                llm_json.orjson = saved
+            if has_orjson:
+                results.append(await run_strategy("orjson_inline", inline, answers, args.repeat, tick))
+            thread._get_executor()  # start pools outside timing
+            results.append(await run_strategy("offload_thread", thread.parse_object, answers, args.repeat, tick))
+            process._get_executor()
+            results.append(await run_strategy("offload_process", process.parse_object, answers, args.repeat, tick))
+            for r in results:
+                print(
+                    f"{group:<8} {r['strategy']:<16} {r['answers_per_s']:>10.1f} {r['mb_per_s']:>8.2f} "
+                    f"{r['max_stall_ms']:>8.2f} {r['p99_stall_ms']:>8.2f} {r['total_stall_ms']:>9.1f} {r['failures']:>5}"
+                )
+            print(f"({sizes})")
+    finally:
+        thread.close()
+        process.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--large-notes", type=int, default=2000)
+    parser.add_argument("--offload-min-chars", type=int, default=16_384)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--tick-ms", type=float, default=1.0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,153 @@
+"""
+Overhead of the request logging middleware on a trivial endpoint.
+
+Calls a FastAPI app in-process through the ASGI interface (no sockets or server, so
+only framework and middleware cost is measured) with:
+
+- none          no logging middleware
+- base_http     the previous BaseHTTPMiddleware implementation (kept here as baseline)
+- asgi          RequestLoggingMiddleware (pure ASGI)
+
+Both middlewares hand rows to the real request_log_shipper (database-service not
+configured, so batches are discarded when flushed). Reports requests/s and p50/p99
+latency per variant.
+
+Run from services/llm-service:
+    python -m benchmarks.request_logger.bench [--requests 20000] [--concurrency 32]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime
+from typing import Callable
+
+from fastapi import FastAPI
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.middleware.request_logger import RequestLoggingMiddleware
+from app.services.request_log_shipper import request_log_shipper
+
+
+class BaseHTTPRequestLoggingMiddleware(BaseHTTPMiddleware):
+    """The BaseHTTPMiddleware version RequestLoggingMiddleware replaced."""
+
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        start = time.perf_counter()
+        path = request.url.path
+        method = request.method
+        if path in ("/health", "/", "/docs", "/redoc", "/openapi.json"):
+            return await call_next(request)
+        response = await call_next(request)
+        duration_ms = int((time.perf_counter() - start) * 1000)
+        request_log_shipper.enqueue({
+            "service": "llm",
+            "endpoint": path,
+            "method": method,
+            "status_code": response.status_code,
+            "duration_ms": duration_ms,
+            "timestamp": datetime.utcnow().isoformat(),
+        })
+        return response
+
+
+def build_app(middleware: type | None) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/v1/ping")
+    async def ping():
+        return {"ok": True}
+
+    if middleware is not None:
+        app.add_middleware(middleware)
+    return app
+
+
+async def call(app, path: str = "/api/v1/ping") -> int:
+    """One GET through the ASGI app; returns the status code."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 12345),
+        "server": ("bench", 80),
+    }
+    status = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def run_variant(name: str, app, requests: int, concurrency: int) -> dict:
+    for _ in range(200):  # warm up routing / validation caches
+        await call(app)
+    latencies: list[float] = []
+    remaining = requests
+
+    async def worker() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            t0 = time.perf_counter()
+            await call(app)
+            latencies.append(time.perf_counter() - t0)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    q = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "variant": name,
+        "rps": len(latencies) / elapsed,
+        "p50_us": q[49] * 1e6,
+        "p99_us": q[98] * 1e6,
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    await request_log_shipper.start()
+    variants = {
+        "none": build_app(None),
+        "base_http": build_app(BaseHTTPRequestLoggingMiddleware),
+        "asgi": build_app(RequestLoggingMiddleware),
+    }
+    try:
+        results = [
+            await run_variant(name, app, args.requests, args.concurrency)
+            for name, app in variants.items()
+        ]
+    finally:
+        await request_log_shipper.close()
+    header = f"{'variant':<10} {'req/s':>10} {'p50 us':>9} {'p99 us':>9}"
+    print(f"{args.requests} requests, concurrency {args.concurrency}")
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(f"{r['variant']:<10} {r['rps']:>10.0f} {r['p50_us']:>9.1f} {r['p99_us']:>9.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    asyncio.run(main(parser.parse_args()))
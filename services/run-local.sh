@@ -75,7 +75,7 @@ preflight_ports
 echo "Starting database-service on :8002 ..."
 (
   cd "$ROOT/database-service"
-  exec ./venv/bin/uvicorn app.main:app --host 127.0.0.1 --port 8002
+  exec env LLM_SERVICE_URL="http://127.0.0.1:8000" ./venv/bin/uvicorn app.main:app --host 127.0.0.1 --port 8002
 ) >"$LOG_DIR/database-service.log" 2>&1 &
 PIDS+=($!)
 